@@ -1,5 +1,6 @@
 """Address API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -8,11 +9,17 @@ from ...database import get_db
 from ...models import Address, Transaction, TransactionInput, TransactionOutput
 from ...schemas.address import AddressResponse, AddressListResponse
 from ...schemas.transaction import TransactionListResponse
-from ...schemas.common import PaginatedResponse
+from ...schemas.common import PaginatedResponse, GraphData
 from ...utils.logger import logger
 from ...utils.exceptions import AddressNotFoundException
 from ...dependencies import get_electrum_client
 from ...services.electrum_client import ElectrumClient
+from ...services.graph import GraphService
+from ...services.graph_loader import GraphLoader
+from ...services.adjacency import AddressAdjacencyService
+from ...services.path_finding import PathFindingService
+from ...services.graph_codec import GraphCodec
+from ...services.export import ExportService, FORMATS as EXPORT_FORMATS
 
 router = APIRouter()
 
@@ -170,17 +177,57 @@ async def get_address_transactions(
         )
 
 
+@router.get("/{address}/transactions/export")
+async def export_address_transactions(
+    address: str,
+    db: Session = Depends(get_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson, csv)")
+):
+    """
+    주소의 전체 트랜잭션을 스트리밍으로 내보내기 (로컬 DB, 최신 순)
+
+    트랜잭션마다 이 주소가 받은 금액(received)과 보낸 금액(sent)을 함께 내보낸다.
+    배치 단위로 읽어 바로 전송하므로 트랜잭션 수와 무관하게 메모리 사용량이 일정하다.
+
+    Args:
+        address: Bitcoin 주소
+        db: Database session
+        format: 내보내기 형식 (ndjson: 한 줄에 트랜잭션 하나, csv: 헤더 포함)
+
+    Returns:
+        NDJSON 또는 CSV 스트림
+
+    Raises:
+        HTTPException: 주소를 찾을 수 없는 경우 404
+    """
+    if not db.query(Address.address).filter(Address.address == address).first():
+        raise HTTPException(status_code=404, detail="주소를 찾을 수 없습니다")
+
+    logger.info(f"주소 트랜잭션 내보내기: {address} ({format})")
+
+    return StreamingResponse(
+        ExportService.address_transactions(address, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="address-{address}-transactions.{format}"'}
+    )
+
+
 @router.get("/{address}/cluster")
-async def get_address_cluster(address: str, db: Session = Depends(get_db)):
+async def get_address_cluster(
+    address: str,
+    db: Session = Depends(get_db),
+    address_limit: int = Query(20, ge=0, le=100, description="함께 반환할 클러스터 주소 수 (잔액 순)")
+):
     """
     주소가 속한 클러스터 정보 조회
 
     Args:
         address: Bitcoin 주소
         db: Database session
+        address_limit: 함께 반환할 클러스터 주소 수
 
     Returns:
-        클러스터 정보
+        클러스터 정보 (주소 수는 클러스터에 저장된 값, 주소 목록은 잔액 상위 address_limit개)
 
     Raises:
         HTTPException: 주소를 찾을 수 없는 경우 404
@@ -211,16 +258,153 @@ async def get_address_cluster(address: str, db: Session = Depends(get_db)):
             "message": "클러스터 정보를 찾을 수 없습니다"
         }
 
-    # Get all addresses in the cluster
-    cluster_addresses = db.query(Address).filter(Address.cluster_id == addr.cluster_id).all()
+    # Top addresses only; the count comes from the cluster row
+    cluster_addresses = [a for (a,) in db.query(Address.address).filter(
+        Address.cluster_id == addr.cluster_id
+    ).order_by(Address.balance.desc(), Address.address.desc()).limit(address_limit)] if address_limit else []
 
-    logger.info(f"클러스터 조회 완료: {cluster.label}, {len(cluster_addresses)}개 주소")
+    logger.info(f"클러스터 조회 완료: {cluster.label}, {cluster.address_count}개 주소")
 
     return {
         "address": address,
         "cluster_id": cluster.id,
         "cluster_label": cluster.label,
-        "cluster_address_count": len(cluster_addresses),
+        "cluster_address_count": cluster.address_count,
         "cluster_balance": cluster.total_balance,
-        "addresses": [a.address for a in cluster_addresses[:20]]  # Limit to 20
+        "addresses": cluster_addresses
+    }
+
+
+@router.get("/{address}/graph", response_model=GraphData)
+async def get_address_graph(
+    address: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    depth: int = Query(2, ge=1, le=5, description="탐색 hop 수"),
+    direction: str = Query("both", pattern="^(in|out|both)$", description="자금 흐름 방향"),
+    max_fanout: int = Query(20, ge=1, le=200, description="hop당 주소별 최대 간선 수"),
+    max_nodes: int = Query(500, ge=1, le=5000, description="최대 주소 노드 수"),
+    min_amount: float = Query(0.0, ge=0, description="최소 금액 (BTC)"),
+    start_time: Optional[str] = Query(None, description="시작 시각 (ISO 8601)"),
+    end_time: Optional[str] = Query(None, description="종료 시각 (ISO 8601)")
+):
+    """
+    주소 기준 N-hop 자금 흐름 그래프 조회
+
+    Args:
+        address: 시작 Bitcoin 주소
+        request: 요청 (Accept 헤더로 compact JSON/바이너리 포맷 선택)
+        db: Database session
+        depth: 탐색 hop 수
+        direction: 자금 흐름 방향 (in, out, both)
+        max_fanout: hop당 주소별 최대 간선 수
+        max_nodes: 최대 주소 노드 수
+        min_amount: 최소 금액 (BTC)
+        start_time: 시작 시각
+        end_time: 종료 시각
+
+    Returns:
+        그래프 데이터 (nodes, edges)
+    """
+    logger.info(f"주소 흐름 그래프 조회: {address}, depth={depth}, direction={direction}")
+
+    transactions = GraphLoader.load_address_flow(
+        db,
+        address,
+        depth=depth,
+        direction=direction,
+        max_fanout=max_fanout,
+        max_nodes=max_nodes,
+        min_amount=min_amount,
+        start_time=start_time,
+        end_time=end_time
+    )
+
+    graph_data = GraphService.generate_address_graph(address, transactions, depth=depth)
+
+    logger.info(f"주소 흐름 그래프 생성 완료: {len(graph_data.nodes)}개 노드, {len(graph_data.edges)}개 엣지")
+    return GraphCodec.respond(request, graph_data)
+
+
+@router.get("/{address}/neighbors")
+async def get_address_neighbors(
+    address: str,
+    db: Session = Depends(get_db),
+    direction: str = Query("out", pattern="^(in|out)$", description="out: 보낸 상대, in: 받은 상대"),
+    min_amount: float = Query(0.0, ge=0, description="최소 누적 금액 (BTC)"),
+    limit: int = Query(50, ge=1, le=500, description="결과 개수")
+):
+    """
+    주소의 인접 주소 목록 조회 (사전 계산된 인접 인덱스 사용)
+
+    Args:
+        address: Bitcoin 주소
+        db: Database session
+        direction: 흐름 방향
+        min_amount: 최소 누적 금액
+        limit: 결과 개수
+
+    Returns:
+        인접 주소 목록 (누적 금액, 트랜잭션 수, 최초/최종 시각)
+    """
+    logger.info(f"인접 주소 조회: {address}, direction={direction}")
+
+    neighbors = AddressAdjacencyService.neighbors(
+        db, address, direction=direction, min_amount=min_amount, limit=limit
+    )
+
+    return {
+        "address": address,
+        "direction": direction,
+        "neighbors": neighbors
     }
+
+
+@router.get("/{address}/paths/{target}")
+def find_address_paths(
+    address: str,
+    target: str,
+    db: Session = Depends(get_db),
+    max_hops: int = Query(6, ge=1, le=10, description="최대 경로 길이 (hop)"),
+    max_paths: int = Query(5, ge=1, le=20, description="반환할 최대 경로 수"),
+    max_fanout: int = Query(50, ge=1, le=500, description="hop당 주소별 최대 간선 수"),
+    min_amount: float = Query(0.0, ge=0, description="hop별 최소 금액 (BTC)"),
+    start_time: Optional[str] = Query(None, description="시작 시각 (ISO 8601)"),
+    end_time: Optional[str] = Query(None, description="종료 시각 (ISO 8601)"),
+    timeout_ms: int = Query(3000, ge=100, le=30000, description="탐색 시간 제한 (ms)")
+):
+    """
+    두 주소 간 자금 흐름 경로 탐색 (양방향 BFS)
+
+    탐색은 동기 DB 조회로 최대 timeout_ms 동안 블록되므로 스레드풀에서 실행한다
+    (def 엔드포인트).
+
+    Args:
+        address: 출발 Bitcoin 주소
+        target: 도착 Bitcoin 주소
+        db: Database session
+        max_hops: 최대 경로 길이
+        max_paths: 반환할 최대 경로 수 (짧은 경로, 큰 최소 금액 순)
+        max_fanout: hop당 주소별 최대 간선 수
+        min_amount: hop별 최소 금액
+        start_time: 시작 시각
+        end_time: 종료 시각
+        timeout_ms: 탐색 시간 제한
+
+    Returns:
+        경로 목록과 탐색 통계
+    """
+    logger.info(f"주소 경로 탐색 요청: {address} -> {target}")
+
+    return PathFindingService.find_paths(
+        db,
+        address,
+        target,
+        max_hops=max_hops,
+        max_paths=max_paths,
+        max_fanout=max_fanout,
+        min_amount=min_amount,
+        start_time=start_time,
+        end_time=end_time,
+        timeout_ms=timeout_ms
+    )
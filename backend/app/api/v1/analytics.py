@@ -1,11 +1,15 @@
 """Analytics API endpoints"""
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Optional
 
 from ...database import get_db
-from ...models import Address, Transaction, Cluster
+from ...models import Address, Cluster, BlockStat, DailyStat
 from ...schemas.cluster import ClusterDistribution
+from ...schemas.analytics import BlockStatsResponse, DailyStatsResponse, ActiveAddressesResponse
+from ...services.stats_rollup import StatsRollupService
+from ...services.sketches import DistinctSketchService
+from ...services.cluster_distribution import ClusterDistributionService, DEFAULT_EDGES, MAX_BUCKETS
 from ...utils.logger import logger
 
 router = APIRouter()
@@ -16,6 +20,9 @@ async def get_summary(db: Session = Depends(get_db)):
     """
     전체 시스템 통계
 
+    수집/클러스터링 시 증분 갱신되는 summary_stats에서 읽으므로 데이터 크기와 무관하게
+    일정한 시간에 응답한다. 통계가 아직 없으면 한 번 재계산한다.
+
     Args:
         db: Database session
 
@@ -24,27 +31,24 @@ async def get_summary(db: Session = Depends(get_db)):
     """
     logger.info("전체 통계 조회 요청")
 
-    # Count totals
-    total_addresses = db.query(func.count(Address.address)).scalar()
-    total_clusters = db.query(func.count(Cluster.id)).scalar()
-    total_transactions = db.query(func.count(Transaction.txid)).scalar()
-
-    # Sum balances
-    total_balance = db.query(func.sum(Address.balance)).scalar() or 0.0
+    stats = StatsRollupService.read(db)
+    if stats is None:
+        stats = StatsRollupService.reconcile(db)
+        db.commit()
 
-    # Average cluster size
-    avg_cluster_size = db.query(func.avg(Cluster.address_count)).scalar() or 0.0
+    total_clusters = int(stats['total_clusters'])
+    avg_cluster_size = stats['clustered_addresses'] / total_clusters if total_clusters else 0.0
 
-    # Largest cluster
+    # Largest cluster (idx_clusters_address_count 인덱스 한 번 조회)
     largest_cluster = db.query(Cluster).order_by(Cluster.address_count.desc()).first()
 
-    logger.info(f"통계 조회 완료: {total_addresses}개 주소, {total_clusters}개 클러스터")
+    logger.info(f"통계 조회 완료: {int(stats['total_addresses'])}개 주소, {total_clusters}개 클러스터")
 
     return {
-        "total_addresses": total_addresses,
+        "total_addresses": int(stats['total_addresses']),
         "total_clusters": total_clusters,
-        "total_transactions": total_transactions,
-        "total_balance": round(total_balance, 8),
+        "total_transactions": int(stats['total_transactions']),
+        "total_balance": round(stats['total_balance'], 8),
         "avg_cluster_size": round(avg_cluster_size, 2),
         "largest_cluster": {
             "id": largest_cluster.id if largest_cluster else None,
@@ -55,43 +59,165 @@ async def get_summary(db: Session = Depends(get_db)):
 
 
 @router.get("/cluster-distribution", response_model=list[ClusterDistribution])
-async def get_cluster_distribution(db: Session = Depends(get_db)):
+async def get_cluster_distribution(
+    db: Session = Depends(get_db),
+    edges: Optional[str] = Query(None, description="구간 하한 목록 (쉼표 구분, 오름차순, 예: 1,2,6,11,21,51)"),
+    scale: str = Query("linear", pattern="^(linear|log)$", description="구간 방식 (linear: edges 사용, log: 로그 구간)"),
+    base: int = Query(2, ge=2, le=10, description="로그 구간의 밑 (scale=log)")
+):
     """
     클러스터 크기 분포
 
+    트리거로 유지되는 크기별 클러스터 수(cluster_size_counts)를 한 번의 그룹 쿼리로 구간에
+    나눠 집계한다. 마지막 구간은 상한이 없다.
+
     Args:
         db: Database session
+        edges: 구간 하한 목록 (기본: 1, 2-5, 6-10, 11-20, 21-50, 51+)
+        scale: linear 또는 log
+        base: 로그 구간의 밑
 
     Returns:
         클러스터 크기별 분포
+
+    Raises:
+        HTTPException: edges 형식이 잘못된 경우 400
     """
-    logger.info("클러스터 분포 조회 요청")
-
-    # Define size ranges
-    ranges = [
-        ("1", 1, 1),
-        ("2-5", 2, 5),
-        ("6-10", 6, 10),
-        ("11-20", 11, 20),
-        ("21-50", 21, 50),
-        ("51+", 51, 1000000)
+    logger.info(f"클러스터 분포 조회 요청: scale={scale}, edges={edges}")
+
+    if scale == "log":
+        bucket_edges = ClusterDistributionService.log_edges(base)
+    elif edges:
+        try:
+            bucket_edges = [int(edge) for edge in edges.split(",")]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="edges는 쉼표로 구분한 정수여야 합니다")
+        if (not 1 <= len(bucket_edges) <= MAX_BUCKETS or bucket_edges[0] < 0
+                or any(low >= high for low, high in zip(bucket_edges, bucket_edges[1:]))):
+            raise HTTPException(status_code=400, detail=f"edges는 {MAX_BUCKETS}개 이하의 증가하는 정수여야 합니다")
+    else:
+        bucket_edges = list(DEFAULT_EDGES)
+
+    distribution = [
+        ClusterDistribution(range=label, count=count)
+        for label, count in ClusterDistributionService.distribution(db, bucket_edges, trim=scale == "log")
     ]
 
-    distribution = []
+    logger.info(f"클러스터 분포 조회 완료: {len(distribution)}개 범위")
+    return distribution
+
 
-    for range_label, min_size, max_size in ranges:
-        count = db.query(Cluster).filter(
-            Cluster.address_count >= min_size,
-            Cluster.address_count <= max_size
-        ).count()
+@router.get("/blocks", response_model=list[BlockStatsResponse])
+async def get_block_stats(
+    db: Session = Depends(get_db),
+    start_height: Optional[int] = Query(None, ge=0, description="시작 블록 높이 (포함)"),
+    end_height: Optional[int] = Query(None, ge=0, description="끝 블록 높이 (포함)"),
+    limit: int = Query(100, ge=1, le=5000, description="최대 블록 수")
+):
+    """
+    블록별 트랜잭션 통계
 
-        distribution.append(ClusterDistribution(
-            range=range_label,
-            count=count
-        ))
+    수집 시 증분 갱신되는 block_stats에서 기본 키 범위로 읽는다. 범위를 주지 않으면
+    최근 블록부터 limit개를 반환한다. 결과는 블록 높이 오름차순이다.
 
-    logger.info(f"클러스터 분포 조회 완료: {len(distribution)}개 범위")
-    return distribution
+    Args:
+        db: Database session
+        start_height: 시작 블록 높이
+        end_height: 끝 블록 높이
+        limit: 최대 블록 수
+
+    Returns:
+        블록별 통계 목록
+    """
+    logger.info(f"블록 통계 조회: {start_height}~{end_height}, limit={limit}")
+
+    query = db.query(BlockStat)
+    if start_height is not None:
+        query = query.filter(BlockStat.block_height >= start_height)
+    if end_height is not None:
+        query = query.filter(BlockStat.block_height <= end_height)
+
+    if start_height is None:
+        blocks = query.order_by(BlockStat.block_height.desc()).limit(limit).all()[::-1]
+    else:
+        blocks = query.order_by(BlockStat.block_height).limit(limit).all()
+
+    logger.info(f"블록 통계 조회 완료: {len(blocks)}개 블록")
+    return blocks
+
+
+@router.get("/daily", response_model=list[DailyStatsResponse])
+async def get_daily_stats(
+    db: Session = Depends(get_db),
+    start: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="시작일 (YYYY-MM-DD, 포함)"),
+    end: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$", description="종료일 (YYYY-MM-DD, 포함)"),
+    limit: int = Query(90, ge=1, le=3660, description="최대 일 수")
+):
+    """
+    일별(UTC) 트랜잭션 통계
+
+    수집 시 증분 갱신되는 daily_stats에서 기본 키 범위로 읽는다. 시작일을 주지 않으면
+    최근 limit일을 반환한다. 결과는 날짜 오름차순이다.
+
+    Args:
+        db: Database session
+        start: 시작일
+        end: 종료일
+        limit: 최대 일 수
+
+    Returns:
+        일별 통계 목록
+    """
+    logger.info(f"일별 통계 조회: {start}~{end}, limit={limit}")
+
+    query = db.query(DailyStat)
+    if start is not None:
+        query = query.filter(DailyStat.day >= start)
+    if end is not None:
+        query = query.filter(DailyStat.day <= end)
+
+    if start is None:
+        days = query.order_by(DailyStat.day.desc()).limit(limit).all()[::-1]
+    else:
+        days = query.order_by(DailyStat.day).limit(limit).all()
+
+    logger.info(f"일별 통계 조회 완료: {len(days)}일")
+    return days
+
+
+@router.get("/active-addresses", response_model=ActiveAddressesResponse)
+async def get_active_addresses(
+    db: Session = Depends(get_db),
+    start: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="시작일 (YYYY-MM-DD, 포함)"),
+    end: str = Query(..., pattern=r"^\d{4}-\d{2}-\d{2}$", description="종료일 (YYYY-MM-DD, 포함)")
+):
+    """
+    기간 내 활동한 고유 주소 수 (근사치)
+
+    일별 HyperLogLog 스케치를 합쳐 추정하므로 기간 길이와 트랜잭션 수에 관계없이 빠르게
+    응답한다. 추정치의 상대 표준 오차는 relative_error이다 (약 95% 확률로 ±2배 이내).
+
+    Args:
+        db: Database session
+        start: 시작일
+        end: 종료일
+
+    Returns:
+        추정 고유 주소 수와 오차
+
+    Raises:
+        HTTPException: start가 end보다 늦은 경우 400
+    """
+    if start > end:
+        raise HTTPException(status_code=400, detail="start는 end보다 늦을 수 없습니다")
+
+    logger.info(f"활성 주소 수 조회: {start}~{end}")
+
+    estimate, days, relative_error = DistinctSketchService.active_addresses(db, start, end)
+
+    return ActiveAddressesResponse(
+        start=start, end=end, days=days, estimate=estimate, relative_error=round(relative_error, 6)
+    )
 
 
 @router.get("/top-addresses")
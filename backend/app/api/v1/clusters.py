@@ -1,48 +1,100 @@
 """Cluster API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, Query
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import func, tuple_
+from typing import Dict, List, Optional, Tuple
 
 from ...database import get_db
-from ...models import Cluster, Address
+from ...models import Cluster, Address, TransactionInput
 from ...schemas.cluster import ClusterResponse, ClusterListResponse
+from ...schemas.analytics import CounterpartyCountResponse
 from ...schemas.common import PaginatedResponse, GraphData
 from ...services.graph import GraphService
+from ...services.graph_loader import GraphLoader
+from ...services.cluster_edges import ClusterEdgeService
+from ...services.graph_cache import graph_cache
+from ...services.graph_summary import GraphSummaryService, GROUPINGS
+from ...services.graph_codec import GraphCodec
+from ...services.sketches import DistinctSketchService
+from ...services.export import ExportService, FORMATS as EXPORT_FORMATS
+from ...utils.helpers import encode_cursor, decode_cursor
 from ...utils.logger import logger
 
 router = APIRouter()
 
+# 전체 그래프에 그릴 최대 주소 수 (auto 모드에서 이보다 크면 요약 그래프)
+FULL_GRAPH_MAX_ADDRESSES = 100
+
+# min_size -> (계산 시각, 클러스터 수); 페이지마다 count(*)를 다시 하지 않도록 잠시 보관
+CLUSTER_COUNT_TTL = 30.0
+_cluster_counts: Dict[int, Tuple[float, int]] = {}
+
+
+def _count_clusters(db: Session, min_size: int) -> int:
+    """min_size 이상인 클러스터 수 (CLUSTER_COUNT_TTL초 동안 캐시)"""
+    cached = _cluster_counts.get(min_size)
+    if cached and time.monotonic() - cached[0] < CLUSTER_COUNT_TTL:
+        return cached[1]
+
+    total = db.query(func.count(Cluster.id)).filter(Cluster.address_count >= min_size).scalar()
+    _cluster_counts[min_size] = (time.monotonic(), total)
+    return total
+
+
+def _decode_cursor_or_400(cursor: str) -> list:
+    """(잔액, ID) 커서 디코드 (형식이나 타입이 잘못되면 400)"""
+    try:
+        return decode_cursor(cursor, (float, str))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다")
+
 
 @router.get("", response_model=PaginatedResponse[ClusterListResponse])
 async def get_clusters(
     db: Session = Depends(get_db),
     limit: int = Query(50, ge=1, le=100, description="결과 개수"),
-    offset: int = Query(0, ge=0, description="시작 위치"),
+    offset: int = Query(0, ge=0, description="시작 위치 (cursor가 없을 때)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     min_size: int = Query(1, ge=1, description="최소 주소 수")
 ):
     """
-    클러스터 목록 조회
+    클러스터 목록 조회 (잔액 순)
+
+    cursor를 주면 (total_balance, id) 기준으로 이어서 조회하므로 페이지 깊이와 무관하게
+    인덱스 범위 스캔 한 번으로 끝난다. offset 방식도 계속 지원한다.
+    total은 잠시 캐시된 값이다.
 
     Args:
         limit: 페이지 크기
-        offset: 시작 위치
+        offset: 시작 위치 (cursor가 없을 때)
+        cursor: 이전 응답의 next_cursor
         min_size: 최소 주소 수
         db: Database session
 
     Returns:
         클러스터 목록 (페이지네이션)
+
+    Raises:
+        HTTPException: 커서 형식이 잘못된 경우 400
     """
-    logger.info(f"클러스터 목록 조회: limit={limit}, offset={offset}, min_size={min_size}")
+    logger.info(f"클러스터 목록 조회: limit={limit}, offset={offset}, cursor={cursor is not None}, min_size={min_size}")
 
     # Query clusters with minimum size
-    query = db.query(Cluster).filter(Cluster.address_count >= min_size).order_by(Cluster.total_balance.desc())
+    query = db.query(Cluster).filter(Cluster.address_count >= min_size)
+
+    if cursor:
+        balance, cluster_id = _decode_cursor_or_400(cursor)
+        query = query.filter(tuple_(Cluster.total_balance, Cluster.id) < tuple_(balance, cluster_id))
 
-    total = query.count()
-    clusters = query.limit(limit).offset(offset).all()
+    clusters = query.order_by(Cluster.total_balance.desc(), Cluster.id.desc()).limit(limit).offset(0 if cursor else offset).all()
+    total = _count_clusters(db, min_size)
 
     # Calculate total pages
     total_pages = (total + limit - 1) // limit if total > 0 else 1
-    current_page = (offset // limit) + 1
+    current_page = None if cursor else (offset // limit) + 1
+    next_cursor = encode_cursor([clusters[-1].total_balance, clusters[-1].id]) if len(clusters) == limit else None
 
     logger.info(f"클러스터 조회 완료: {len(clusters)}개")
 
@@ -51,21 +103,30 @@ async def get_clusters(
         total=total,
         page=current_page,
         page_size=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{cluster_id}", response_model=ClusterResponse)
-async def get_cluster(cluster_id: str, db: Session = Depends(get_db)):
+async def get_cluster(
+    cluster_id: str,
+    db: Session = Depends(get_db),
+    address_limit: int = Query(20, ge=0, le=100, description="함께 반환할 주소 수 (잔액 순)")
+):
     """
     클러스터 상세 정보 조회
 
+    주소는 잔액 상위 address_limit개만 포함한다. 나머지는 addresses_next_cursor로
+    /{cluster_id}/addresses를 이어서 조회하거나 /{cluster_id}/addresses/export로 내려받는다.
+
     Args:
         cluster_id: Cluster UUID
         db: Database session
+        address_limit: 함께 반환할 주소 수
 
     Returns:
-        클러스터 상세 정보 (주소 목록 포함)
+        클러스터 상세 정보 (상위 주소 목록 포함)
 
     Raises:
         HTTPException: 클러스터를 찾을 수 없는 경우 404
@@ -85,10 +146,15 @@ async def get_cluster(cluster_id: str, db: Session = Depends(get_db)):
             }
         )
 
-    # 클러스터에 속한 주소들 가져오기
-    addresses = db.query(Address).filter(Address.cluster_id == cluster_id).all()
+    # 잔액 상위 주소만 (idx_addresses_cluster_balance_address 범위 스캔)
+    addresses = db.query(Address.address, Address.balance, Address.tx_count).filter(
+        Address.cluster_id == cluster_id
+    ).order_by(Address.balance.desc(), Address.address.desc()).limit(address_limit).all() if address_limit else []
+
+    has_more = (cluster.address_count or 0) > len(addresses)
+    next_cursor = encode_cursor([addresses[-1].balance, addresses[-1].address]) if addresses and has_more else None
 
-    logger.info(f"클러스터 조회 성공: {cluster.label}, 주소 {len(addresses)}개")
+    logger.info(f"클러스터 조회 성공: {cluster.label}, 주소 {cluster.address_count}개 중 {len(addresses)}개 반환")
 
     # ClusterResponse에 addresses 포함
     from ...schemas.cluster import ClusterResponse, AddressInCluster
@@ -109,7 +175,8 @@ async def get_cluster(cluster_id: str, db: Session = Depends(get_db)):
             address=addr.address,
             balance=addr.balance,
             tx_count=addr.tx_count
-        ) for addr in addresses]
+        ) for addr in addresses],
+        addresses_next_cursor=next_cursor
     )
 
 
@@ -118,24 +185,29 @@ async def get_cluster_addresses(
     cluster_id: str,
     db: Session = Depends(get_db),
     limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor")
 ):
     """
-    클러스터 내 주소 목록 조회
+    클러스터 내 주소 목록 조회 (잔액 순)
+
+    cursor를 주면 (balance, address) 기준으로 이어서 조회한다. total은 클러스터에 저장된
+    주소 수(address_count)를 사용한다.
 
     Args:
         cluster_id: Cluster UUID
         limit: 페이지 크기
-        offset: 시작 위치
+        offset: 시작 위치 (cursor가 없을 때)
+        cursor: 이전 응답의 next_cursor
         db: Database session
 
     Returns:
         주소 목록 (페이지네이션)
 
     Raises:
-        HTTPException: 클러스터를 찾을 수 없는 경우 404
+        HTTPException: 클러스터를 찾을 수 없는 경우 404, 커서 형식이 잘못된 경우 400
     """
-    logger.info(f"클러스터 주소 조회: {cluster_id}, limit={limit}, offset={offset}")
+    logger.info(f"클러스터 주소 조회: {cluster_id}, limit={limit}, offset={offset}, cursor={cursor is not None}")
 
     # Check if cluster exists
     cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
@@ -143,13 +215,18 @@ async def get_cluster_addresses(
         raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
 
     # Get addresses
-    query = db.query(Address).filter(Address.cluster_id == cluster_id).order_by(Address.balance.desc())
-    total = query.count()
-    addresses = query.limit(limit).offset(offset).all()
+    query = db.query(Address).filter(Address.cluster_id == cluster_id)
+    if cursor:
+        balance, address = _decode_cursor_or_400(cursor)
+        query = query.filter(tuple_(Address.balance, Address.address) < tuple_(balance, address))
+
+    addresses = query.order_by(Address.balance.desc(), Address.address.desc()).limit(limit).offset(0 if cursor else offset).all()
+    total = cluster.address_count or 0
 
     # Calculate total pages
     total_pages = (total + limit - 1) // limit if total > 0 else 1
-    current_page = (offset // limit) + 1
+    current_page = None if cursor else (offset // limit) + 1
+    next_cursor = encode_cursor([addresses[-1].balance, addresses[-1].address]) if len(addresses) == limit else None
 
     logger.info(f"클러스터 주소 조회 완료: {len(addresses)}개")
 
@@ -164,21 +241,97 @@ async def get_cluster_addresses(
         total=total,
         page=current_page,
         page_size=limit,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/{cluster_id}/addresses/export")
+async def export_cluster_addresses(
+    cluster_id: str,
+    db: Session = Depends(get_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson, csv)")
+):
+    """
+    클러스터의 전체 주소를 스트리밍으로 내보내기 (잔액 순)
+
+    결과를 메모리에 모으지 않고 배치 단위로 읽어 바로 전송하므로 주소 수와 무관하게
+    메모리 사용량이 일정하다.
+
+    Args:
+        cluster_id: Cluster UUID
+        db: Database session
+        format: 내보내기 형식 (ndjson: 한 줄에 주소 하나, csv: 헤더 포함)
+
+    Returns:
+        NDJSON 또는 CSV 스트림
+
+    Raises:
+        HTTPException: 클러스터를 찾을 수 없는 경우 404
+    """
+    if not db.query(Cluster.id).filter(Cluster.id == cluster_id).first():
+        raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
+
+    logger.info(f"클러스터 주소 내보내기: {cluster_id} ({format})")
+
+    return StreamingResponse(
+        ExportService.cluster_addresses(cluster_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="cluster-{cluster_id}-addresses.{format}"'}
     )
 
 
+@router.get("/{cluster_id}/counterparties/count", response_model=CounterpartyCountResponse)
+async def get_cluster_counterparty_count(
+    cluster_id: str,
+    db: Session = Depends(get_db)
+):
+    """
+    클러스터와 거래한 고유 상대 주소 수 (근사치)
+
+    클러스터별 HyperLogLog 스케치에서 추정하므로 클러스터의 거래 수와 무관하게 한 번의
+    조회로 응답한다. 추정치의 상대 표준 오차는 relative_error이다.
+
+    Args:
+        cluster_id: Cluster UUID
+        db: Database session
+
+    Returns:
+        추정 상대 주소 수와 오차
+
+    Raises:
+        HTTPException: 클러스터를 찾을 수 없는 경우 404
+    """
+    if not db.query(Cluster.id).filter(Cluster.id == cluster_id).first():
+        raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
+
+    estimate, relative_error = DistinctSketchService.cluster_counterparties(db, cluster_id)
+
+    return CounterpartyCountResponse(cluster_id=cluster_id, estimate=estimate, relative_error=round(relative_error, 6))
+
+
 @router.get("/{cluster_id}/graph", response_model=GraphData)
 async def get_cluster_graph(
     cluster_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_db),
+    mode: str = Query("auto", pattern="^(auto|full|summary)$", description="그래프 모드 (auto, full, summary)"),
+    group_by: str = Query("value", pattern="^(value|activity)$", description="요약 그룹 기준 (value, activity)"),
+    raw: bool = Query(False, description="full 모드에서 트랜잭션별 엣지를 집계하지 않고 반환")
 ):
     """
     클러스터 그래프 데이터 조회
 
+    summary 모드는 주소를 잔액/활동 구간별 그룹 노드로 묶고 그룹 간 흐름을 집계한다.
+    auto 모드는 주소가 FULL_GRAPH_MAX_ADDRESSES개를 넘는 클러스터에 summary 모드를 사용한다.
+
     Args:
         cluster_id: Cluster UUID
+        request: 요청 (Accept 헤더로 compact JSON/바이너리 포맷 선택)
         db: Database session
+        mode: 그래프 모드
+        group_by: 요약 그룹 기준
+        raw: 트랜잭션별 원본 엣지 반환 여부 (기본: 주소 쌍별 집계)
 
     Returns:
         그래프 데이터 (nodes, edges)
@@ -186,37 +339,37 @@ async def get_cluster_graph(
     Raises:
         HTTPException: 클러스터를 찾을 수 없는 경우 404
     """
-    logger.info(f"클러스터 그래프 조회: {cluster_id}")
+    logger.info(f"클러스터 그래프 조회: {cluster_id}, mode={mode}")
 
     # Check if cluster exists
     cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
     if not cluster:
         raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
 
-    # Get addresses in cluster
-    addresses = db.query(Address).filter(Address.cluster_id == cluster_id).limit(100).all()
+    if mode == "auto":
+        mode = "summary" if (cluster.address_count or 0) > FULL_GRAPH_MAX_ADDRESSES else "full"
+    options = (mode, group_by) if mode == "summary" else (mode, raw)
+
+    # 클러스터 버전이 같으면 캐시된 그래프 반환
+    cached = graph_cache.get(cluster_id, cluster.version, options)
+    if cached is not None:
+        logger.info(f"클러스터 그래프 캐시 적중: {cluster_id} (version={cluster.version})")
+        return GraphCodec.respond(request, cached)
 
-    # Get transactions (simplified - would need proper transaction query)
-    from ...models import Transaction, TransactionInput, TransactionOutput
+    if mode == "summary":
+        graph_data = GraphSummaryService.summarize(db, cluster_id, group_by)
+        graph_cache.put(cluster_id, cluster.version, graph_data, options)
+        return GraphCodec.respond(request, graph_data)
+
+    # Get addresses in cluster
+    addresses = db.query(Address).filter(Address.cluster_id == cluster_id).limit(FULL_GRAPH_MAX_ADDRESSES).all()
 
     # Get transactions related to cluster addresses
     address_list = [addr.address for addr in addresses]
     txids = db.query(TransactionInput.txid).filter(TransactionInput.address.in_(address_list)).distinct().limit(200).all()
     txids = [t[0] for t in txids]
 
-    transactions = []
-    for txid in txids:
-        tx = db.query(Transaction).filter(Transaction.txid == txid).first()
-        if tx:
-            inputs = db.query(TransactionInput).filter(TransactionInput.txid == txid).all()
-            outputs = db.query(TransactionOutput).filter(TransactionOutput.txid == txid).all()
-
-            transactions.append({
-                'txid': tx.txid,
-                'timestamp': tx.timestamp,
-                'inputs': [{'address': i.address, 'amount': i.amount} for i in inputs],
-                'outputs': [{'address': o.address, 'amount': o.amount} for o in outputs]
-            })
+    transactions = GraphLoader.load_transactions(db, txids)
 
     # Generate graph
     addresses_dict = [{
@@ -225,7 +378,104 @@ async def get_cluster_graph(
         'cluster_id': addr.cluster_id
     } for addr in addresses]
 
-    graph_data = GraphService.generate_cluster_graph(cluster_id, addresses_dict, transactions)
+    graph_data = GraphService.generate_cluster_graph(cluster_id, addresses_dict, transactions, aggregate=not raw)
+    graph_cache.put(cluster_id, cluster.version, graph_data, options)
 
     logger.info(f"클러스터 그래프 생성 완료: {len(graph_data.nodes)}개 노드")
-    return graph_data
+    return GraphCodec.respond(request, graph_data)
+
+
+@router.get("/{cluster_id}/graph/groups/{group}", response_model=GraphData)
+async def expand_cluster_graph_group(
+    cluster_id: str,
+    group: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    group_by: str = Query("value", pattern="^(value|activity)$", description="요약 그룹 기준 (value, activity)"),
+    limit: int = Query(100, ge=1, le=500, description="최대 주소 수")
+):
+    """
+    요약 그래프의 그룹 노드 확장
+
+    Args:
+        cluster_id: Cluster UUID
+        group: 그룹 키 (예: whale, high)
+        request: 요청 (Accept 헤더로 compact JSON/바이너리 포맷 선택)
+        db: Database session
+        group_by: 요약 그룹 기준
+        limit: 최대 주소 수 (잔액 순)
+
+    Returns:
+        그래프 데이터 (그룹 내 주소 노드, 주소/그룹 간 엣지)
+
+    Raises:
+        HTTPException: 클러스터 또는 그룹을 찾을 수 없는 경우 404
+    """
+    logger.info(f"클러스터 그룹 확장 요청: {cluster_id}, {group_by}:{group}")
+
+    cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
+    if not cluster:
+        raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
+
+    if group not in {key for key, _, _ in GROUPINGS[group_by][1]}:
+        raise HTTPException(status_code=404, detail="그룹을 찾을 수 없습니다")
+
+    graph_data = GraphSummaryService.expand_group(db, cluster_id, group_by, group, limit=limit)
+    return GraphCodec.respond(request, graph_data)
+
+
+@router.get("/{cluster_id}/flows", response_model=GraphData)
+async def get_cluster_flows(
+    cluster_id: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    direction: str = Query("both", pattern="^(in|out|both)$", description="자금 흐름 방향"),
+    min_amount: float = Query(0.0, ge=0, description="최소 누적 금액 (BTC)"),
+    limit: int = Query(50, ge=1, le=500, description="방향별 최대 간선 수")
+):
+    """
+    클러스터 간 자금 흐름 그래프 조회 (cluster_edges 기반)
+
+    Args:
+        cluster_id: Cluster UUID
+        request: 요청 (Accept 헤더로 compact JSON/바이너리 포맷 선택)
+        db: Database session
+        direction: 흐름 방향 (in, out, both)
+        min_amount: 최소 누적 금액
+        limit: 방향별 최대 간선 수
+
+    Returns:
+        그래프 데이터 (클러스터 노드, 흐름 엣지)
+
+    Raises:
+        HTTPException: 클러스터를 찾을 수 없는 경우 404
+    """
+    logger.info(f"클러스터 흐름 그래프 조회: {cluster_id}, direction={direction}")
+
+    cluster = db.query(Cluster).filter(Cluster.id == cluster_id).first()
+    if not cluster:
+        raise HTTPException(status_code=404, detail="클러스터를 찾을 수 없습니다")
+
+    edges = ClusterEdgeService.get_flows(db, cluster_id, direction=direction, min_amount=min_amount, limit=limit)
+
+    neighbor_ids = {e.source_cluster_id for e in edges} | {e.target_cluster_id for e in edges}
+    neighbor_ids.discard(cluster_id)
+    clusters = [cluster]
+    if neighbor_ids:
+        clusters += db.query(Cluster).filter(Cluster.id.in_(neighbor_ids)).all()
+
+    graph_data = GraphService.generate_cluster_flow_graph(
+        cluster_id,
+        [{'id': c.id, 'label': c.label, 'total_balance': c.total_balance} for c in clusters],
+        [{
+            'source_cluster_id': e.source_cluster_id,
+            'target_cluster_id': e.target_cluster_id,
+            'tx_count': e.tx_count,
+            'total_amount': e.total_amount,
+            'first_tx_timestamp': e.first_tx_timestamp,
+            'last_tx_timestamp': e.last_tx_timestamp
+        } for e in edges]
+    )
+
+    logger.info(f"클러스터 흐름 그래프 생성 완료: {len(graph_data.nodes)}개 노드, {len(graph_data.edges)}개 엣지")
+    return GraphCodec.respond(request, graph_data)
@@ -1,68 +1,62 @@
 """Search API endpoint"""
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Query
 from typing import List
 
-from ...database import get_db
-from ...models import Address, Transaction, Cluster
-from ...schemas.common import SearchResult
+from ...schemas.common import SearchResult, AutocompleteSuggestion
+from ...services.autocomplete import autocomplete_index
+from ...services.search import SearchService
 from ...utils.logger import logger
 
 router = APIRouter()
 
 
 @router.get("", response_model=List[SearchResult])
-async def search(
+def search(
     q: str = Query(..., min_length=1, description="검색 쿼리"),
-    db: Session = Depends(get_db),
     limit: int = Query(20, ge=1, le=100, description="결과 개수")
 ):
     """
     통합 검색 (주소, 트랜잭션, 클러스터)
 
+    전체 txid, 체크섬이 맞는 주소, 클러스터 UUID는 기본 키로 바로 조회하고 블록 높이는
+    해당 블록의 트랜잭션을 반환한다. 그 외에는 주소/트랜잭션/클러스터 ID 접두사 검색,
+    클러스터 라벨은 전문 검색(FTS5)을 사용하며 세 가지 조회는 별도 읽기 연결에서 동시에
+    실행된다. 최근 검색 결과는 캐시된다. 결과를 기다리는 동안 블록되므로 스레드풀에서
+    실행한다 (def 엔드포인트).
+
     Args:
         q: 검색 쿼리
         limit: 결과 개수
-        db: Database session
 
     Returns:
         검색 결과 목록
     """
     logger.info(f"검색 요청: '{q}'")
 
-    results: List[SearchResult] = []
+    results = SearchService.search(q, limit)
 
-    # Search addresses
-    addresses = db.query(Address).filter(Address.address.like(f"%{q}%")).limit(limit // 3).all()
-    for addr in addresses:
-        results.append(SearchResult(
-            type="address",
-            id=addr.address,
-            label=f"{addr.address[:20]}...",
-            preview=f"잔액: {addr.balance} BTC, 트랜잭션: {addr.tx_count}개"
-        ))
+    logger.info(f"검색 완료: {len(results)}개 결과")
+    return results
 
-    # Search transactions
-    transactions = db.query(Transaction).filter(Transaction.txid.like(f"%{q}%")).limit(limit // 3).all()
-    for tx in transactions:
-        results.append(SearchResult(
-            type="transaction",
-            id=tx.txid,
-            label=f"{tx.txid[:20]}...",
-            preview=f"블록: {tx.block_height}, 금액: {tx.total_output} BTC"
-        ))
 
-    # Search clusters
-    clusters = db.query(Cluster).filter(
-        (Cluster.id.like(f"%{q}%")) | (Cluster.label.like(f"%{q}%"))
-    ).limit(limit // 3).all()
-    for cluster in clusters:
-        results.append(SearchResult(
-            type="cluster",
-            id=cluster.id,
-            label=cluster.label or f"Cluster {cluster.id[:8]}...",
-            preview=f"주소: {cluster.address_count}개, 잔액: {cluster.total_balance} BTC"
-        ))
+@router.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete(
+    q: str = Query(..., min_length=1, description="입력 중인 검색어 (접두사)"),
+    limit: int = Query(10, ge=1, le=50, description="제안 개수")
+):
+    """
+    검색어 자동완성 (입력 중 제안)
 
-    logger.info(f"검색 완료: {len(results)}개 결과")
-    return results[:limit]
+    주소, txid, 클러스터 라벨의 접두사를 메모리 인덱스에서 찾는다. 주소/txid는 입력한
+    접두사 구간을 처음 조회할 때 로드되어 LRU로 유지되고, 수집이 커밋되면 새 항목이
+    추가된다. 라벨은 단어 단위로도 매칭되며 주기적으로 다시 로드된다.
+    DB 조회가 있을 수 있어 스레드풀에서 실행한다 (def 엔드포인트).
+
+    Args:
+        q: 입력 중인 검색어
+        limit: 제안 개수
+
+    Returns:
+        자동완성 제안 목록
+    """
+    return autocomplete_index.suggest(q, limit)
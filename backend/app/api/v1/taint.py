@@ -0,0 +1,165 @@
+"""Taint trace API endpoints"""
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import List, Optional
+
+from ...database import get_db
+from ...models import TaintTrace, TaintResult, TransactionOutput
+from ...schemas.common import PaginatedResponse
+from ...schemas.taint import TaintTraceRequest, TaintTraceResponse, TaintResultResponse, TaintAddressSummary
+from ...services.taint import TaintService
+from ...utils.logger import logger
+
+router = APIRouter()
+
+# 이 hop 수 이하의 추적은 요청 안에서 바로 실행, 그보다 깊으면 백그라운드 작업
+INLINE_MAX_HOPS = 3
+
+
+def _get_trace_or_404(db: Session, trace_id: str) -> TaintTrace:
+    trace = db.get(TaintTrace, trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="테인트 추적을 찾을 수 없습니다")
+    return trace
+
+
+@router.post("/traces", response_model=TaintTraceResponse)
+def create_taint_trace(
+    request: TaintTraceRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    테인트 추적 시작 (동일 조건의 기존 추적이 있으면 재사용)
+
+    얕은 추적은 요청 안에서 작업용 연결(JobSessionLocal)로 실행한다. 추적이 끝날 때까지
+    블록되므로 스레드풀에서 실행한다 (def 엔드포인트).
+
+    Args:
+        request: 추적 조건 (시작 출력, 방향, 정책, hop 수)
+        background_tasks: 깊은 추적을 실행할 백그라운드 작업
+        db: Database session
+
+    Returns:
+        추적 상태 (깊은 추적은 pending 상태로 반환, 이후 GET으로 조회)
+
+    Raises:
+        HTTPException: 시작 출력을 찾을 수 없는 경우 404
+    """
+    logger.info(f"테인트 추적 요청: {request.txid}:{request.vout}, {request.direction}/{request.policy}")
+
+    output = db.query(TransactionOutput.id).filter(
+        TransactionOutput.txid == request.txid,
+        TransactionOutput.vout == request.vout
+    ).first()
+    if not output:
+        raise HTTPException(status_code=404, detail="트랜잭션 출력을 찾을 수 없습니다")
+
+    trace, created = TaintService.find_or_create_trace(db, **request.model_dump())
+
+    if created:
+        if trace.max_hops <= INLINE_MAX_HOPS:
+            TaintService.run_trace_job(trace.id)
+            db.refresh(trace)
+        else:
+            background_tasks.add_task(TaintService.run_trace_job, trace.id)
+
+    return TaintTraceResponse.model_validate(trace)
+
+
+@router.get("/traces/{trace_id}", response_model=TaintTraceResponse)
+async def get_taint_trace(trace_id: str, db: Session = Depends(get_db)):
+    """
+    테인트 추적 상태 조회
+
+    Args:
+        trace_id: Trace UUID
+        db: Database session
+
+    Returns:
+        추적 상태
+
+    Raises:
+        HTTPException: 추적을 찾을 수 없는 경우 404
+    """
+    return TaintTraceResponse.model_validate(_get_trace_or_404(db, trace_id))
+
+
+@router.get("/traces/{trace_id}/results", response_model=PaginatedResponse[TaintResultResponse])
+async def get_taint_results(
+    trace_id: str,
+    db: Session = Depends(get_db),
+    hop: Optional[int] = Query(None, ge=0, description="특정 hop만 조회"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """
+    테인트 추적 결과 (오염된 출력 목록)
+
+    Args:
+        trace_id: Trace UUID
+        db: Database session
+        hop: 특정 hop만 조회
+        limit: 페이지 크기
+        offset: 시작 위치
+
+    Returns:
+        오염된 출력 목록 (hop, 오염 금액 순)
+
+    Raises:
+        HTTPException: 추적을 찾을 수 없는 경우 404
+    """
+    trace = _get_trace_or_404(db, trace_id)
+
+    query = db.query(TaintResult).filter(TaintResult.trace_id == trace.id)
+    if hop is not None:
+        query = query.filter(TaintResult.hop == hop)
+
+    total = query.count()
+    results = query.order_by(TaintResult.hop, TaintResult.taint.desc()).limit(limit).offset(offset).all()
+
+    total_pages = (total + limit - 1) // limit if total > 0 else 1
+    current_page = (offset // limit) + 1
+
+    return PaginatedResponse(
+        data=[TaintResultResponse.model_validate(r) for r in results],
+        total=total,
+        page=current_page,
+        page_size=limit,
+        total_pages=total_pages
+    )
+
+
+@router.get("/traces/{trace_id}/addresses", response_model=List[TaintAddressSummary])
+async def get_taint_addresses(
+    trace_id: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """
+    주소별 오염 금액 합계 (오염 금액이 큰 순)
+
+    Args:
+        trace_id: Trace UUID
+        db: Database session
+        limit: 결과 개수
+
+    Returns:
+        주소별 오염 금액
+
+    Raises:
+        HTTPException: 추적을 찾을 수 없는 경우 404
+    """
+    trace = _get_trace_or_404(db, trace_id)
+
+    rows = db.query(
+        TaintResult.address,
+        func.sum(TaintResult.taint).label('taint'),
+        func.count().label('output_count')
+    ).filter(
+        TaintResult.trace_id == trace.id,
+        TaintResult.address.isnot(None)
+    ).group_by(TaintResult.address).order_by(func.sum(TaintResult.taint).desc()).limit(limit).all()
+
+    return [TaintAddressSummary(address=address, taint=round(taint, 8), output_count=count) for address, taint, count in rows]
@@ -45,6 +45,62 @@ class Settings(BaseSettings):
         alias="REDIS_URL"
     )
 
+    # Graph cache
+    graph_cache_size: int = Field(
+        default=128,
+        alias="GRAPH_CACHE_SIZE"
+    )
+    graph_cache_dir: Optional[str] = Field(
+        default=None,
+        alias="GRAPH_CACHE_DIR"
+    )
+
+    # Search result cache
+    search_cache_size: int = Field(
+        default=256,
+        alias="SEARCH_CACHE_SIZE"
+    )
+    search_cache_ttl: float = Field(
+        default=30.0,
+        alias="SEARCH_CACHE_TTL"
+    )
+
+    # Autocomplete index (cached keys per kind, least recently used prefix buckets are evicted)
+    autocomplete_max_entries: int = Field(
+        default=200000,
+        alias="AUTOCOMPLETE_MAX_ENTRIES"
+    )
+    # Seconds before cluster labels are reloaded (new or renamed labels)
+    autocomplete_label_ttl: float = Field(
+        default=60.0,
+        alias="AUTOCOMPLETE_LABEL_TTL"
+    )
+
+    # Summary statistics reconciliation interval in seconds (0 = disabled)
+    stats_reconcile_interval: float = Field(
+        default=3600.0,
+        alias="STATS_RECONCILE_INTERVAL"
+    )
+
+    # Seconds a pending/running taint trace may go without progress before it is
+    # considered dead (process restarted or crashed) and requested traces start over
+    taint_trace_stale_after: float = Field(
+        default=600.0,
+        alias="TAINT_TRACE_STALE_AFTER"
+    )
+
+    # HyperLogLog precision (registers = 2^p, relative error ~ 1.04/sqrt(2^p));
+    # stored sketches keep their precision (unions fall back to the lowest one),
+    # run scripts/reconcile_stats.py after changing it
+    hll_day_precision: int = Field(
+        default=14,
+        alias="HLL_DAY_PRECISION"
+    )
+    hll_cluster_precision: int = Field(
+        default=12,
+        alias="HLL_CLUSTER_PRECISION"
+    )
+
     # Application
     secret_key: str = Field(
         default="dev_secret_key",
@@ -1,8 +1,9 @@
 """Database configuration and session management"""
 import logging
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, QueuePool
 
 logger = logging.getLogger(__name__)
 
@@ -12,13 +13,51 @@ DATABASE_URL = "sqlite:///./bitcoin_analysis.db"
 # 엔진 생성
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},  # FastAPI용
+    connect_args={"check_same_thread": False, "timeout": 30},  # FastAPI용, 작업 연결의 쓰기 잠금은 최대 30초 대기
     poolclass=StaticPool,  # 단일 연결 풀
     echo=False  # SQL 로그 출력 (개발 시 True로 변경 가능)
 )
 
+# 읽기 전용 엔진 (검색 등 동시 실행되는 조회용, WAL 모드에서 쓰기와 병행 가능)
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=4,
+    max_overflow=4,
+    echo=False
+)
+
+# 백그라운드 작업용 엔진 (통계 재계산, 테인트 추적 등)
+# engine은 모든 요청 세션이 한 연결을 공유하므로, 스레드풀에서 도는 작업이 같은 연결을 쓰면
+# 요청 세션의 close/rollback이 작업의 쓰기를 되돌린다. 작업마다 별도 연결을 쓰고,
+# 트랜잭션을 BEGIN IMMEDIATE로 시작해 읽기와 쓰기가 다른 쓰기 사이에 끼지 않게 한다.
+job_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=QueuePool,
+    pool_size=2,
+    max_overflow=2,
+    echo=False
+)
+
+
+@event.listens_for(job_engine, "connect")
+def disable_driver_transactions(dbapi_conn, connection_record):
+    """pysqlite의 암묵적 BEGIN 비활성화 (begin 이벤트에서 직접 시작)"""
+    dbapi_conn.isolation_level = None
+
+
+@event.listens_for(job_engine, "begin")
+def begin_immediate(conn):
+    """작업 트랜잭션은 시작할 때 쓰기 잠금을 잡음 (다른 쓰기는 busy timeout 동안 대기)"""
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
 # PRAGMA 설정
 @event.listens_for(engine, "connect")
+@event.listens_for(read_engine, "connect")
+@event.listens_for(job_engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
     """SQLite3 PRAGMA 설정"""
     cursor = dbapi_conn.cursor()
@@ -32,6 +71,8 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
 
 # 세션 팩토리
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+JobSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=job_engine)
 
 # Base 클래스
 Base = declarative_base()
@@ -50,4 +91,157 @@ def init_db():
     """데이터베이스 초기화"""
     logger.info("데이터베이스 테이블 생성 시작")
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _update_indexes()
+    _create_search_index()
+    _create_rollup_triggers()
     logger.info("데이터베이스 테이블 생성 완료")
+
+
+# create_all은 기존 테이블에 컬럼을 추가하지 않으므로 이후 추가된 컬럼은 여기서 보완
+ADDED_COLUMNS = {
+    "clusters": {"version": "INTEGER NOT NULL DEFAULT 0"},
+}
+
+
+def _add_missing_columns():
+    """기존 데이터베이스에 누락된 컬럼 추가"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                    logger.info(f"컬럼 추가: {table}.{name}")
+
+
+# 복합 인덱스로 대체된 인덱스 (커서 페이지네이션용 정렬 키 포함)
+DROPPED_INDEXES = ["idx_clusters_balance", "idx_addresses_cluster_balance"]
+
+
+def _update_indexes():
+    """기존 테이블에 새로 정의된 인덱스 생성, 대체된 인덱스 삭제"""
+    inspector = inspect(engine)
+    _dedupe_cluster_edges(inspector)
+    with engine.begin() as conn:
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+
+def _dedupe_cluster_edges(inspector):
+    """
+    고유 인덱스 idx_cluster_edges_pair가 없던 DB의 중복 (source, target) 간선 정리
+
+    이전 버전(목업 데이터 포함)은 같은 클러스터 쌍의 간선을 여러 행으로 저장할 수 있어
+    고유 인덱스 생성이 실패하므로, 중복이 있으면 트랜잭션 흐름에서 간선을 재구축한다.
+    """
+    if not inspector.has_table("cluster_edges"):
+        return
+    if "idx_cluster_edges_pair" in {index["name"] for index in inspector.get_indexes("cluster_edges")}:
+        return
+
+    with engine.connect() as conn:
+        duplicated = conn.execute(text(
+            "SELECT 1 FROM cluster_edges GROUP BY source_cluster_id, target_cluster_id HAVING COUNT(*) > 1 LIMIT 1"
+        )).first()
+    if duplicated is None:
+        return
+
+    from .services.cluster_edges import ClusterEdgeService
+
+    db = SessionLocal()
+    try:
+        logger.warning("중복 클러스터 간선 발견: 고유 인덱스 생성 전에 간선 재구축")
+        ClusterEdgeService.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+# 라벨이 있는 클러스터만 색인하는 FTS5 테이블 (트리거로 clusters와 동기화)
+SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS clusters_fts USING fts5(
+        label, cluster_id UNINDEXED, tokenize = 'unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS clusters_fts_insert AFTER INSERT ON clusters
+    WHEN new.label IS NOT NULL BEGIN
+        INSERT INTO clusters_fts (label, cluster_id) VALUES (new.label, new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clusters_fts_delete AFTER DELETE ON clusters
+    WHEN old.label IS NOT NULL BEGIN
+        DELETE FROM clusters_fts WHERE cluster_id = old.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS clusters_fts_update AFTER UPDATE OF id, label ON clusters
+    WHEN old.label IS NOT NULL OR new.label IS NOT NULL BEGIN
+        DELETE FROM clusters_fts WHERE cluster_id = old.id;
+        INSERT INTO clusters_fts (label, cluster_id) SELECT new.label, new.id WHERE new.label IS NOT NULL;
+    END""",
+]
+
+# FTS5를 사용할 수 없는 SQLite 빌드에서는 False (검색은 라벨 접두사 검색으로 대체)
+fts_available = True
+
+
+def _create_search_index():
+    """클러스터 라벨 전문 검색 인덱스 생성"""
+    global fts_available
+
+    inspector = inspect(engine)
+    if not inspector.has_table("clusters"):
+        return
+    created = not inspector.has_table("clusters_fts")
+
+    try:
+        with engine.begin() as conn:
+            for ddl in SEARCH_INDEX_DDL:
+                conn.execute(text(ddl))
+            if created:
+                conn.execute(text(
+                    "INSERT INTO clusters_fts (label, cluster_id) SELECT label, id FROM clusters WHERE label IS NOT NULL"
+                ))
+                logger.info("클러스터 라벨 검색 인덱스 생성 완료")
+    except OperationalError as e:
+        fts_available = False
+        logger.warning(f"FTS5 검색 인덱스를 생성할 수 없음: {e}")
+
+
+# clusters의 address_count 변경을 크기 히스토그램(cluster_size_counts)에 바로 반영
+ROLLUP_TRIGGERS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS cluster_size_counts_insert AFTER INSERT ON clusters BEGIN
+        INSERT INTO cluster_size_counts (size, count) VALUES (coalesce(new.address_count, 0), 1)
+        ON CONFLICT (size) DO UPDATE SET count = count + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cluster_size_counts_delete AFTER DELETE ON clusters BEGIN
+        UPDATE cluster_size_counts SET count = count - 1 WHERE size = coalesce(old.address_count, 0);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cluster_size_counts_update AFTER UPDATE OF address_count ON clusters
+    WHEN old.address_count IS NOT new.address_count BEGIN
+        UPDATE cluster_size_counts SET count = count - 1 WHERE size = coalesce(old.address_count, 0);
+        INSERT INTO cluster_size_counts (size, count) VALUES (coalesce(new.address_count, 0), 1)
+        ON CONFLICT (size) DO UPDATE SET count = count + 1;
+    END""",
+]
+
+
+def _create_rollup_triggers():
+    """집계 테이블 유지 트리거 생성 (비어 있으면 기존 데이터로 채움)"""
+    inspector = inspect(engine)
+    if not inspector.has_table("clusters") or not inspector.has_table("cluster_size_counts"):
+        return
+
+    with engine.begin() as conn:
+        for ddl in ROLLUP_TRIGGERS_DDL:
+            conn.execute(text(ddl))
+        if conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM cluster_size_counts)")).scalar():
+            conn.execute(text(
+                "INSERT INTO cluster_size_counts (size, count) "
+                "SELECT coalesce(address_count, 0), count(*) FROM clusters GROUP BY 1"
+            ))
@@ -3,12 +3,17 @@ from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import logging
 import os
 from pathlib import Path
 
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
 from .database import init_db
-from .api.v1 import addresses, clusters, search, analytics, test
+from .api.v1 import addresses, clusters, search, analytics, taint, test
+from .services.stats_rollup import StatsRollupService
 from .utils.logger import setup_logger
 
 # Setup logger
@@ -72,6 +77,25 @@ async def startup_event():
     init_db()
     logger.info("데이터베이스 초기화 완료")
 
+    if settings.stats_reconcile_interval > 0:
+        app.state.stats_reconcile_task = asyncio.create_task(reconcile_stats_periodically())
+
+
+async def reconcile_stats_periodically():
+    """요약 통계를 주기적으로 기본 테이블과 맞춤 (증분 갱신 누락 보정)"""
+    while True:
+        await asyncio.sleep(settings.stats_reconcile_interval)
+        await run_in_threadpool(StatsRollupService.reconcile_job)
+
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 실행"""
+    task = getattr(app.state, "stats_reconcile_task", None)
+    if task:
+        task.cancel()
+
 
 # Root endpoint
 @app.get("/")
@@ -120,6 +144,12 @@ app.include_router(
     tags=["analytics"]
 )
 
+app.include_router(
+    taint.router,
+    prefix="/api/v1/taint",
+    tags=["taint"]
+)
+
 app.include_router(
     test.router,
     prefix="/api/v1/test",
@@ -1,13 +1,25 @@
 """Database models"""
-from .address import Address
+from .address import Address, AddressEdge
 from .transaction import Transaction, TransactionInput, TransactionOutput
 from .cluster import Cluster, ClusterEdge
+from .checkpoint import JobCheckpoint
+from .taint import TaintTrace, TaintResult
+from .stats import SummaryStat, ClusterSizeCount, BlockStat, DailyStat, DistinctSketch
 
 __all__ = [
     "Address",
+    "AddressEdge",
     "Transaction",
     "TransactionInput",
     "TransactionOutput",
     "Cluster",
     "ClusterEdge",
+    "JobCheckpoint",
+    "TaintTrace",
+    "TaintResult",
+    "SummaryStat",
+    "ClusterSizeCount",
+    "BlockStat",
+    "DailyStat",
+    "DistinctSketch",
 ]
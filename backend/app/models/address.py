@@ -27,8 +27,28 @@ class Address(Base):
     __table_args__ = (
         Index('idx_addresses_cluster', 'cluster_id'),
         Index('idx_addresses_balance', 'balance'),
-        Index('idx_addresses_cluster_balance', 'cluster_id', 'balance'),
+        Index('idx_addresses_cluster_balance_address', 'cluster_id', 'balance', 'address'),  # 클러스터 내 정렬 + 커서 페이지네이션
     )
 
     def __repr__(self):
         return f"<Address {self.address[:10]}... balance={self.balance}>"
+
+
+class AddressEdge(Base):
+    """Address adjacency (주소 간 자금 흐름 집계)"""
+    __tablename__ = "address_edges"
+
+    source_address = Column(String, primary_key=True)
+    target_address = Column(String, primary_key=True)
+    tx_count = Column(Integer, default=0)
+    total_amount = Column(Float, default=0.0)
+    first_seen = Column(String, nullable=True)
+    last_seen = Column(String, nullable=True)
+
+    # Indexes (primary key covers source -> target lookups)
+    __table_args__ = (
+        Index('idx_address_edges_target', 'target_address', 'source_address'),
+    )
+
+    def __repr__(self):
+        return f"<AddressEdge {self.source_address[:10]}... -> {self.target_address[:10]}... txs={self.tx_count}>"
@@ -0,0 +1,16 @@
+"""Job checkpoint model"""
+from datetime import datetime
+from sqlalchemy import Column, String, Integer
+from ..database import Base
+
+
+class JobCheckpoint(Base):
+    """Background job progress (마지막으로 처리한 블록 높이)"""
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String, primary_key=True)
+    last_block_height = Column(Integer, nullable=True)
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat(), onupdate=lambda: datetime.utcnow().isoformat())
+
+    def __repr__(self):
+        return f"<JobCheckpoint {self.name} height={self.last_block_height}>"
@@ -18,6 +18,7 @@ class Cluster(Base):
     tx_count = Column(Integer, default=0)
     first_seen = Column(String, nullable=True)
     last_seen = Column(String, nullable=True)
+    version = Column(Integer, default=0, nullable=False)  # 멤버십/통계 변경 시 증가 (그래프 캐시 키)
     created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
     updated_at = Column(String, default=lambda: datetime.utcnow().isoformat(), onupdate=lambda: datetime.utcnow().isoformat())
 
@@ -27,7 +28,7 @@ class Cluster(Base):
     # Indexes
     __table_args__ = (
         Index('idx_clusters_address_count', 'address_count'),
-        Index('idx_clusters_balance', 'total_balance'),
+        Index('idx_clusters_balance_id', 'total_balance', 'id'),  # 목록 정렬 + 커서 페이지네이션
     )
 
     def __repr__(self):
@@ -50,6 +51,7 @@ class ClusterEdge(Base):
     __table_args__ = (
         Index('idx_cluster_edges_source', 'source_cluster_id'),
         Index('idx_cluster_edges_target', 'target_cluster_id'),
+        Index('idx_cluster_edges_pair', 'source_cluster_id', 'target_cluster_id', unique=True),
     )
 
     def __repr__(self):
@@ -0,0 +1,85 @@
+"""Analytics rollup models"""
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Integer, LargeBinary
+from ..database import Base
+
+
+class SummaryStat(Base):
+    """Global counter kept up to date by ingestion and clustering (대시보드 요약 통계)"""
+    __tablename__ = "summary_stats"
+
+    name = Column(String, primary_key=True)
+    value = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat(), onupdate=lambda: datetime.utcnow().isoformat())
+
+    def __repr__(self):
+        return f"<SummaryStat {self.name}={self.value}>"
+
+
+class ClusterSizeCount(Base):
+    """Number of clusters per exact address_count (clusters 트리거로 유지되는 크기 히스토그램)"""
+    __tablename__ = "cluster_size_counts"
+
+    size = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ClusterSizeCount size={self.size} count={self.count}>"
+
+
+class BlockStat(Base):
+    """Per-block transaction rollup (수집 시 증분 갱신)"""
+    __tablename__ = "block_stats"
+
+    block_height = Column(Integer, primary_key=True, autoincrement=False)
+    timestamp = Column(String, nullable=True)  # 블록 내 가장 이른 트랜잭션 시각
+    tx_count = Column(Integer, nullable=False, default=0)
+    input_count = Column(Integer, nullable=False, default=0)
+    output_count = Column(Integer, nullable=False, default=0)
+    volume = Column(Float, nullable=False, default=0.0)  # 출력 금액 합계 (BTC)
+    fee_total = Column(Float, nullable=False, default=0.0)
+    fee_min = Column(Float, nullable=True)  # 수수료가 있는 트랜잭션 중 최소
+    fee_max = Column(Float, nullable=True)
+    new_addresses = Column(Integer, nullable=False, default=0)  # 이 블록에서 처음 등장한 주소 수
+
+    @property
+    def fee_avg(self) -> float:
+        return round(self.fee_total / self.tx_count, 8) if self.tx_count else 0.0
+
+    def __repr__(self):
+        return f"<BlockStat {self.block_height} txs={self.tx_count}>"
+
+
+class DailyStat(Base):
+    """Per-day (UTC) transaction rollup (수집 시 증분 갱신)"""
+    __tablename__ = "daily_stats"
+
+    day = Column(String, primary_key=True)  # YYYY-MM-DD
+    tx_count = Column(Integer, nullable=False, default=0)
+    input_count = Column(Integer, nullable=False, default=0)
+    output_count = Column(Integer, nullable=False, default=0)
+    volume = Column(Float, nullable=False, default=0.0)
+    fee_total = Column(Float, nullable=False, default=0.0)
+    fee_min = Column(Float, nullable=True)
+    fee_max = Column(Float, nullable=True)
+    new_addresses = Column(Integer, nullable=False, default=0)
+
+    @property
+    def fee_avg(self) -> float:
+        return round(self.fee_total / self.tx_count, 8) if self.tx_count else 0.0
+
+    def __repr__(self):
+        return f"<DailyStat {self.day} txs={self.tx_count}>"
+
+
+class DistinctSketch(Base):
+    """Serialized HyperLogLog sketch (scope별 근사 고유 개수)"""
+    __tablename__ = "distinct_sketches"
+
+    scope = Column(String, primary_key=True)  # active_addresses_day, cluster_counterparties
+    key = Column(String, primary_key=True)  # YYYY-MM-DD 또는 클러스터 ID
+    sketch = Column(LargeBinary, nullable=False)
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat(), onupdate=lambda: datetime.utcnow().isoformat())
+
+    def __repr__(self):
+        return f"<DistinctSketch {self.scope}:{self.key}>"
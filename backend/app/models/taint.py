@@ -0,0 +1,57 @@
+"""Taint trace models"""
+from datetime import datetime
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Index
+from ..database import Base
+
+
+class TaintTrace(Base):
+    """Taint trace job (출력 하나에서 시작하는 자금 추적)"""
+    __tablename__ = "taint_traces"
+
+    id = Column(String, primary_key=True)  # UUID를 TEXT로 저장
+    txid = Column(String, nullable=False)
+    vout = Column(Integer, nullable=False)
+    direction = Column(String, nullable=False)  # forward, backward
+    policy = Column(String, nullable=False)  # haircut, fifo
+    max_hops = Column(Integer, nullable=False)
+    min_taint = Column(Float, default=0.0)
+    max_frontier = Column(Integer, nullable=False)
+    status = Column(String, default="pending")  # pending, running, completed, failed
+    hops_completed = Column(Integer, default=0)
+    result_count = Column(Integer, default=0)
+    truncated_amount = Column(Float, default=0.0)  # 프론티어 제한으로 추적을 중단한 금액
+    error = Column(String, nullable=True)
+    created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat(), onupdate=lambda: datetime.utcnow().isoformat())
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_taint_traces_params', 'txid', 'vout', 'direction', 'policy'),
+    )
+
+    def __repr__(self):
+        return f"<TaintTrace {self.id[:8]}... {self.direction}/{self.policy} status={self.status}>"
+
+
+class TaintResult(Base):
+    """Tainted output reached by a trace"""
+    __tablename__ = "taint_results"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trace_id = Column(String, ForeignKey("taint_traces.id"), nullable=False)
+    hop = Column(Integer, nullable=False)
+    txid = Column(String, nullable=False)
+    vout = Column(Integer, nullable=False)
+    address = Column(String, nullable=True)
+    amount = Column(Float, default=0.0)
+    taint = Column(Float, default=0.0)  # 추적 대상 자금이 차지하는 금액 (BTC)
+    propagated = Column(Integer, default=0)  # 1 = 다음 hop으로 계속 추적, 0 = 추적 종료 지점
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_taint_results_trace_hop', 'trace_id', 'hop'),
+        Index('idx_taint_results_trace_address', 'trace_id', 'address'),
+    )
+
+    def __repr__(self):
+        return f"<TaintResult {self.txid[:10]}...:{self.vout} taint={self.taint}>"
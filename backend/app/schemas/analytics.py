@@ -0,0 +1,54 @@
+"""Analytics Pydantic schemas"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class BlockStatsResponse(BaseModel):
+    """Per-block rollup schema"""
+    block_height: int
+    timestamp: Optional[str] = Field(None, description="Earliest transaction time in the block")
+    tx_count: int
+    input_count: int
+    output_count: int
+    volume: float = Field(..., description="Sum of output amounts (BTC)")
+    fee_total: float
+    fee_avg: float
+    fee_min: Optional[float] = Field(None, description="Smallest non-zero fee")
+    fee_max: Optional[float] = None
+    new_addresses: int = Field(..., description="Addresses first paid in this block")
+
+    class Config:
+        from_attributes = True
+
+
+class DailyStatsResponse(BaseModel):
+    """Per-day (UTC) rollup schema"""
+    day: str = Field(..., description="YYYY-MM-DD")
+    tx_count: int
+    input_count: int
+    output_count: int
+    volume: float = Field(..., description="Sum of output amounts (BTC)")
+    fee_total: float
+    fee_avg: float
+    fee_min: Optional[float] = Field(None, description="Smallest non-zero fee")
+    fee_max: Optional[float] = None
+    new_addresses: int = Field(..., description="Addresses first paid on this day")
+
+    class Config:
+        from_attributes = True
+
+
+class ActiveAddressesResponse(BaseModel):
+    """Approximate distinct active addresses over a day range"""
+    start: str
+    end: str
+    days: int = Field(..., description="Days in the range with activity")
+    estimate: int = Field(..., description="Approximate number of distinct addresses")
+    relative_error: float = Field(..., description="Relative standard error of the estimate (1.04/sqrt(m))")
+
+
+class CounterpartyCountResponse(BaseModel):
+    """Approximate distinct counterparties of a cluster"""
+    cluster_id: str
+    estimate: int = Field(..., description="Approximate number of distinct counterparty addresses")
+    relative_error: float = Field(..., description="Relative standard error of the estimate (1.04/sqrt(m))")
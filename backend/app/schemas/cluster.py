@@ -26,7 +26,8 @@ class ClusterResponse(BaseModel):
     last_seen: Optional[str] = Field(None, description="Last seen timestamp")
     created_at: str = Field(..., description="Created timestamp")
     updated_at: str = Field(..., description="Updated timestamp")
-    addresses: List[AddressInCluster] = Field(default_factory=list, description="Addresses in this cluster")
+    addresses: List[AddressInCluster] = Field(default_factory=list, description="Top addresses by balance")
+    addresses_next_cursor: Optional[str] = Field(None, description="Cursor for the remaining addresses (GET /clusters/{id}/addresses)")
 
     class Config:
         from_attributes = True
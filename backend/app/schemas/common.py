@@ -10,9 +10,10 @@ class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response schema"""
     data: List[T]
     total: int = Field(..., description="Total number of items")
-    page: int = Field(1, description="Current page number")
+    page: Optional[int] = Field(1, description="Current page number (offset paging only)")
     page_size: int = Field(50, description="Items per page")
     total_pages: int = Field(..., description="Total number of pages")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (keyset paging)")
 
     class Config:
         from_attributes = True
@@ -50,6 +51,13 @@ class SearchResult(BaseModel):
         from_attributes = True
 
 
+class AutocompleteSuggestion(BaseModel):
+    """Search-as-you-type suggestion"""
+    type: str = Field(..., description="Suggestion type: address, transaction, cluster")
+    id: str = Field(..., description="Item ID")
+    label: str = Field(..., description="Display text (address, txid or cluster label)")
+
+
 class GraphNode(BaseModel):
     """Graph node schema"""
     id: str = Field(..., description="Node ID")
@@ -57,6 +65,7 @@ class GraphNode(BaseModel):
     label: str = Field(..., description="Node label")
     balance: Optional[float] = Field(None, description="Balance (for address nodes)")
     cluster_id: Optional[str] = Field(None, description="Cluster ID")
+    size: Optional[int] = Field(None, description="Number of addresses (group nodes)")
 
     class Config:
         from_attributes = True
@@ -68,6 +77,9 @@ class GraphEdge(BaseModel):
     target: str = Field(..., description="Target node ID")
     amount: float = Field(..., description="Transaction amount")
     timestamp: Optional[str] = Field(None, description="Transaction timestamp")
+    count: Optional[int] = Field(None, description="Number of transactions (aggregated edges)")
+    first_timestamp: Optional[str] = Field(None, description="First transaction timestamp (aggregated edges)")
+    last_timestamp: Optional[str] = Field(None, description="Last transaction timestamp (aggregated edges)")
 
     class Config:
         from_attributes = True
@@ -0,0 +1,60 @@
+"""Taint trace Pydantic schemas"""
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class TaintTraceRequest(BaseModel):
+    """Taint trace request schema"""
+    txid: str = Field(..., description="Transaction ID of the starting output")
+    vout: int = Field(..., ge=0, description="Output index of the starting output")
+    direction: str = Field("forward", pattern="^(forward|backward)$", description="forward: where the coins went, backward: where they came from")
+    policy: str = Field("haircut", pattern="^(haircut|fifo)$", description="Taint policy")
+    max_hops: int = Field(5, ge=1, le=50, description="Number of hops to trace")
+    min_taint: float = Field(0.0, ge=0, description="Minimum tainted amount (BTC) to record and follow")
+    max_frontier: int = Field(1000, ge=1, le=100000, description="Maximum outputs followed per hop")
+
+
+class TaintTraceResponse(BaseModel):
+    """Taint trace status schema"""
+    id: str = Field(..., description="Trace ID (UUID)")
+    txid: str
+    vout: int
+    direction: str
+    policy: str
+    max_hops: int
+    min_taint: float
+    max_frontier: int
+    status: str = Field(..., description="pending, running, completed or failed")
+    hops_completed: int
+    result_count: int
+    truncated_amount: float = Field(..., description="Tainted amount (BTC) not followed because of max_frontier")
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+    class Config:
+        from_attributes = True
+
+
+class TaintResultResponse(BaseModel):
+    """Tainted output schema"""
+    hop: int
+    txid: str
+    vout: int
+    address: Optional[str] = None
+    amount: float
+    taint: float = Field(..., description="Tainted amount in BTC")
+    propagated: int = Field(..., description="1 if the trace continued from this output")
+
+    class Config:
+        from_attributes = True
+
+
+class TaintAddressSummary(BaseModel):
+    """Tainted amount received per address"""
+    address: str
+    taint: float = Field(..., description="Total tainted amount in BTC")
+    output_count: int
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,148 @@
+"""Precomputed address-to-address adjacency index"""
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from ..models import AddressEdge, Transaction, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+
+
+class AddressAdjacencyService:
+    """
+    Maintain ``address_edges``: one row per (source, target) address pair
+
+    Every transaction contributes one edge from each distinct input address
+    to each distinct output address (self-payments excluded), weighted by the
+    amount paid to the target. Rows aggregate tx_count, total_amount and the
+    first/last transaction time, so expanding a node's neighbors is a single
+    primary-key (or target index) range scan.
+    """
+
+    @staticmethod
+    def _edge_select(txids: Optional[Sequence[str]] = None):
+        """Aggregated (source, target) edges for the given transactions"""
+        sources = select(TransactionInput.txid, TransactionInput.address).where(
+            TransactionInput.address.isnot(None)
+        ).distinct()
+        targets = select(
+            TransactionOutput.txid,
+            TransactionOutput.address,
+            func.sum(TransactionOutput.amount).label('amount')
+        ).where(TransactionOutput.address.isnot(None))
+
+        if txids is not None:
+            sources = sources.where(TransactionInput.txid.in_(txids))
+            targets = targets.where(TransactionOutput.txid.in_(txids))
+
+        sources = sources.subquery()
+        targets = targets.group_by(TransactionOutput.txid, TransactionOutput.address).subquery()
+
+        return select(
+            sources.c.address.label('source_address'),
+            targets.c.address.label('target_address'),
+            func.count().label('tx_count'),
+            func.sum(targets.c.amount).label('total_amount'),
+            func.min(Transaction.timestamp).label('first_seen'),
+            func.max(Transaction.timestamp).label('last_seen'),
+        ).select_from(sources).join(
+            targets, targets.c.txid == sources.c.txid
+        ).join(
+            Transaction, Transaction.txid == sources.c.txid
+        ).where(
+            sources.c.address != targets.c.address
+        ).group_by(sources.c.address, targets.c.address)
+
+    @staticmethod
+    def apply_transactions(db: Session, txids: Sequence[str]) -> int:
+        """
+        Add newly ingested transactions to the index (upsert)
+
+        Each transaction must be applied exactly once.
+
+        Args:
+            db: Database session
+            txids: IDs of the newly stored transactions
+
+        Returns:
+            Number of edge rows inserted or updated
+        """
+        columns = ['source_address', 'target_address', 'tx_count', 'total_amount', 'first_seen', 'last_seen']
+        upserted = 0
+
+        for chunk in chunked(txids):
+            stmt = insert(AddressEdge).from_select(columns, AddressAdjacencyService._edge_select(chunk))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[AddressEdge.source_address, AddressEdge.target_address],
+                set_={
+                    'tx_count': AddressEdge.tx_count + stmt.excluded.tx_count,
+                    'total_amount': AddressEdge.total_amount + stmt.excluded.total_amount,
+                    'first_seen': func.min(func.coalesce(AddressEdge.first_seen, stmt.excluded.first_seen), stmt.excluded.first_seen),
+                    'last_seen': func.max(func.coalesce(AddressEdge.last_seen, stmt.excluded.last_seen), stmt.excluded.last_seen),
+                }
+            )
+            upserted += db.execute(stmt).rowcount
+
+        logger.info(f"주소 인접 인덱스 갱신: 트랜잭션 {len(txids)}개, 간선 {upserted}개")
+        return upserted
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Rebuild the whole index from transaction_inputs/transaction_outputs
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of edge rows
+        """
+        db.execute(delete(AddressEdge))
+        columns = ['source_address', 'target_address', 'tx_count', 'total_amount', 'first_seen', 'last_seen']
+        result = db.execute(insert(AddressEdge).from_select(columns, AddressAdjacencyService._edge_select()))
+
+        logger.info(f"주소 인접 인덱스 재구축 완료: {result.rowcount}개 간선")
+        return result.rowcount
+
+    @staticmethod
+    def neighbors(
+        db: Session,
+        address: str,
+        direction: str = "out",
+        min_amount: float = 0.0,
+        limit: int = 50
+    ) -> List[Dict]:
+        """
+        Neighbors of an address from the index
+
+        Args:
+            db: Database session
+            address: Bitcoin address
+            direction: "out" (address paid them) or "in" (they paid address)
+            min_amount: Minimum aggregated amount in BTC
+            limit: Maximum number of neighbors (largest amount first)
+
+        Returns:
+            List of neighbor dictionaries
+        """
+        if direction == "in":
+            anchor, neighbor = AddressEdge.target_address, AddressEdge.source_address
+        else:
+            anchor, neighbor = AddressEdge.source_address, AddressEdge.target_address
+
+        rows = db.query(
+            neighbor, AddressEdge.tx_count, AddressEdge.total_amount, AddressEdge.first_seen, AddressEdge.last_seen
+        ).filter(
+            anchor == address,
+            AddressEdge.total_amount >= min_amount
+        ).order_by(AddressEdge.total_amount.desc()).limit(limit).all()
+
+        return [{
+            'address': addr,
+            'tx_count': tx_count,
+            'total_amount': total_amount,
+            'first_seen': first_seen,
+            'last_seen': last_seen
+        } for addr, tx_count, total_amount, first_seen, last_seen in rows]
@@ -0,0 +1,317 @@
+"""In-memory prefix index for search-as-you-type suggestions"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import ReadSessionLocal
+from ..models import Address, Transaction, Cluster
+from ..utils.logger import logger
+from .search import prefix_range
+
+
+HEX_PATTERN = re.compile(r"^[0-9a-f]+$")
+
+# Label suffixes shorter than this are not indexed ("hot wallet" -> "wallet" is, "a" is not)
+MIN_LABEL_WORD = 2
+
+# Keys loaded per prefix bucket; a bucket holding more keys keeps only the first ones
+BUCKET_CAP = 1000
+
+# session.info key for index updates waiting for the session to commit
+PENDING_KEY = "autocomplete_pending"
+
+
+class PrefixBuckets:
+    """
+    LRU cache of sorted key lists, one per query prefix, for one column
+
+    A query is served from the bucket of its first ``bucket_len``
+    characters (or of the whole query if it is shorter). A bucket is
+    loaded with one indexed range query and holds at most ``BUCKET_CAP``
+    keys in sorted order; when a lookup runs past the end of a truncated
+    bucket the caller falls back to the database. Buckets are evicted
+    least recently used first once the kind holds ``max_entries`` keys, so
+    memory stays bounded however large the table is while the prefixes
+    people actually type stay cached.
+    """
+
+    def __init__(
+        self,
+        column,
+        bucket_len: int,
+        max_entries: int,
+        encode: Callable = lambda value: value,
+        decode: Callable = lambda value: value,
+        lower_bound: Optional[Callable] = None
+    ):
+        self.column = column
+        self.bucket_len = bucket_len
+        self.max_entries = max_entries
+        self.encode = encode
+        self.decode = decode
+        self.lower_bound = lower_bound or encode
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[List, bool]]" = OrderedDict()  # prefix -> (keys, complete)
+        self._size = 0
+
+    def suggest(self, q: str, limit: int) -> Optional[List[str]]:
+        """
+        Keys starting with q, in order
+
+        Returns:
+            Up to limit keys, or None if the cached bucket cannot tell
+        """
+        prefix = q[:self.bucket_len]
+        with self._lock:
+            bucket = self._buckets.get(prefix)
+            if bucket is not None:
+                self._buckets.move_to_end(prefix)
+        if bucket is None:
+            bucket = self._load(prefix)
+
+        entries, complete = bucket
+        matches = []
+        position = bisect_left(entries, self.lower_bound(q))
+        while position < len(entries):
+            value = self.decode(entries[position])
+            if not value.startswith(q):
+                return matches
+            matches.append(value)
+            if len(matches) == limit:
+                return matches
+            position += 1
+        return matches if complete else None
+
+    def add(self, keys: Iterable[str]):
+        """Insert new keys into the loaded buckets they belong to"""
+        keys = set(keys)
+        if not keys:
+            return
+        with self._lock:
+            by_bucket: Dict[str, List] = {}
+            for key in keys:
+                for length in range(1, self.bucket_len + 1):
+                    if key[:length] in self._buckets:
+                        by_bucket.setdefault(key[:length], []).append(self.encode(key))
+
+            for prefix, added in by_bucket.items():
+                entries, complete = self._buckets[prefix]
+                if not complete and entries:
+                    added = [value for value in added if value < entries[-1]]
+                if not added:
+                    continue
+                # Build a new list so concurrent lookups never see one being sorted
+                merged = sorted(entries + added)
+                if not complete:
+                    merged = merged[:len(entries)]
+                self._size += len(merged) - len(entries)
+                self._buckets[prefix] = (merged, complete)
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._size = 0
+
+    def _load(self, prefix: str) -> Tuple[List, bool]:
+        db = ReadSessionLocal()
+        try:
+            values = [value for (value,) in db.query(self.column).filter(
+                prefix_range(self.column, prefix)
+            ).order_by(self.column).limit(BUCKET_CAP + 1)]
+        finally:
+            db.close()
+
+        complete = len(values) <= BUCKET_CAP
+        bucket = ([self.encode(value) for value in values[:BUCKET_CAP]], complete)
+
+        with self._lock:
+            if prefix not in self._buckets:
+                self._buckets[prefix] = bucket
+                self._size += len(bucket[0])
+            while self._size > self.max_entries and len(self._buckets) > 1:
+                _, (evicted, _) = self._buckets.popitem(last=False)
+                self._size -= len(evicted)
+        return bucket
+
+
+class AutocompleteIndex:
+    """
+    Prefix index over addresses, txids and cluster labels
+
+    Addresses and txids are served from ``PrefixBuckets`` (txids stored as
+    32 raw bytes instead of 64-character strings), so each kind keeps at
+    most ``max_entries`` keys in memory and a lookup is a binary search in
+    one cached bucket. Cluster labels are few and are loaded whole; their
+    keys are the lowercased label and every word suffix of it, so "hot"
+    matches "Binance Hot Wallet". Labels are reloaded after ``label_ttl``
+    seconds, so new and renamed labels show up without a restart.
+
+    Ingestion and clustering register their changes with ``defer``; they
+    are applied when the session commits and dropped if it rolls back.
+    """
+
+    def __init__(self, max_entries: int = 200_000, label_ttl: float = 60.0):
+        self.label_ttl = label_ttl
+        self._lock = threading.Lock()
+        self._addresses = PrefixBuckets(Address.address, 6, max_entries)
+        # An odd-length hex prefix is padded with "0" for the lower bound
+        self._txids = PrefixBuckets(
+            Transaction.txid, 4, max_entries, bytes.fromhex, bytes.hex,
+            lower_bound=lambda q: bytes.fromhex(q + "0" * (len(q) % 2))
+        )
+        self._labels: Optional[List[Tuple[str, str, str]]] = None  # (key, cluster_id, label)
+        self._labels_loaded_at = 0.0
+
+    def suggest(self, q: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Suggestions for a query prefix
+
+        Args:
+            q: Prefix typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Dicts with type, id and label; addresses first, then
+            transactions, then clusters
+        """
+        q = q.strip()
+        if not q:
+            return []
+
+        suggestions: List[Dict[str, str]] = []
+
+        addresses = self._addresses.suggest(q, limit)
+        if addresses is None:
+            addresses = self._query_database(Address.address, q, limit)
+        suggestions.extend({"type": "address", "id": address, "label": address} for address in addresses)
+
+        lowered = q.lower()
+        if len(suggestions) < limit and HEX_PATTERN.match(lowered):
+            remaining = limit - len(suggestions)
+            txids = self._txids.suggest(lowered, remaining)
+            if txids is None:
+                txids = self._query_database(Transaction.txid, lowered, remaining)
+            suggestions.extend({"type": "transaction", "id": txid, "label": txid} for txid in txids)
+
+        if len(suggestions) < limit:
+            labels = self._current_labels()
+            seen = set()
+            position = bisect_left(labels, (lowered,))
+            while position < len(labels) and len(suggestions) < limit:
+                key, cluster_id, label = labels[position]
+                if not key.startswith(lowered):
+                    break
+                position += 1
+                if cluster_id not in seen:
+                    seen.add(cluster_id)
+                    suggestions.append({"type": "cluster", "id": cluster_id, "label": label})
+
+        return suggestions[:limit]
+
+    def add_addresses(self, addresses: Iterable[str]):
+        """Insert newly stored addresses into the cached buckets"""
+        self._addresses.add(addresses)
+
+    def add_transactions(self, txids: Iterable[str]):
+        """Insert newly stored txids into the cached buckets"""
+        self._txids.add(txids)
+
+    def remove_clusters(self, cluster_ids: Iterable[str]):
+        """Drop label entries of clusters that were merged away"""
+        removed = set(cluster_ids)
+        with self._lock:
+            if self._labels is None or not removed:
+                return
+            self._labels = [entry for entry in self._labels if entry[1] not in removed]
+
+    def defer(
+        self,
+        db: Session,
+        addresses: Iterable[str] = (),
+        txids: Iterable[str] = (),
+        removed_clusters: Iterable[str] = ()
+    ):
+        """
+        Queue index updates until db commits (discarded on rollback)
+
+        Args:
+            db: Session whose transaction stores the changes
+            addresses: Newly stored addresses
+            txids: Newly stored txids
+            removed_clusters: Clusters merged away
+        """
+        pending = db.info.setdefault(PENDING_KEY, {"addresses": [], "txids": [], "removed_clusters": []})
+        pending["addresses"].extend(addresses)
+        pending["txids"].extend(txids)
+        pending["removed_clusters"].extend(removed_clusters)
+
+    def apply_pending(self, pending: Dict[str, List[str]]):
+        """Apply updates queued by ``defer``"""
+        self.add_addresses(pending["addresses"])
+        self.add_transactions(pending["txids"])
+        self.remove_clusters(pending["removed_clusters"])
+
+    def clear(self):
+        """Forget everything; lookups reload from the database"""
+        self._addresses.clear()
+        self._txids.clear()
+        with self._lock:
+            self._labels = None
+            self._labels_loaded_at = 0.0
+
+    def _current_labels(self) -> List[Tuple[str, str, str]]:
+        with self._lock:
+            if self._labels is not None and time.monotonic() - self._labels_loaded_at < self.label_ttl:
+                return self._labels
+
+        db = ReadSessionLocal()
+        try:
+            labels = []
+            for cluster_id, label in db.query(Cluster.id, Cluster.label).filter(Cluster.label.isnot(None)):
+                labels.extend((key, cluster_id, label) for key in self._label_keys(label))
+            labels.sort()
+        finally:
+            db.close()
+
+        with self._lock:
+            self._labels = labels
+            self._labels_loaded_at = time.monotonic()
+        logger.info(f"자동완성 라벨 로드: 라벨 키 {len(labels)}개")
+        return labels
+
+    @staticmethod
+    def _label_keys(label: str) -> List[str]:
+        words = label.lower().split()
+        return [" ".join(words[i:]) for i in range(len(words)) if len(words[i]) >= MIN_LABEL_WORD or i == 0]
+
+    @staticmethod
+    def _query_database(column, q: str, limit: int) -> List[str]:
+        db = ReadSessionLocal()
+        try:
+            return [value for (value,) in db.query(column).filter(
+                prefix_range(column, q)
+            ).order_by(column).limit(limit)]
+        finally:
+            db.close()
+
+
+autocomplete_index = AutocompleteIndex(settings.autocomplete_max_entries, settings.autocomplete_label_ttl)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_updates(session: Session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        autocomplete_index.apply_pending(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_updates(session: Session):
+    session.info.pop(PENDING_KEY, None)
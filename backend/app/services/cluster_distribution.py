@@ -0,0 +1,102 @@
+"""Cluster size distribution over the size histogram"""
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import case, func, insert, select, delete
+from sqlalchemy.orm import Session
+
+from ..models import Cluster, ClusterSizeCount
+
+
+# Lower bounds of the default buckets: 1, 2-5, 6-10, 11-20, 21-50, 51+
+DEFAULT_EDGES = (1, 2, 6, 11, 21, 51)
+
+# Upper limit on the number of buckets (log scale stops well before this)
+MAX_BUCKETS = 64
+
+
+class ClusterDistributionService:
+    """
+    Cluster size histograms from ``cluster_size_counts``
+
+    ``cluster_size_counts`` holds the number of clusters per exact
+    ``address_count`` and is kept current by triggers on ``clusters``
+    (see ``database.ROLLUP_TRIGGERS_DDL``), so it has one row per distinct
+    size rather than per cluster. A distribution for any bucket edges is a
+    single grouped ``CASE`` query over it.
+    """
+
+    @staticmethod
+    def log_edges(base: int = 2) -> List[int]:
+        """
+        Bucket lower bounds 1, base, base^2, ... up to the largest cluster
+
+        Args:
+            base: Growth factor between buckets (>= 2)
+
+        Returns:
+            Bucket lower bounds
+        """
+        edges = [1]
+        while len(edges) < MAX_BUCKETS and edges[-1] < 2 ** 40:
+            edges.append(edges[-1] * base)
+        return edges
+
+    @staticmethod
+    def bucket_label(edges: Sequence[int], index: int) -> str:
+        """"a-b", "a" for a single size, or "a+" for the open last bucket"""
+        low = edges[index]
+        if index == len(edges) - 1:
+            return f"{low}+"
+        high = edges[index + 1] - 1
+        return str(low) if low == high else f"{low}-{high}"
+
+    @staticmethod
+    def distribution(db: Session, edges: Sequence[int], trim: bool = False) -> List[Tuple[str, int]]:
+        """
+        Number of clusters per size bucket
+
+        Args:
+            db: Database session
+            edges: Strictly increasing bucket lower bounds; sizes below the
+                first edge are not counted, the last bucket is open-ended
+            trim: Drop empty buckets after the last non-empty one
+
+        Returns:
+            (label, count) per bucket, in edge order
+        """
+        size = ClusterSizeCount.size
+        bucket = case(
+            *((size >= edge, index) for index, edge in reversed(list(enumerate(edges)))),
+            else_=-1
+        ).label('bucket')
+
+        rows = db.execute(
+            select(bucket, func.sum(ClusterSizeCount.count))
+            .where(size >= edges[0], ClusterSizeCount.count > 0)
+            .group_by(bucket)
+        )
+        counts = {index: int(total) for index, total in rows}
+
+        last = max(counts, default=0) if trim else len(edges) - 1
+
+        return [
+            (ClusterDistributionService.bucket_label(edges, index), counts.get(index, 0))
+            for index in range(last + 1)
+        ]
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Recompute the histogram from ``clusters`` (drift repair)
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of distinct sizes
+        """
+        db.execute(delete(ClusterSizeCount))
+        sizes = select(
+            func.coalesce(Cluster.address_count, 0), func.count()
+        ).group_by(func.coalesce(Cluster.address_count, 0))
+        return db.execute(insert(ClusterSizeCount).from_select(['size', 'count'], sizes)).rowcount
@@ -0,0 +1,246 @@
+"""Inter-cluster flow edges derived from transactions"""
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, aliased
+
+from ..models import Address, ClusterEdge, Transaction, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+
+
+EDGE_COLUMNS = ['source_cluster_id', 'target_cluster_id', 'tx_count', 'total_amount', 'first_tx_timestamp', 'last_tx_timestamp']
+
+# Bound parameters per refresh statement (txids plus the refreshed clusters they involve)
+REFRESH_BATCH_PARAMS = 500
+
+
+class ClusterEdgeService:
+    """
+    Maintain ``cluster_edges`` from transaction inputs/outputs
+
+    A transaction creates an edge from every distinct cluster among its
+    inputs to every other cluster among its outputs, weighted by the amount
+    paid into the target cluster. Edges are upserted for new transactions
+    and recomputed from the raw flows for clusters whose membership changed.
+    """
+
+    @staticmethod
+    def _edge_select(txids: Optional[Sequence[str]] = None, cluster_ids: Optional[Sequence[str]] = None):
+        """Aggregated (source cluster, target cluster) edges"""
+        input_address = aliased(Address)
+        output_address = aliased(Address)
+
+        sources = select(
+            TransactionInput.txid.label('txid'),
+            input_address.cluster_id.label('cluster_id')
+        ).join(
+            input_address, input_address.address == TransactionInput.address
+        ).where(input_address.cluster_id.isnot(None)).distinct()
+
+        targets = select(
+            TransactionOutput.txid.label('txid'),
+            output_address.cluster_id.label('cluster_id'),
+            func.sum(TransactionOutput.amount).label('amount')
+        ).join(
+            output_address, output_address.address == TransactionOutput.address
+        ).where(output_address.cluster_id.isnot(None))
+
+        if txids is not None:
+            sources = sources.where(TransactionInput.txid.in_(txids))
+            targets = targets.where(TransactionOutput.txid.in_(txids))
+
+        sources = sources.subquery()
+        targets = targets.group_by(TransactionOutput.txid, output_address.cluster_id).subquery()
+
+        query = select(
+            sources.c.cluster_id.label('source_cluster_id'),
+            targets.c.cluster_id.label('target_cluster_id'),
+            func.count().label('tx_count'),
+            func.sum(targets.c.amount).label('total_amount'),
+            func.min(Transaction.timestamp).label('first_tx_timestamp'),
+            func.max(Transaction.timestamp).label('last_tx_timestamp'),
+        ).select_from(sources).join(
+            targets, targets.c.txid == sources.c.txid
+        ).join(
+            Transaction, Transaction.txid == sources.c.txid
+        ).where(
+            sources.c.cluster_id != targets.c.cluster_id
+        )
+
+        if cluster_ids is not None:
+            query = query.where(or_(
+                sources.c.cluster_id.in_(cluster_ids),
+                targets.c.cluster_id.in_(cluster_ids)
+            ))
+
+        return query.group_by(sources.c.cluster_id, targets.c.cluster_id)
+
+    @staticmethod
+    def apply_transactions(db: Session, txids: Sequence[str]) -> int:
+        """
+        Add the flows of newly ingested transactions (upsert)
+
+        Only addresses that already belong to a cluster contribute; clusters
+        that gain members later are fixed up by ``refresh_clusters``.
+
+        Args:
+            db: Database session
+            txids: IDs of the newly stored transactions
+
+        Returns:
+            Number of edge rows inserted or updated
+        """
+        upserted = 0
+
+        for chunk in chunked(txids):
+            upserted += ClusterEdgeService._upsert_edges(db, ClusterEdgeService._edge_select(txids=chunk))
+
+        logger.info(f"클러스터 간선 갱신: 트랜잭션 {len(txids)}개, 간선 {upserted}개")
+        return upserted
+
+    @staticmethod
+    def _upsert_edges(db: Session, edges) -> int:
+        """Insert edge aggregates, adding them to existing edges"""
+        stmt = insert(ClusterEdge).from_select(EDGE_COLUMNS, edges)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ClusterEdge.source_cluster_id, ClusterEdge.target_cluster_id],
+            set_={
+                'tx_count': ClusterEdge.tx_count + stmt.excluded.tx_count,
+                'total_amount': ClusterEdge.total_amount + stmt.excluded.total_amount,
+                'first_tx_timestamp': func.min(
+                    func.coalesce(ClusterEdge.first_tx_timestamp, stmt.excluded.first_tx_timestamp),
+                    stmt.excluded.first_tx_timestamp
+                ),
+                'last_tx_timestamp': func.max(
+                    func.coalesce(ClusterEdge.last_tx_timestamp, stmt.excluded.last_tx_timestamp),
+                    stmt.excluded.last_tx_timestamp
+                ),
+            }
+        )
+        return db.execute(stmt).rowcount
+
+    @staticmethod
+    def _cluster_transactions(db: Session, cluster_ids: Sequence[str]) -> Dict[str, Set[str]]:
+        """
+        txid -> clusters among cluster_ids that the transaction touches
+
+        Resolved from the clusters' addresses through the address indexes of
+        inputs and outputs, so the cost follows the clusters' own activity.
+        """
+        involved: Dict[str, Set[str]] = {}
+        for chunk in chunked(cluster_ids):
+            for table in (TransactionInput, TransactionOutput):
+                rows = db.query(table.txid, Address.cluster_id).join(
+                    Address, Address.address == table.address
+                ).filter(Address.cluster_id.in_(chunk)).distinct()
+                for txid, cluster_id in rows:
+                    involved.setdefault(txid, set()).add(cluster_id)
+        return involved
+
+    @staticmethod
+    def _refresh_batches(involved: Dict[str, Set[str]]) -> Iterator[Tuple[List[str], List[str]]]:
+        """Group txids so each batch binds about REFRESH_BATCH_PARAMS txids and clusters"""
+        txids: List[str] = []
+        clusters: Set[str] = set()
+        for txid, tx_clusters in involved.items():
+            if txids and len(txids) + len(clusters | tx_clusters) >= REFRESH_BATCH_PARAMS:
+                yield txids, sorted(clusters)
+                txids, clusters = [], set()
+            txids.append(txid)
+            clusters |= tx_clusters
+        if txids:
+            yield txids, sorted(clusters)
+
+    @staticmethod
+    def refresh_clusters(db: Session, cluster_ids: Sequence[str]) -> int:
+        """
+        Recompute every edge touching the given clusters from the raw flows
+
+        Used after cluster merges or membership changes. The clusters'
+        transactions are looked up through their addresses first, and only
+        those transactions are aggregated; each transaction is applied once,
+        restricted to edges with an endpoint among the refreshed clusters
+        (the only edges that were deleted).
+
+        Args:
+            db: Database session
+            cluster_ids: Clusters whose membership changed
+
+        Returns:
+            Number of edge rows written
+        """
+        cluster_ids = list(set(cluster_ids))
+        written = 0
+
+        for chunk in chunked(cluster_ids):
+            db.execute(delete(ClusterEdge).where(or_(
+                ClusterEdge.source_cluster_id.in_(chunk),
+                ClusterEdge.target_cluster_id.in_(chunk)
+            )))
+
+        involved = ClusterEdgeService._cluster_transactions(db, cluster_ids)
+        for txids, clusters in ClusterEdgeService._refresh_batches(involved):
+            written += ClusterEdgeService._upsert_edges(
+                db, ClusterEdgeService._edge_select(txids=txids, cluster_ids=clusters)
+            )
+
+        logger.info(
+            f"클러스터 간선 재계산: 클러스터 {len(cluster_ids)}개, 트랜잭션 {len(involved)}개, 간선 {written}개"
+        )
+        return written
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Rebuild all cluster edges from transaction flows
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of edge rows
+        """
+        db.execute(delete(ClusterEdge))
+        result = db.execute(insert(ClusterEdge).from_select(EDGE_COLUMNS, ClusterEdgeService._edge_select()))
+
+        logger.info(f"클러스터 간선 재구축 완료: {result.rowcount}개")
+        return result.rowcount
+
+    @staticmethod
+    def get_flows(
+        db: Session,
+        cluster_id: str,
+        direction: str = "both",
+        min_amount: float = 0.0,
+        limit: int = 50
+    ) -> List[ClusterEdge]:
+        """
+        Largest flow edges into and/or out of a cluster
+
+        Args:
+            db: Database session
+            cluster_id: Cluster UUID
+            direction: "out", "in" or "both"
+            min_amount: Minimum total amount in BTC
+            limit: Maximum number of edges per direction
+
+        Returns:
+            ClusterEdge rows
+        """
+        edges: List[ClusterEdge] = []
+
+        if direction in ("out", "both"):
+            edges += db.query(ClusterEdge).filter(
+                ClusterEdge.source_cluster_id == cluster_id,
+                ClusterEdge.total_amount >= min_amount
+            ).order_by(ClusterEdge.total_amount.desc()).limit(limit).all()
+
+        if direction in ("in", "both"):
+            edges += db.query(ClusterEdge).filter(
+                ClusterEdge.target_cluster_id == cluster_id,
+                ClusterEdge.total_amount >= min_amount
+            ).order_by(ClusterEdge.total_amount.desc()).limit(limit).all()
+
+        return edges
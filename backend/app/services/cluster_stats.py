@@ -0,0 +1,151 @@
+"""Cluster statistics aggregation in SQL"""
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import select, update, func, exists, or_, union
+from sqlalchemy.orm import Session
+
+from ..models import Address, Cluster, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+from .stats_rollup import StatsRollupService
+
+
+class ClusterStatsService:
+    """
+    Refresh the denormalized ``Cluster`` aggregates from ``addresses``
+
+    All aggregates are computed by one grouped ``UPDATE ... FROM (SELECT ...
+    GROUP BY cluster_id)`` statement, so address rows never leave SQLite.
+
+    Only clusters whose aggregates actually changed are written, and each
+    write bumps ``Cluster.version`` so cached cluster graphs are invalidated.
+    """
+
+    @staticmethod
+    def refresh(db: Session, cluster_ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Recompute address_count, balances, tx_count and first/last seen
+
+        Args:
+            db: Database session
+            cluster_ids: Clusters to refresh (default: all clusters)
+
+        Returns:
+            Number of cluster rows that changed
+        """
+        if cluster_ids is None:
+            updated = ClusterStatsService._refresh_chunk(db, None)
+            logger.info(f"클러스터 통계 전체 갱신 완료: {updated}개 클러스터")
+            return updated
+
+        updated = 0
+        for chunk in chunked(set(cluster_ids)):
+            updated += ClusterStatsService._refresh_chunk(db, chunk)
+
+        logger.info(f"클러스터 통계 부분 갱신 완료: {updated}개 클러스터")
+        return updated
+
+    @staticmethod
+    def _refresh_chunk(db: Session, cluster_ids: Optional[list]) -> int:
+        # address_count feeds the clustered_addresses rollup; track how much this refresh moves it
+        counts = select(func.coalesce(func.sum(Cluster.address_count), 0))
+        if cluster_ids is not None:
+            counts = counts.where(Cluster.id.in_(cluster_ids))
+        counted_before = db.execute(counts).scalar()
+
+        aggregates = select(
+            Address.cluster_id.label('cluster_id'),
+            func.count().label('address_count'),
+            func.coalesce(func.sum(Address.balance), 0.0).label('total_balance'),
+            func.coalesce(func.sum(Address.total_received), 0.0).label('total_received'),
+            func.coalesce(func.sum(Address.total_sent), 0.0).label('total_sent'),
+            func.coalesce(func.sum(Address.tx_count), 0).label('tx_count'),
+            func.min(Address.first_seen).label('first_seen'),
+            func.max(Address.last_seen).label('last_seen'),
+        ).where(Address.cluster_id.isnot(None))
+
+        if cluster_ids is not None:
+            aggregates = aggregates.where(Address.cluster_id.in_(cluster_ids))
+
+        aggregates = aggregates.group_by(Address.cluster_id).subquery()
+
+        columns = ('address_count', 'total_balance', 'total_received', 'total_sent', 'tx_count', 'first_seen', 'last_seen')
+
+        result = db.execute(
+            update(Cluster)
+            .where(Cluster.id == aggregates.c.cluster_id)
+            .where(or_(*(
+                getattr(Cluster, column).is_distinct_from(aggregates.c[column]) for column in columns
+            )))
+            .values(
+                address_count=aggregates.c.address_count,
+                total_balance=aggregates.c.total_balance,
+                total_received=aggregates.c.total_received,
+                total_sent=aggregates.c.total_sent,
+                tx_count=aggregates.c.tx_count,
+                first_seen=aggregates.c.first_seen,
+                last_seen=aggregates.c.last_seen,
+                version=Cluster.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.rowcount
+
+        # Clusters that no longer have any address
+        empty = update(Cluster).where(
+            ~exists().where(Address.cluster_id == Cluster.id),
+            or_(*(
+                getattr(Cluster, column).is_distinct_from(0) for column in columns[:5]
+            ))
+        )
+        if cluster_ids is not None:
+            empty = empty.where(Cluster.id.in_(cluster_ids))
+
+        result = db.execute(
+            empty.values(
+                address_count=0,
+                total_balance=0.0,
+                total_received=0.0,
+                total_sent=0.0,
+                tx_count=0,
+                version=Cluster.version + 1,
+            ).execution_options(synchronize_session=False)
+        )
+        StatsRollupService.apply(db, {'clustered_addresses': db.execute(counts).scalar() - counted_before})
+        return updated + result.rowcount
+
+    @staticmethod
+    def bump_versions(db: Session, txids: Sequence[str]) -> int:
+        """
+        Bump the version of every cluster with an address in the given transactions
+
+        Called after ingestion so cached graphs of clusters that gained
+        transactions are not served stale.
+
+        Args:
+            db: Database session
+            txids: Newly stored transaction IDs
+
+        Returns:
+            Number of clusters bumped
+        """
+        bumped = 0
+
+        for chunk in chunked(txids):
+            touched = union(
+                select(TransactionInput.address).where(TransactionInput.txid.in_(chunk)),
+                select(TransactionOutput.address).where(TransactionOutput.txid.in_(chunk))
+            ).subquery()
+            cluster_ids = select(Address.cluster_id).where(
+                Address.address.in_(select(touched.c.address)),
+                Address.cluster_id.isnot(None)
+            )
+            bumped += db.execute(
+                update(Cluster)
+                .where(Cluster.id.in_(cluster_ids))
+                .values(version=Cluster.version + 1)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        logger.info(f"클러스터 버전 갱신: {bumped}개")
+        return bumped
@@ -1,7 +1,16 @@
 """Clustering service using Union-Find algorithm"""
-from typing import Dict, List, Set
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import os
+import time
 import uuid
 from ..utils.logger import logger
+from .heuristics import TxContext, build_heuristics
+
+
+# Namespace for deterministic cluster IDs (uuid5 of the cluster's smallest address)
+CLUSTER_ID_NAMESPACE = uuid.UUID("8fa5920f-8443-4497-9403-c628ae7ba17d")
 
 
 class UnionFind:
@@ -22,19 +31,23 @@ class UnionFind:
         if address not in self.parent:
             self.make_set(address)
 
-        if self.parent[address] != address:
-            # Path compression
-            self.parent[address] = self.find(self.parent[address])
+        # Iterative path compression (avoids the recursion limit on long chains)
+        root = address
+        while self.parent[root] != root:
+            root = self.parent[root]
 
-        return self.parent[address]
+        while self.parent[address] != root:
+            self.parent[address], address = root, self.parent[address]
 
-    def union(self, addr1: str, addr2: str):
-        """Union two sets"""
+        return root
+
+    def union(self, addr1: str, addr2: str) -> bool:
+        """Union two sets, returning True if they were previously disjoint"""
         root1 = self.find(addr1)
         root2 = self.find(addr2)
 
         if root1 == root2:
-            return
+            return False
 
         # Union by rank
         if self.rank[root1] < self.rank[root2]:
@@ -45,6 +58,8 @@ class UnionFind:
             self.parent[root2] = root1
             self.rank[root1] += 1
 
+        return True
+
     def get_clusters(self) -> Dict[str, Set[str]]:
         """Get all clusters as a dictionary of root -> addresses"""
         clusters: Dict[str, Set[str]] = {}
@@ -58,6 +73,167 @@ class UnionFind:
         return clusters
 
 
+class ArrayUnionFind:
+    """
+    Compact Union-Find over integer address IDs (0..n-1)
+
+    Parents and set sizes live in two unsigned 32-bit arrays, so memory is
+    8 bytes per address instead of two dict entries keyed by strings.
+    ``find`` is iterative with path halving and ``union`` is by size.
+    """
+
+    TYPECODE = 'I'
+
+    def __init__(self, size: int = 0):
+        self.parent = array(self.TYPECODE, range(size))
+        self.size = array(self.TYPECODE, [1]) * size
+        self.set_count = size
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self) -> int:
+        """Create a new singleton set and return its ID"""
+        new_id = len(self.parent)
+        self.parent.append(new_id)
+        self.size.append(1)
+        self.set_count += 1
+        return new_id
+
+    def grow(self, size: int):
+        """Extend the structure so that IDs up to size - 1 are valid"""
+        current = len(self.parent)
+        if size <= current:
+            return
+
+        self.parent.extend(range(current, size))
+        self.size.extend(array(self.TYPECODE, [1]) * (size - current))
+        self.set_count += size - current
+
+    def find(self, x: int) -> int:
+        """Find the root of the set containing x (iterative path halving)"""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Union two sets by size, returning True if they were disjoint"""
+        root_a = self.find(a)
+        root_b = self.find(b)
+
+        if root_a == root_b:
+            return False
+
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.set_count -= 1
+        return True
+
+    def union_pairs(self, left: Iterable[int], right: Iterable[int]) -> int:
+        """
+        Union many (left[i], right[i]) pairs in one call
+
+        The loop keeps the arrays in locals and inlines ``find`` so that bulk
+        loading avoids per-pair method dispatch.
+
+        Args:
+            left: Sequence of address IDs
+            right: Sequence of address IDs, same length as left
+
+        Returns:
+            Number of unions that merged two previously disjoint sets
+        """
+        parent = self.parent
+        size = self.size
+        merged = 0
+
+        for a, b in zip(left, right):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+
+            if a == b:
+                continue
+
+            if size[a] < size[b]:
+                a, b = b, a
+
+            parent[b] = a
+            size[a] += size[b]
+            merged += 1
+
+        self.set_count -= merged
+        return merged
+
+    def union_groups(self, groups: Iterable[Iterable[int]]) -> int:
+        """
+        Union every ID in each group with the group's first ID
+
+        Args:
+            groups: Iterable of ID groups (e.g. the input IDs of each transaction)
+
+        Returns:
+            Number of unions that merged two previously disjoint sets
+        """
+        left = array(self.TYPECODE)
+        right = array(self.TYPECODE)
+
+        for group in groups:
+            iterator = iter(group)
+            first = next(iterator, None)
+            if first is None:
+                continue
+            for other in iterator:
+                left.append(first)
+                right.append(other)
+
+        return self.union_pairs(left, right)
+
+    def roots(self) -> array:
+        """Return an array mapping every ID to its root, compressing all paths"""
+        find = self.find
+        return array(self.TYPECODE, (find(x) for x in range(len(self.parent))))
+
+    def get_clusters(self) -> Dict[int, List[int]]:
+        """Get all sets with more than one member as root -> IDs"""
+        clusters: Dict[int, List[int]] = {}
+
+        for x, root in enumerate(self.roots()):
+            if self.size[root] > 1:
+                clusters.setdefault(root, []).append(x)
+
+        return clusters
+
+
+def build_partial_forest(input_groups: List[List[str]]) -> List[List[str]]:
+    """
+    Build a union-find forest for one shard of co-spent input groups
+
+    Runs inside a worker process, so it only takes and returns plain lists.
+
+    Args:
+        input_groups: Input address lists of the shard's transactions
+
+    Returns:
+        Connected components of the shard
+    """
+    uf = UnionFind()
+    for addresses in input_groups:
+        first = addresses[0]
+        for addr in addresses[1:]:
+            uf.union(first, addr)
+
+    return [list(members) for members in uf.get_clusters().values()]
+
+
 class ClusteringService:
     """Service for clustering Bitcoin addresses"""
 
@@ -96,10 +272,139 @@ class ClusteringService:
         logger.info(f"클러스터링 완료: {len(clusters)}개 클러스터 생성")
         return clusters
 
+    @staticmethod
+    def cluster_by_co_spending_parallel(
+        transactions: List[Dict],
+        workers: Optional[int] = None,
+        shards: Optional[int] = None
+    ) -> Dict[str, Set[str]]:
+        """
+        Cluster addresses using co-spending heuristic across a process pool
+
+        Transactions are sorted by block height and split into contiguous
+        block ranges. Each shard builds a partial forest in a worker process
+        and the forests are merged in a final reduce step. The resulting
+        clusters are the same as ``cluster_by_co_spending``; only the root
+        used as the dictionary key may differ.
+
+        Args:
+            transactions: List of transaction dictionaries with 'inputs' and 'block_height'
+            workers: Number of worker processes (default: CPU count)
+            shards: Number of block-range shards (default: 4 per worker)
+
+        Returns:
+            Dictionary mapping cluster_id -> set of addresses
+        """
+        workers = workers or os.cpu_count() or 1
+        shards = shards or workers * 4
+        logger.info(f"병렬 Co-spending 클러스터링 시작: {len(transactions)}개 트랜잭션, 워커 {workers}개")
+
+        # Only multi-input transactions contribute edges
+        groups = []
+        for tx in transactions:
+            input_addresses = [inp.get('address') for inp in tx.get('inputs', []) if inp.get('address')]
+            if len(input_addresses) >= 2:
+                height = tx.get('block_height')
+                groups.append((height if height is not None else -1, input_addresses))
+
+        groups.sort(key=lambda item: item[0])
+        shard_size = max(1, -(-len(groups) // shards))
+        shard_groups = [
+            [addresses for _, addresses in groups[start:start + shard_size]]
+            for start in range(0, len(groups), shard_size)
+        ]
+
+        if workers == 1 or len(shard_groups) <= 1:
+            forests = [build_partial_forest(shard) for shard in shard_groups]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                forests = list(executor.map(build_partial_forest, shard_groups))
+
+        # Reduce: merge the partial forests
+        uf = UnionFind()
+        for forest in forests:
+            for component in forest:
+                first = component[0]
+                uf.make_set(first)
+                for addr in component[1:]:
+                    uf.union(first, addr)
+
+        clusters = uf.get_clusters()
+
+        logger.info(f"병렬 클러스터링 완료: {len(shard_groups)}개 샤드, {len(clusters)}개 클러스터 생성")
+        return clusters
+
+    @staticmethod
+    def cluster_with_heuristics(
+        transactions: List[Dict],
+        heuristics: Optional[List[str]] = None
+    ) -> Tuple[Dict[str, Set[str]], Dict[str, Dict]]:
+        """
+        Cluster addresses with several heuristics in one pass over the transactions
+
+        Every enabled heuristic sees each transaction once, in registry order
+        (CoinJoin exclusion, co-spending, then change detection), so enabling
+        another heuristic adds work per transaction but not another scan.
+
+        Args:
+            transactions: Transaction dictionaries with 'inputs' and 'outputs', in chain order
+            heuristics: Heuristic names to enable (default: coinjoin, co_spending)
+
+        Returns:
+            Tuple of (root -> addresses, heuristic name -> {'merges', 'seconds'})
+        """
+        passes = build_heuristics(heuristics)
+        logger.info(f"다중 휴리스틱 클러스터링 시작: {len(transactions)}개 트랜잭션, {[h.name for h in passes]}")
+
+        uf = UnionFind()
+        seen: Set[str] = set()
+        report = {h.name: {'merges': 0, 'seconds': 0.0} for h in passes}
+
+        for tx in transactions:
+            ctx = TxContext(tx)
+
+            for heuristic in passes:
+                start = time.perf_counter()
+                merges = 0
+                for addr1, addr2 in heuristic.process(ctx, seen):
+                    if uf.union(addr1, addr2):
+                        merges += 1
+                stats = report[heuristic.name]
+                stats['merges'] += merges
+                stats['seconds'] += time.perf_counter() - start
+
+            seen.update(ctx.input_addresses)
+            seen.update(addr for addr, _ in ctx.outputs)
+
+        clusters = uf.get_clusters()
+
+        for name, stats in report.items():
+            logger.info(f"  휴리스틱 {name}: 병합 {stats['merges']}회, {stats['seconds']:.3f}초")
+        logger.info(f"다중 휴리스틱 클러스터링 완료: {len(clusters)}개 클러스터 생성")
+        return clusters, report
+
+    @staticmethod
+    def stable_cluster_id(addresses: Iterable[str]) -> str:
+        """
+        Deterministic cluster UUID derived from the smallest member address
+
+        Args:
+            addresses: Addresses of the cluster
+
+        Returns:
+            Cluster UUID string
+        """
+        return str(uuid.uuid5(CLUSTER_ID_NAMESPACE, min(addresses)))
+
     @staticmethod
     def assign_cluster_ids(clusters: Dict[str, Set[str]]) -> Dict[str, str]:
         """
-        Assign UUID to each cluster
+        Assign a stable UUID to each cluster
+
+        Every cluster is keyed by ``stable_cluster_id``. The incremental job
+        uses the same IDs for new clusters but keeps the largest cluster's ID
+        when clusters merge, so after merges its IDs can differ from these
+        (see ``IncrementalClusteringService``).
 
         Args:
             clusters: Dictionary of root -> addresses
@@ -110,7 +415,7 @@ class ClusteringService:
         address_to_cluster: Dict[str, str] = {}
 
         for root, addresses in clusters.items():
-            cluster_id = str(uuid.uuid4())
+            cluster_id = ClusteringService.stable_cluster_id(addresses)
             for addr in addresses:
                 address_to_cluster[addr] = cluster_id
 
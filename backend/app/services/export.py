@@ -0,0 +1,135 @@
+"""Streaming exports of large result sets"""
+import csv
+import io
+import json
+from typing import Iterator, Sequence
+
+from sqlalchemy import select, func, literal, union_all
+from sqlalchemy.sql import Select
+
+from ..database import ReadSessionLocal
+from ..models import Address, Transaction, TransactionInput, TransactionOutput
+
+
+# Rows fetched from the cursor per batch (and lines per yielded chunk)
+EXPORT_BATCH_SIZE = 1000
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CLUSTER_ADDRESS_FIELDS = ("address", "balance", "tx_count", "total_received", "total_sent", "first_seen", "last_seen")
+ADDRESS_TRANSACTION_FIELDS = (
+    "txid", "block_height", "timestamp", "received", "sent", "fee", "total_input", "total_output"
+)
+
+
+class ExportService:
+    """
+    Row-by-row exports for ``StreamingResponse``
+
+    Each export opens its own read session (request-scoped sessions are
+    closed before a streaming body is sent) and walks the query with
+    ``yield_per``, so memory stays at one batch however large the export.
+    """
+
+    @staticmethod
+    def cluster_addresses(cluster_id: str, fmt: str = "ndjson") -> Iterator[bytes]:
+        """
+        Every address of a cluster, highest balance first
+
+        Args:
+            cluster_id: Cluster UUID
+            fmt: "ndjson" or "csv"
+
+        Yields:
+            Encoded chunks
+        """
+        query = select(*[getattr(Address, field) for field in CLUSTER_ADDRESS_FIELDS]).where(
+            Address.cluster_id == cluster_id
+        ).order_by(Address.balance.desc(), Address.address.desc())
+
+        return ExportService.stream(query, CLUSTER_ADDRESS_FIELDS, fmt)
+
+    @staticmethod
+    def address_transactions(address: str, fmt: str = "ndjson") -> Iterator[bytes]:
+        """
+        Every stored transaction touching an address, newest first
+
+        ``received``/``sent`` are the amounts the address gained from the
+        transaction's outputs and spent through its inputs.
+
+        Args:
+            address: Bitcoin address
+            fmt: "ndjson" or "csv"
+
+        Yields:
+            Encoded chunks
+        """
+        flows = union_all(
+            select(
+                TransactionOutput.txid.label("txid"),
+                TransactionOutput.amount.label("received"),
+                literal(0.0).label("sent")
+            ).where(TransactionOutput.address == address),
+            select(
+                TransactionInput.txid.label("txid"),
+                literal(0.0).label("received"),
+                TransactionInput.amount.label("sent")
+            ).where(TransactionInput.address == address)
+        ).subquery()
+
+        per_tx = select(
+            flows.c.txid,
+            func.sum(flows.c.received).label("received"),
+            func.sum(flows.c.sent).label("sent")
+        ).group_by(flows.c.txid).subquery()
+
+        query = select(
+            Transaction.txid, Transaction.block_height, Transaction.timestamp,
+            func.round(per_tx.c.received, 8), func.round(per_tx.c.sent, 8),
+            Transaction.fee, Transaction.total_input, Transaction.total_output
+        ).join(per_tx, per_tx.c.txid == Transaction.txid).order_by(
+            Transaction.timestamp.desc(), Transaction.txid.desc()
+        )
+
+        return ExportService.stream(query, ADDRESS_TRANSACTION_FIELDS, fmt)
+
+    @staticmethod
+    def stream(query: Select, fields: Sequence[str], fmt: str) -> Iterator[bytes]:
+        """
+        Execute a query on a read session and encode it batch by batch
+
+        Args:
+            query: Core select whose columns line up with fields
+            fields: Output field names
+            fmt: "ndjson" (one JSON object per line) or "csv" (with a header row)
+
+        Yields:
+            UTF-8 encoded chunks of up to EXPORT_BATCH_SIZE rows
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+
+        db = ReadSessionLocal()
+        try:
+            if fmt == "csv":
+                yield ExportService._csv_chunk([fields])
+
+            result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for partition in result.partitions():
+                if fmt == "csv":
+                    yield ExportService._csv_chunk(partition)
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n" for row in partition
+                    ).encode("utf-8")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _csv_chunk(rows) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
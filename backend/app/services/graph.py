@@ -1,5 +1,5 @@
 """Graph generation service"""
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 from ..schemas.common import GraphNode, GraphEdge, GraphData
 from ..utils.logger import logger
 
@@ -16,6 +16,9 @@ class GraphService:
         """
         Generate graph data for an address and its connections
 
+        Only transactions reachable from the address within depth hops
+        (address -> transaction -> address) are drawn.
+
         Args:
             address: Starting address
             transactions: List of transactions
@@ -31,6 +34,17 @@ class GraphService:
         visited_addresses: Set[str] = set()
         visited_txs: Set[str] = set()
 
+        # Index transactions by every address they touch
+        txs_by_address: Dict[str, List[Dict]] = {}
+        for tx in transactions:
+            touched = {
+                item.get('address')
+                for item in tx.get('inputs', []) + tx.get('outputs', [])
+                if item.get('address')
+            }
+            for addr in touched:
+                txs_by_address.setdefault(addr, []).append(tx)
+
         # Add starting address node
         nodes.append(GraphNode(
             id=address,
@@ -39,67 +53,76 @@ class GraphService:
             cluster_id=None
         ))
         visited_addresses.add(address)
+        frontier = [address]
 
-        # Process transactions
-        for tx in transactions[:50]:  # Limit to 50 transactions for performance
-            txid = tx.get('txid')
-            if not txid or txid in visited_txs:
-                continue
-
-            visited_txs.add(txid)
+        # Breadth-first traversal, one hop per level
+        for _ in range(depth):
+            next_frontier: List[str] = []
 
-            # Add transaction node
-            nodes.append(GraphNode(
-                id=txid,
-                type="transaction",
-                label=txid[:10] + "...",
-            ))
+            for frontier_address in frontier:
+                for tx in txs_by_address.get(frontier_address, []):
+                    txid = tx.get('txid')
+                    if not txid or txid in visited_txs:
+                        continue
 
-            # Add edges for inputs
-            for inp in tx.get('inputs', []):
-                inp_addr = inp.get('address')
-                if not inp_addr:
-                    continue
+                    visited_txs.add(txid)
 
-                # Add input address node if not visited
-                if inp_addr not in visited_addresses:
+                    # Add transaction node
                     nodes.append(GraphNode(
-                        id=inp_addr,
-                        type="address",
-                        label=inp_addr[:10] + "...",
+                        id=txid,
+                        type="transaction",
+                        label=txid[:10] + "...",
                     ))
-                    visited_addresses.add(inp_addr)
-
-                # Add edge from address to transaction
-                edges.append(GraphEdge(
-                    source=inp_addr,
-                    target=txid,
-                    amount=inp.get('amount', 0),
-                    timestamp=tx.get('timestamp')
-                ))
-
-            # Add edges for outputs
-            for out in tx.get('outputs', []):
-                out_addr = out.get('address')
-                if not out_addr:
-                    continue
 
-                # Add output address node if not visited
-                if out_addr not in visited_addresses:
-                    nodes.append(GraphNode(
-                        id=out_addr,
-                        type="address",
-                        label=out_addr[:10] + "...",
-                    ))
-                    visited_addresses.add(out_addr)
+                    # Add edges for inputs
+                    for inp in tx.get('inputs', []):
+                        inp_addr = inp.get('address')
+                        if not inp_addr:
+                            continue
+
+                        # Add input address node if not visited
+                        if inp_addr not in visited_addresses:
+                            nodes.append(GraphNode(
+                                id=inp_addr,
+                                type="address",
+                                label=inp_addr[:10] + "...",
+                            ))
+                            visited_addresses.add(inp_addr)
+                            next_frontier.append(inp_addr)
+
+                        # Add edge from address to transaction
+                        edges.append(GraphEdge(
+                            source=inp_addr,
+                            target=txid,
+                            amount=inp.get('amount', 0),
+                            timestamp=tx.get('timestamp')
+                        ))
 
-                # Add edge from transaction to address
-                edges.append(GraphEdge(
-                    source=txid,
-                    target=out_addr,
-                    amount=out.get('amount', 0),
-                    timestamp=tx.get('timestamp')
-                ))
+                    # Add edges for outputs
+                    for out in tx.get('outputs', []):
+                        out_addr = out.get('address')
+                        if not out_addr:
+                            continue
+
+                        # Add output address node if not visited
+                        if out_addr not in visited_addresses:
+                            nodes.append(GraphNode(
+                                id=out_addr,
+                                type="address",
+                                label=out_addr[:10] + "...",
+                            ))
+                            visited_addresses.add(out_addr)
+                            next_frontier.append(out_addr)
+
+                        # Add edge from transaction to address
+                        edges.append(GraphEdge(
+                            source=txid,
+                            target=out_addr,
+                            amount=out.get('amount', 0),
+                            timestamp=tx.get('timestamp')
+                        ))
+
+            frontier = next_frontier
 
         logger.info(f"그래프 생성 완료: {len(nodes)}개 노드, {len(edges)}개 엣지")
         return GraphData(nodes=nodes, edges=edges)
@@ -108,23 +131,33 @@ class GraphService:
     def generate_cluster_graph(
         cluster_id: str,
         addresses: List[Dict],
-        transactions: List[Dict]
+        transactions: List[Dict],
+        aggregate: bool = True
     ) -> GraphData:
         """
         Generate graph data for a cluster
 
+        Each transaction yields one edge per distinct (input address, output
+        address) pair, carrying the total paid to the output address, so an
+        address spending several inputs or receiving several outputs is not
+        counted twice. By default parallel edges are then merged into one
+        edge per (source, target) address pair with the summed amount,
+        transaction count and first/last timestamp. With ``aggregate=False``
+        the per-transaction edges are returned as they are.
+
         Args:
             cluster_id: Cluster ID
             addresses: List of addresses in cluster
             transactions: List of transactions
+            aggregate: Merge parallel edges
 
         Returns:
             GraphData with nodes and edges
         """
-        logger.info(f"클러스터 그래프 생성: {cluster_id}")
+        logger.info(f"클러스터 그래프 생성: {cluster_id}, aggregate={aggregate}")
 
         nodes: List[GraphNode] = []
-        edges: List[GraphEdge] = []
+        raw_edges: List[Dict] = []
 
         # Add address nodes
         for addr in addresses[:100]:  # Limit to 100 addresses
@@ -140,24 +173,133 @@ class GraphService:
         address_set = {addr.get('address') for addr in addresses}
 
         for tx in transactions[:200]:  # Limit transactions
-            txid = tx.get('txid')
             inputs = tx.get('inputs', [])
             outputs = tx.get('outputs', [])
 
-            # Find inputs and outputs in this cluster
-            cluster_inputs = [inp for inp in inputs if inp.get('address') in address_set]
-            cluster_outputs = [out for out in outputs if out.get('address') in address_set]
+            # Distinct cluster addresses on each side; amounts paid to the same address are summed
+            sources = list(dict.fromkeys(
+                inp.get('address') for inp in inputs if inp.get('address') in address_set
+            ))
+            targets: Dict[str, float] = {}
+            for out in outputs:
+                if out.get('address') in address_set:
+                    targets[out['address']] = targets.get(out['address'], 0) + (out.get('amount') or 0)
 
             # Create edges between addresses via transactions
-            for inp in cluster_inputs:
-                for out in cluster_outputs:
-                    if inp.get('address') != out.get('address'):
-                        edges.append(GraphEdge(
-                            source=inp.get('address'),
-                            target=out.get('address'),
-                            amount=out.get('amount', 0),
-                            timestamp=tx.get('timestamp')
-                        ))
+            for source in sources:
+                for target, amount in targets.items():
+                    if source != target:
+                        raw_edges.append({
+                            'txid': tx.get('txid'),
+                            'source': source,
+                            'target': target,
+                            'amount': amount,
+                            'timestamp': tx.get('timestamp')
+                        })
 
-        logger.info(f"클러스터 그래프 완료: {len(nodes)}개 노드, {len(edges)}개 엣지")
+        if aggregate:
+            edges = GraphService.aggregate_edges(raw_edges)
+        else:
+            edges = [GraphEdge(
+                source=edge['source'],
+                target=edge['target'],
+                amount=round(edge['amount'], 8),
+                timestamp=edge['timestamp']
+            ) for edge in raw_edges]
+
+        logger.info(f"클러스터 그래프 완료: {len(nodes)}개 노드, {len(edges)}개 엣지 (원본 {len(raw_edges)}개)")
         return GraphData(nodes=nodes, edges=edges)
+
+    @staticmethod
+    def aggregate_edges(edges: List[Dict]) -> List[GraphEdge]:
+        """
+        Merge parallel edges keyed by (source, target)
+
+        An edge repeated for the same transaction is counted once: ``count``
+        is the number of distinct txids and each (txid, source, target)
+        contributes its amount a single time. Edges without a txid are
+        treated as separate transactions.
+
+        Args:
+            edges: Edge dictionaries (txid, source, target, amount, timestamp)
+
+        Returns:
+            One GraphEdge per pair with summed amount, count and first/last timestamp
+        """
+        merged: Dict[Tuple[str, str], Dict] = {}
+        seen: Set[Tuple[str, str, str]] = set()
+
+        for edge in edges:
+            key = (edge['source'], edge['target'])
+            txid = edge.get('txid')
+            if txid is not None:
+                if (txid, *key) in seen:
+                    continue
+                seen.add((txid, *key))
+            timestamp = edge.get('timestamp')
+            current = merged.get(key)
+
+            if current is None:
+                merged[key] = {
+                    'amount': edge.get('amount') or 0,
+                    'count': 1,
+                    'first': timestamp,
+                    'last': timestamp
+                }
+                continue
+
+            current['amount'] += edge.get('amount') or 0
+            current['count'] += 1
+            if timestamp:
+                current['first'] = min(filter(None, (current['first'], timestamp)))
+                current['last'] = max(filter(None, (current['last'], timestamp)))
+
+        return [GraphEdge(
+            source=source,
+            target=target,
+            amount=round(agg['amount'], 8),
+            timestamp=agg['last'],
+            count=agg['count'],
+            first_timestamp=agg['first'],
+            last_timestamp=agg['last']
+        ) for (source, target), agg in merged.items()]
+
+    @staticmethod
+    def generate_cluster_flow_graph(
+        cluster_id: str,
+        clusters: List[Dict],
+        edges: List[Dict]
+    ) -> GraphData:
+        """
+        Generate a cluster-to-cluster flow graph
+
+        Args:
+            cluster_id: Center cluster ID
+            clusters: Cluster dictionaries (id, label, total_balance) for all endpoints
+            edges: Cluster edge dictionaries
+
+        Returns:
+            GraphData with cluster nodes and aggregated flow edges
+        """
+        logger.info(f"클러스터 흐름 그래프 생성: {cluster_id}")
+
+        nodes = [GraphNode(
+            id=cluster.get('id'),
+            type="cluster",
+            label=cluster.get('label') or cluster.get('id', '')[:8] + "...",
+            balance=cluster.get('total_balance'),
+            cluster_id=cluster.get('id')
+        ) for cluster in clusters]
+
+        graph_edges = [GraphEdge(
+            source=edge.get('source_cluster_id'),
+            target=edge.get('target_cluster_id'),
+            amount=edge.get('total_amount', 0),
+            timestamp=edge.get('last_tx_timestamp'),
+            count=edge.get('tx_count'),
+            first_timestamp=edge.get('first_tx_timestamp'),
+            last_timestamp=edge.get('last_tx_timestamp')
+        ) for edge in edges]
+
+        logger.info(f"클러스터 흐름 그래프 완료: {len(nodes)}개 노드, {len(graph_edges)}개 엣지")
+        return GraphData(nodes=nodes, edges=graph_edges)
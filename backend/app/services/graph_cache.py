@@ -0,0 +1,136 @@
+"""Versioned cache for generated cluster graphs"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from ..config import settings
+from ..schemas.common import GraphData
+from ..utils.logger import logger
+
+
+class GraphCache:
+    """
+    Size-bounded LRU cache of ``GraphData`` with an optional on-disk tier
+
+    Entries are keyed by ``(cluster_id, version, options)``. Because
+    ``Cluster.version`` is bumped whenever membership or statistics change,
+    stale entries are never returned; they simply age out of the LRU.
+
+    The disk tier keeps one JSON file per (cluster, options) holding the
+    latest version, so a newer version overwrites the older file and the
+    directory stays bounded by the number of distinct clusters viewed.
+    """
+
+    def __init__(self, max_entries: int = 128, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[Tuple, GraphData]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, cluster_id: str, version: int, options: Hashable = ()) -> Optional[GraphData]:
+        """
+        Cached graph for the given cluster version
+
+        Args:
+            cluster_id: Cluster UUID
+            version: Current ``Cluster.version``
+            options: Any other parameters the graph depends on
+
+        Returns:
+            GraphData, or None on a miss
+        """
+        key = (cluster_id, version, options)
+
+        with self._lock:
+            graph = self._entries.get(key)
+            if graph is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return graph
+
+        graph = self._read_disk(cluster_id, version, options)
+        with self._lock:
+            if graph is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, graph)
+        return graph
+
+    def put(self, cluster_id: str, version: int, graph: GraphData, options: Hashable = ()):
+        """
+        Store a generated graph
+
+        Args:
+            cluster_id: Cluster UUID
+            version: ``Cluster.version`` the graph was generated from
+            graph: Generated graph
+            options: Any other parameters the graph depends on
+        """
+        with self._lock:
+            self._store((cluster_id, version, options), graph)
+        self._write_disk(cluster_id, version, options, graph)
+
+    def clear(self):
+        """Drop every memory and disk entry"""
+        with self._lock:
+            self._entries.clear()
+
+        if self.disk_dir and os.path.isdir(self.disk_dir):
+            for name in os.listdir(self.disk_dir):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+        logger.info("그래프 캐시 초기화")
+
+    def _store(self, key: Tuple, graph: GraphData):
+        self._entries[key] = graph
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, cluster_id: str, options: Hashable) -> str:
+        digest = hashlib.sha1(repr(options).encode()).hexdigest()[:16]
+        return os.path.join(self.disk_dir, f"{cluster_id}-{digest}.json")
+
+    def _read_disk(self, cluster_id: str, version: int, options: Hashable) -> Optional[GraphData]:
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(cluster_id, options)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                header = f.readline()
+                if header.strip() != str(version):
+                    return None
+                return GraphData.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"그래프 캐시 파일 읽기 실패: {path} - {e}")
+            return None
+
+    def _write_disk(self, cluster_id: str, version: int, options: Hashable, graph: GraphData):
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(cluster_id, options)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(f"{version}\n")
+                f.write(graph.model_dump_json())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"그래프 캐시 파일 쓰기 실패: {path} - {e}")
+
+
+# 프로세스 전역 캐시 인스턴스
+graph_cache = GraphCache(settings.graph_cache_size, settings.graph_cache_dir)
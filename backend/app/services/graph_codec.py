@@ -0,0 +1,203 @@
+"""Compact graph payload encodings negotiated via the Accept header"""
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from ..schemas.common import GraphData
+
+
+COMPACT_JSON_MEDIA_TYPE = "application/x-graph-compact+json"
+COMPACT_BINARY_MEDIA_TYPE = "application/x-graph-compact"
+
+BINARY_MAGIC = b"CGR1"
+
+# column name -> (attribute, kind); "str" columns hold indexes into the string table
+NODE_COLUMNS: List[Tuple[str, str]] = [
+    ("id", "str"),
+    ("type", "str"),
+    ("label", "str"),
+    ("balance", "f64"),
+    ("cluster_id", "str"),
+    ("size", "i32"),
+]
+EDGE_COLUMNS: List[Tuple[str, str]] = [
+    ("amount", "f64"),
+    ("timestamp", "str"),
+    ("count", "i32"),
+    ("first_timestamp", "str"),
+    ("last_timestamp", "str"),
+]
+
+# array typecodes with a fixed 4/8-byte size on every platform
+TYPECODES = {"i32": "i", "f64": "d"}
+
+
+class GraphCodec:
+    """
+    Columnar encodings of ``GraphData``
+
+    Every string (node IDs, types, cluster IDs, timestamps) is interned once
+    into a string table and referenced by index (-1 for null); edges refer
+    to nodes by position instead of repeating 64-character IDs. Labels that
+    equal the default ``id[:10] + "..."`` are sent as null.
+
+    The compact JSON form holds the columns as plain arrays. The binary form
+    is ``CGR1``, a little-endian uint32 header length, a JSON header (string
+    table and column layout), then each column as a little-endian int32 or
+    float64 array aligned to 8 bytes, ready for typed-array views.
+    """
+
+    @staticmethod
+    def to_columns(graph: GraphData) -> Tuple[List[str], Dict[str, List], Dict[str, List]]:
+        """
+        Intern strings and split the graph into columns
+
+        Args:
+            graph: Graph to encode
+
+        Returns:
+            (string table, node columns, edge columns); edge columns include
+            "source" and "target" node positions
+        """
+        strings: List[str] = []
+        index: Dict[str, int] = {}
+
+        def intern(value: Optional[str]) -> int:
+            if value is None:
+                return -1
+            position = index.get(value)
+            if position is None:
+                position = index[value] = len(strings)
+                strings.append(value)
+            return position
+
+        node_position: Dict[str, int] = {}
+        nodes: Dict[str, List] = {name: [] for name, _ in NODE_COLUMNS}
+
+        for position, node in enumerate(graph.nodes):
+            node_position[node.id] = position
+            for name, kind in NODE_COLUMNS:
+                value = getattr(node, name)
+                if name == "label" and value == node.id[:10] + "...":
+                    value = None
+                nodes[name].append(intern(value) if kind == "str" else value)
+
+        edges: Dict[str, List] = {"source": [], "target": []}
+        edges.update({name: [] for name, _ in EDGE_COLUMNS})
+
+        for edge in graph.edges:
+            # Endpoints without a node are added as bare nodes
+            for end in ("source", "target"):
+                node_id = getattr(edge, end)
+                if node_id not in node_position:
+                    node_position[node_id] = len(nodes["id"])
+                    for name, kind in NODE_COLUMNS:
+                        nodes[name].append(intern(node_id) if name == "id" else (-1 if kind == "str" else None))
+                edges[end].append(node_position[node_id])
+
+            for name, kind in EDGE_COLUMNS:
+                value = getattr(edge, name)
+                edges[name].append(intern(value) if kind == "str" else value)
+
+        return strings, nodes, edges
+
+    @staticmethod
+    def encode_json(graph: GraphData) -> bytes:
+        """
+        Compact JSON encoding
+
+        Args:
+            graph: Graph to encode
+
+        Returns:
+            UTF-8 JSON bytes
+        """
+        strings, nodes, edges = GraphCodec.to_columns(graph)
+
+        payload = {
+            "format": "compact",
+            "version": 1,
+            "strings": strings,
+            "nodes": {name: values for name, values in nodes.items() if any(v not in (None, -1) for v in values)},
+            "edges": {name: values for name, values in edges.items() if any(v not in (None, -1) for v in values)},
+        }
+        # Node IDs are always present, even for an empty graph
+        payload["nodes"].setdefault("id", nodes["id"])
+        return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def encode_binary(graph: GraphData) -> bytes:
+        """
+        Binary encoding (JSON header + aligned little-endian column arrays)
+
+        Args:
+            graph: Graph to encode
+
+        Returns:
+            Encoded bytes
+        """
+        strings, nodes, edges = GraphCodec.to_columns(graph)
+        kinds = dict(NODE_COLUMNS)
+        kinds.update(EDGE_COLUMNS)
+        kinds.update(source="i32", target="i32")
+
+        blobs: List[bytes] = []
+        layout: Dict[str, Dict[str, Dict]] = {"nodes": {}, "edges": {}}
+        offset = 0
+
+        for section, columns in (("nodes", nodes), ("edges", edges)):
+            for name, values in columns.items():
+                dtype = "i32" if kinds[name] in ("str", "i32") else "f64"
+                if dtype == "f64":
+                    values = [math.nan if v is None else v for v in values]
+                else:
+                    values = [-1 if v is None else v for v in values]
+
+                data = array(TYPECODES[dtype], values)
+                if sys.byteorder == "big":
+                    data.byteswap()
+                blob = data.tobytes()
+                blob += b"\0" * (-len(blob) % 8)
+
+                layout[section][name] = {"dtype": dtype, "offset": offset, "length": len(values)}
+                blobs.append(blob)
+                offset += len(blob)
+
+        header = json.dumps({
+            "version": 1,
+            "node_count": len(nodes["id"]),
+            "edge_count": len(edges["source"]),
+            "strings": strings,
+            "columns": layout,
+        }, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+        # Column data starts on an 8-byte boundary after magic + length + header
+        header += b" " * (-(len(BINARY_MAGIC) + 4 + len(header)) % 8)
+        return BINARY_MAGIC + struct.pack("<I", len(header)) + header + b"".join(blobs)
+
+    @staticmethod
+    def respond(request: Request, graph: GraphData):
+        """
+        Encode a graph according to the request's Accept header
+
+        Args:
+            request: Incoming request
+            graph: Graph to return
+
+        Returns:
+            A Response with the compact encoding, or the GraphData itself
+            (serialized by FastAPI as regular JSON)
+        """
+        accept = request.headers.get("accept", "")
+
+        if COMPACT_BINARY_MEDIA_TYPE in accept.replace(COMPACT_JSON_MEDIA_TYPE, ""):
+            return Response(content=GraphCodec.encode_binary(graph), media_type=COMPACT_BINARY_MEDIA_TYPE)
+        if COMPACT_JSON_MEDIA_TYPE in accept:
+            return Response(content=GraphCodec.encode_json(graph), media_type=COMPACT_JSON_MEDIA_TYPE)
+        return graph
@@ -0,0 +1,224 @@
+"""Bulk loaders for graph generation"""
+import time
+from typing import Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import select, union_all, func
+from sqlalchemy.orm import Session
+
+from ..models import Transaction, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+
+
+# Frontier addresses bound per expand_frontier statement (split across the "out"/"in" selects)
+FRONTIER_BATCH_PARAMS = 500
+
+
+class GraphLoader:
+    """Set-based loading of transactions with their inputs and outputs"""
+
+    @staticmethod
+    def load_transactions(db: Session, txids: Sequence[str]) -> List[Dict]:
+        """
+        Load transactions with inputs and outputs for a set of txids
+
+        Issues three queries per 500 txids (transactions, inputs, outputs)
+        instead of three per transaction, and assembles the results in one pass.
+
+        Args:
+            db: Database session
+            txids: Transaction IDs (order is preserved)
+
+        Returns:
+            List of transaction dictionaries with 'inputs' and 'outputs'
+        """
+        txids = list(dict.fromkeys(txids))
+        if not txids:
+            return []
+
+        transactions: Dict[str, Dict] = {}
+
+        for chunk in chunked(txids):
+            for txid, timestamp in db.query(Transaction.txid, Transaction.timestamp).filter(
+                Transaction.txid.in_(chunk)
+            ):
+                transactions[txid] = {'txid': txid, 'timestamp': timestamp, 'inputs': [], 'outputs': []}
+
+            for txid, address, amount in db.query(
+                TransactionInput.txid, TransactionInput.address, TransactionInput.amount
+            ).filter(TransactionInput.txid.in_(chunk)).order_by(TransactionInput.id):
+                if txid in transactions:
+                    transactions[txid]['inputs'].append({'address': address, 'amount': amount})
+
+            for txid, address, amount in db.query(
+                TransactionOutput.txid, TransactionOutput.address, TransactionOutput.amount
+            ).filter(TransactionOutput.txid.in_(chunk)).order_by(TransactionOutput.id):
+                if txid in transactions:
+                    transactions[txid]['outputs'].append({'address': address, 'amount': amount})
+
+        logger.info(f"트랜잭션 일괄 로드: {len(transactions)}/{len(txids)}개")
+        return [transactions[txid] for txid in txids if txid in transactions]
+
+    @staticmethod
+    def expand_frontier(
+        db: Session,
+        frontier: Sequence[str],
+        direction: str = "both",
+        max_fanout: int = 20,
+        min_amount: float = 0.0,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        deadline: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Fetch the flow edges around a set of addresses
+
+        Each row is one input -> output pair of a transaction that spends
+        from (direction "out") or pays to (direction "in") a frontier
+        address. Rows are ranked per frontier address by amount and cut at
+        max_fanout inside SQLite. The frontier is bound in chunks of
+        ``FRONTIER_BATCH_PARAMS`` addresses per statement (half that with
+        direction "both", which binds it twice), one query per chunk.
+
+        Args:
+            db: Database session
+            frontier: Addresses to expand
+            direction: "out", "in" or "both"
+            max_fanout: Maximum edges per frontier address
+            min_amount: Minimum output amount in BTC
+            start_time: Earliest transaction timestamp (ISO 8601, inclusive)
+            end_time: Latest transaction timestamp (ISO 8601, inclusive)
+            deadline: ``time.monotonic()`` value after which no further chunk is
+                queried (the rows of the chunks already queried are returned)
+
+        Returns:
+            List of edge dictionaries (anchor, txid, timestamp, input/output ids, addresses, amounts)
+        """
+        frontier = list(dict.fromkeys(frontier))
+        if not frontier:
+            return []
+
+        def edge_select(anchor_column, chunk):
+            query = select(
+                anchor_column.label('anchor'),
+                Transaction.txid.label('txid'),
+                Transaction.timestamp.label('timestamp'),
+                TransactionInput.id.label('input_id'),
+                TransactionInput.address.label('source'),
+                TransactionInput.amount.label('source_amount'),
+                TransactionOutput.id.label('output_id'),
+                TransactionOutput.address.label('target'),
+                TransactionOutput.amount.label('amount'),
+            ).select_from(TransactionInput).join(
+                TransactionOutput, TransactionOutput.txid == TransactionInput.txid
+            ).join(
+                Transaction, Transaction.txid == TransactionInput.txid
+            ).where(
+                anchor_column.in_(chunk),
+                TransactionInput.address.isnot(None),
+                TransactionOutput.address.isnot(None),
+                TransactionOutput.amount >= min_amount,
+            )
+            if start_time:
+                query = query.where(Transaction.timestamp >= start_time)
+            if end_time:
+                query = query.where(Transaction.timestamp <= end_time)
+            return query
+
+        anchor_columns = []
+        if direction in ("out", "both"):
+            anchor_columns.append(TransactionInput.address)
+        if direction in ("in", "both"):
+            anchor_columns.append(TransactionOutput.address)
+
+        rows: List[Dict] = []
+        # Ranking is per anchor, so chunks of distinct addresses rank independently
+        for chunk in chunked(frontier, FRONTIER_BATCH_PARAMS // len(anchor_columns)):
+            if deadline is not None and time.monotonic() > deadline:
+                logger.info(f"프론티어 확장 시간 초과: {len(rows)}개 간선까지 반환")
+                break
+            selects = [edge_select(column, chunk) for column in anchor_columns]
+            edges = union_all(*selects).subquery() if len(selects) > 1 else selects[0].subquery()
+            ranked = select(
+                edges,
+                func.row_number().over(
+                    partition_by=edges.c.anchor,
+                    order_by=(edges.c.amount.desc(), edges.c.txid)
+                ).label('rank')
+            ).subquery()
+
+            rows.extend(dict(row) for row in db.execute(
+                select(ranked).where(ranked.c.rank <= max_fanout)
+            ).mappings())
+
+        return rows
+
+    @staticmethod
+    def load_address_flow(
+        db: Session,
+        address: str,
+        depth: int = 2,
+        direction: str = "both",
+        max_fanout: int = 20,
+        max_nodes: int = 500,
+        min_amount: float = 0.0,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Breadth-first N-hop flow exploration from an address
+
+        Every hop is one ``expand_frontier`` call over the whole frontier.
+
+        Args:
+            db: Database session
+            address: Starting address
+            depth: Number of hops
+            direction: "out", "in" or "both"
+            max_fanout: Maximum edges per address per hop
+            max_nodes: Stop growing the frontier after this many addresses
+            min_amount: Minimum output amount in BTC
+            start_time: Earliest transaction timestamp (ISO 8601)
+            end_time: Latest transaction timestamp (ISO 8601)
+
+        Returns:
+            Transaction dictionaries (only the inputs/outputs on the explored flow)
+        """
+        transactions: Dict[str, Dict] = {}
+        seen_inputs: Set[int] = set()
+        seen_outputs: Set[int] = set()
+        visited: Set[str] = {address}
+        frontier = [address]
+
+        for hop in range(depth):
+            if not frontier:
+                break
+
+            rows = GraphLoader.expand_frontier(
+                db, frontier, direction, max_fanout, min_amount, start_time, end_time
+            )
+            next_frontier: List[str] = []
+
+            for row in rows:
+                tx = transactions.setdefault(row['txid'], {
+                    'txid': row['txid'],
+                    'timestamp': row['timestamp'],
+                    'inputs': [],
+                    'outputs': [],
+                })
+                if row['input_id'] not in seen_inputs:
+                    seen_inputs.add(row['input_id'])
+                    tx['inputs'].append({'address': row['source'], 'amount': row['source_amount']})
+                if row['output_id'] not in seen_outputs:
+                    seen_outputs.add(row['output_id'])
+                    tx['outputs'].append({'address': row['target'], 'amount': row['amount']})
+
+                for neighbor in (row['source'], row['target']):
+                    if neighbor not in visited and len(visited) < max_nodes:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+
+            logger.info(f"플로우 탐색 hop {hop + 1}: 간선 {len(rows)}개, 다음 프론티어 {len(next_frontier)}개")
+            frontier = next_frontier
+
+        return list(transactions.values())
@@ -0,0 +1,216 @@
+"""Level-of-detail cluster graphs: address groups as super-nodes"""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, func, case, literal, or_
+from sqlalchemy.orm import Session, aliased
+
+from ..models import Address, AddressEdge
+from ..schemas.common import GraphNode, GraphEdge, GraphData
+from ..utils.logger import logger
+
+
+# (key, label, upper bound exclusive); the last tier has no upper bound
+GROUPINGS: Dict[str, Tuple[str, List[Tuple[str, str, Optional[float]]]]] = {
+    "value": ("balance", [
+        ("dust", "< 0.01 BTC", 0.01),
+        ("small", "0.01-0.1 BTC", 0.1),
+        ("medium", "0.1-1 BTC", 1.0),
+        ("large", "1-10 BTC", 10.0),
+        ("whale", ">= 10 BTC", None),
+    ]),
+    "activity": ("tx_count", [
+        ("single", "1 tx", 2),
+        ("low", "2-5 txs", 6),
+        ("medium", "6-20 txs", 21),
+        ("high", "21-100 txs", 101),
+        ("very_high", "> 100 txs", None),
+    ]),
+}
+
+
+class GraphSummaryService:
+    """
+    Summarize a cluster's internal flows at a bounded level of detail
+
+    Addresses are bucketed into tiers (by balance or by transaction count)
+    with a SQL ``CASE`` expression, and each tier becomes one super-node.
+    Flows between tiers are aggregated from ``address_edges`` with a single
+    grouped query, so the payload size depends on the number of tiers, not
+    on the size of the cluster. A super-node can then be expanded into its
+    top member addresses.
+    """
+
+    @staticmethod
+    def group_node_id(group_by: str, key: str) -> str:
+        return f"group:{group_by}:{key}"
+
+    @staticmethod
+    def _tier(address, group_by: str):
+        """CASE expression mapping an address row to its tier key"""
+        column_name, tiers = GROUPINGS[group_by]
+        column = func.coalesce(getattr(address, column_name), 0)
+        return case(
+            *[(column < upper, key) for key, _, upper in tiers[:-1]],
+            else_=tiers[-1][0]
+        )
+
+    @staticmethod
+    def summarize(db: Session, cluster_id: str, group_by: str = "value") -> GraphData:
+        """
+        Build the super-node graph of a cluster
+
+        Args:
+            db: Database session
+            cluster_id: Cluster UUID
+            group_by: "value" (balance tiers) or "activity" (tx count tiers)
+
+        Returns:
+            GraphData with one "group" node per non-empty tier and aggregated edges
+        """
+        logger.info(f"클러스터 요약 그래프 생성: {cluster_id}, group_by={group_by}")
+
+        labels = {key: label for key, label, _ in GROUPINGS[group_by][1]}
+        tier = GraphSummaryService._tier(Address, group_by)
+
+        groups = db.execute(
+            select(
+                tier.label('tier'),
+                func.count().label('address_count'),
+                func.coalesce(func.sum(Address.balance), 0.0).label('balance')
+            ).where(Address.cluster_id == cluster_id).group_by(tier)
+        ).all()
+
+        nodes = [GraphNode(
+            id=GraphSummaryService.group_node_id(group_by, key),
+            type="group",
+            label=f"{labels[key]} ({count})",
+            balance=balance,
+            cluster_id=cluster_id,
+            size=count
+        ) for key, count, balance in groups]
+
+        source, target = aliased(Address), aliased(Address)
+        source_tier = GraphSummaryService._tier(source, group_by)
+        target_tier = GraphSummaryService._tier(target, group_by)
+
+        rows = db.execute(
+            select(
+                source_tier.label('source_tier'),
+                target_tier.label('target_tier'),
+                func.sum(AddressEdge.tx_count),
+                func.sum(AddressEdge.total_amount),
+                func.min(AddressEdge.first_seen),
+                func.max(AddressEdge.last_seen)
+            ).join(
+                source, source.address == AddressEdge.source_address
+            ).join(
+                target, target.address == AddressEdge.target_address
+            ).where(
+                source.cluster_id == cluster_id,
+                target.cluster_id == cluster_id
+            ).group_by(source_tier, target_tier)
+        ).all()
+
+        edges = [GraphEdge(
+            source=GraphSummaryService.group_node_id(group_by, source_key),
+            target=GraphSummaryService.group_node_id(group_by, target_key),
+            amount=amount or 0.0,
+            timestamp=last_seen,
+            count=count,
+            first_timestamp=first_seen,
+            last_timestamp=last_seen
+        ) for source_key, target_key, count, amount, first_seen, last_seen in rows if source_key != target_key]
+
+        logger.info(f"클러스터 요약 그래프 완료: {len(nodes)}개 그룹, {len(edges)}개 엣지")
+        return GraphData(nodes=nodes, edges=edges)
+
+    @staticmethod
+    def expand_group(
+        db: Session,
+        cluster_id: str,
+        group_by: str,
+        group: str,
+        limit: int = 100
+    ) -> GraphData:
+        """
+        Expand one super-node into its largest member addresses
+
+        Edges between the returned members are kept per address; edges to
+        the rest of the cluster are aggregated onto the other super-nodes
+        (or onto this group's node for members that were not returned), so
+        the result can be spliced into the summary graph.
+
+        Args:
+            db: Database session
+            cluster_id: Cluster UUID
+            group_by: Grouping used by the summary
+            group: Tier key of the super-node
+            limit: Maximum number of member addresses
+
+        Returns:
+            GraphData with address nodes and edges to addresses or super-nodes
+        """
+        logger.info(f"클러스터 그룹 확장: {cluster_id}, {group_by}:{group}, limit={limit}")
+
+        tier = GraphSummaryService._tier(Address, group_by)
+        members = db.query(Address).filter(
+            Address.cluster_id == cluster_id,
+            tier == group
+        ).order_by(Address.balance.desc(), Address.address).limit(limit).all()
+
+        nodes = [GraphNode(
+            id=addr.address,
+            type="address",
+            label=addr.address[:10] + "...",
+            balance=addr.balance,
+            cluster_id=cluster_id
+        ) for addr in members]
+
+        if not members:
+            return GraphData(nodes=nodes, edges=[])
+
+        member_ids = [addr.address for addr in members]
+        source, target = aliased(Address), aliased(Address)
+        prefix = literal(GraphSummaryService.group_node_id(group_by, ""))
+
+        # Members keep their own ID, every other address collapses onto its group node
+        source_end = case(
+            (source.address.in_(member_ids), source.address),
+            else_=prefix + GraphSummaryService._tier(source, group_by)
+        )
+        target_end = case(
+            (target.address.in_(member_ids), target.address),
+            else_=prefix + GraphSummaryService._tier(target, group_by)
+        )
+
+        rows = db.execute(
+            select(
+                source_end.label('source'),
+                target_end.label('target'),
+                func.sum(AddressEdge.tx_count),
+                func.sum(AddressEdge.total_amount),
+                func.min(AddressEdge.first_seen),
+                func.max(AddressEdge.last_seen)
+            ).join(
+                source, source.address == AddressEdge.source_address
+            ).join(
+                target, target.address == AddressEdge.target_address
+            ).where(
+                source.cluster_id == cluster_id,
+                target.cluster_id == cluster_id,
+                or_(source.address.in_(member_ids), target.address.in_(member_ids))
+            ).group_by(source_end, target_end)
+        ).all()
+
+        edges = [GraphEdge(
+            source=source_id,
+            target=target_id,
+            amount=amount or 0.0,
+            timestamp=last_seen,
+            count=count,
+            first_timestamp=first_seen,
+            last_timestamp=last_seen
+        ) for source_id, target_id, count, amount, first_seen, last_seen in rows if source_id != target_id]
+
+        logger.info(f"클러스터 그룹 확장 완료: {len(nodes)}개 주소, {len(edges)}개 엣지")
+        return GraphData(nodes=nodes, edges=edges)
@@ -0,0 +1,176 @@
+"""Pluggable clustering heuristics evaluated in a single pass over transactions"""
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..utils.logger import logger
+
+
+SATOSHI_PER_BTC = 100_000_000
+
+# Outputs that are a multiple of 0.001 BTC are treated as "round" payments
+ROUND_AMOUNT_SATOSHI = 100_000
+
+
+class TxContext:
+    """Per-transaction state shared by the heuristic passes"""
+
+    __slots__ = ('tx', 'input_addresses', 'outputs', 'excluded', 'change_address')
+
+    def __init__(self, tx: Dict):
+        self.tx = tx
+        self.input_addresses: List[str] = [
+            inp.get('address') for inp in tx.get('inputs', []) if inp.get('address')
+        ]
+        self.outputs: List[Tuple[str, int]] = [
+            (out.get('address'), int(round(float(out.get('amount') or 0) * SATOSHI_PER_BTC)))
+            for out in tx.get('outputs', []) if out.get('address')
+        ]
+        self.excluded = False
+        self.change_address: Optional[str] = None
+
+
+class ClusteringHeuristic(ABC):
+    """
+    Base class for a heuristic pass
+
+    ``process`` inspects one transaction and returns the address pairs it
+    wants merged. ``seen`` holds every address that appeared in an earlier
+    transaction of the stream.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        """Address pairs to merge for one transaction"""
+
+    @staticmethod
+    def _merge_change(ctx: TxContext, change: str) -> List[Tuple[str, str]]:
+        ctx.change_address = change
+        return [(ctx.input_addresses[0], change)]
+
+
+class CoinJoinExclusionHeuristic(ClusteringHeuristic):
+    """Flag likely CoinJoins (many equal-value outputs) so later passes skip them"""
+
+    name = "coinjoin"
+
+    def __init__(self, min_equal_outputs: int = 3):
+        self.min_equal_outputs = min_equal_outputs
+
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        if len(ctx.outputs) < self.min_equal_outputs:
+            return []
+
+        equal_outputs = max(Counter(amount for _, amount in ctx.outputs).values())
+        distinct_inputs = len(set(ctx.input_addresses))
+
+        if equal_outputs >= self.min_equal_outputs and distinct_inputs >= equal_outputs:
+            ctx.excluded = True
+        return []
+
+
+class CoSpendingHeuristic(ClusteringHeuristic):
+    """All inputs of a transaction belong to the same owner"""
+
+    name = "co_spending"
+
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        if ctx.excluded or len(ctx.input_addresses) < 2:
+            return []
+
+        first = ctx.input_addresses[0]
+        return [(first, addr) for addr in ctx.input_addresses[1:]]
+
+
+class AddressReuseHeuristic(ClusteringHeuristic):
+    """An output paying back to one of the input addresses is the change"""
+
+    name = "address_reuse"
+
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        if ctx.excluded or ctx.change_address or not ctx.input_addresses:
+            return []
+
+        inputs = set(ctx.input_addresses)
+        reused = {addr for addr, _ in ctx.outputs if addr in inputs}
+        if len(reused) != 1:
+            return []
+
+        return self._merge_change(ctx, reused.pop())
+
+
+class OneTimeChangeHeuristic(ClusteringHeuristic):
+    """The only never-seen-before output address is the change"""
+
+    name = "one_time_change"
+
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        if ctx.excluded or ctx.change_address or not ctx.input_addresses or len(ctx.outputs) < 2:
+            return []
+
+        output_addresses = [addr for addr, _ in ctx.outputs]
+        if len(set(output_addresses)) != len(output_addresses):
+            return []
+
+        inputs = set(ctx.input_addresses)
+        fresh = [addr for addr in output_addresses if addr not in seen and addr not in inputs]
+        if len(fresh) != 1:
+            return []
+
+        return self._merge_change(ctx, fresh[0])
+
+
+class RoundAmountHeuristic(ClusteringHeuristic):
+    """When every other output is a round payment, the non-round output is the change"""
+
+    name = "round_amount"
+
+    def process(self, ctx: TxContext, seen: Set[str]) -> List[Tuple[str, str]]:
+        if ctx.excluded or ctx.change_address or not ctx.input_addresses or len(ctx.outputs) < 2:
+            return []
+
+        non_round = [addr for addr, amount in ctx.outputs if amount % ROUND_AMOUNT_SATOSHI != 0]
+        if len(non_round) != 1 or non_round[0] in ctx.input_addresses:
+            return []
+
+        return self._merge_change(ctx, non_round[0])
+
+
+# Registry in evaluation order: exclusion first, then co-spending, then change detection
+HEURISTICS = {
+    heuristic.name: heuristic
+    for heuristic in (
+        CoinJoinExclusionHeuristic,
+        CoSpendingHeuristic,
+        AddressReuseHeuristic,
+        OneTimeChangeHeuristic,
+        RoundAmountHeuristic,
+    )
+}
+
+DEFAULT_HEURISTICS = ("coinjoin", "co_spending")
+
+
+def build_heuristics(names: Optional[List[str]] = None) -> List[ClusteringHeuristic]:
+    """
+    Instantiate the enabled heuristics in registry order
+
+    Args:
+        names: Heuristic names to enable (default: DEFAULT_HEURISTICS)
+
+    Returns:
+        Heuristic instances
+
+    Raises:
+        ValueError: If a name is not registered
+    """
+    names = list(names) if names is not None else list(DEFAULT_HEURISTICS)
+
+    unknown = [name for name in names if name not in HEURISTICS]
+    if unknown:
+        logger.error(f"알 수 없는 휴리스틱: {unknown}")
+        raise ValueError(f"Unknown heuristics: {', '.join(unknown)}")
+
+    return [cls() for name, cls in HEURISTICS.items() if name in names]
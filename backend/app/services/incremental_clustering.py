@@ -0,0 +1,397 @@
+"""Incremental co-spending clustering over newly ingested blocks"""
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..models import Address, Cluster, ClusterEdge, Transaction, TransactionInput, TransactionOutput, JobCheckpoint
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+from .autocomplete import autocomplete_index
+from .clustering import ArrayUnionFind, UnionFind, ClusteringService
+from .cluster_stats import ClusterStatsService
+from .cluster_edges import ClusterEdgeService
+from .graph_loader import GraphLoader
+from .heuristics import TxContext, build_heuristics
+from .stats_rollup import StatsRollupService
+from .sketches import DistinctSketchService
+
+
+CHECKPOINT_NAME = "co_spending_clustering"
+
+
+class IncrementalClusteringService:
+    """
+    Apply co-spending edges from new transactions to the persisted clusters
+
+    The union-find state is persisted as ``Address.cluster_id`` (every address
+    points directly at its cluster root) plus a ``JobCheckpoint`` holding the
+    last processed block height. Each run only reads inputs of transactions
+    above the checkpoint, unions the affected clusters in memory and writes
+    back the addresses that actually changed cluster.
+
+    Cluster statistics and inter-cluster flow edges of every touched
+    cluster are recomputed at the end of each batch.
+
+    When clusters merge, the surviving ID is the one with the most addresses
+    (ties broken by the smallest ID), so the result does not depend on the
+    order in which edges are applied and the fewest rows are rewritten.
+    A cluster made only of new addresses gets ``stable_cluster_id`` of its
+    smallest address, as ``ClusteringService.assign_cluster_ids`` does, but
+    a merged cluster keeps its survivor's ID rather than being renamed to
+    the uuid5 of its new smallest address. The partition is the same as a
+    full rebuild; the IDs of merged clusters are not, and are kept on
+    purpose so labels and links to a cluster survive later merges.
+
+    With ``heuristics`` set, each batch is run through the named passes of
+    ``heuristics.HEURISTICS`` (CoinJoin exclusion, change detection, ...)
+    instead of plain co-spending. Transactions are visited in block order
+    and an output address counts as seen if it appears in an earlier block
+    or earlier in the batch. The run summary then reports, per heuristic,
+    the pairs it proposed, the merges they caused and the time spent in it.
+
+    With ``workers`` > 1 the co-spending groups of each batch are first
+    reduced to connected components by ``cluster_by_co_spending_parallel``
+    in a process pool, which pays off for large ``batch_blocks``.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        batch_blocks: int = 100,
+        heuristics: Optional[List[str]] = None,
+        workers: int = 1
+    ):
+        self.db = db
+        self.batch_blocks = batch_blocks
+        self.workers = workers
+        # None keeps the co-spending path, which only reads inputs
+        self.heuristics = build_heuristics(heuristics) if heuristics is not None else None
+
+    def run(self, up_to_height: Optional[int] = None) -> Dict:
+        """
+        Process all blocks above the checkpoint
+
+        Args:
+            up_to_height: Last block height to process (default: highest stored block)
+
+        Returns:
+            Summary of the run
+        """
+        checkpoint = self._get_checkpoint()
+        last_height = checkpoint.last_block_height if checkpoint.last_block_height is not None else -1
+
+        max_height = self.db.query(func.max(Transaction.block_height)).scalar()
+        if max_height is None:
+            logger.info("증분 클러스터링: 처리할 블록 없음")
+            return self._empty_summary(last_height)
+
+        end_height = max_height if up_to_height is None else min(up_to_height, max_height)
+        logger.info(f"증분 클러스터링 시작: 블록 {last_height + 1} ~ {end_height}")
+
+        summary = self._empty_summary(last_height)
+        touched: Set[str] = set()
+
+        while last_height < end_height:
+            # Skip over empty height ranges instead of walking them batch by batch
+            next_height = self.db.query(func.min(Transaction.block_height)).filter(
+                Transaction.block_height > last_height
+            ).scalar()
+            if next_height is None or next_height > end_height:
+                checkpoint.last_block_height = end_height
+                self.db.commit()
+                last_height = end_height
+                break
+
+            batch_end = min(next_height + self.batch_blocks - 1, end_height)
+            result = self.apply_block_range(next_height, batch_end)
+
+            for key in ('transactions', 'clusters_created', 'clusters_merged', 'addresses_moved'):
+                summary[key] += result[key]
+            for name, stats in result.get('heuristics', {}).items():
+                totals = summary['heuristics'].setdefault(name, {'pairs': 0, 'merges': 0, 'seconds': 0.0})
+                for key in totals:
+                    totals[key] += stats[key]
+            touched.difference_update(result['merged_cluster_ids'])
+            touched.update(result['touched_cluster_ids'])
+            ClusterStatsService.refresh(self.db, result['touched_cluster_ids'])
+            ClusterEdgeService.refresh_clusters(self.db, result['touched_cluster_ids'])
+
+            checkpoint.last_block_height = batch_end
+            self.db.commit()
+            last_height = batch_end
+
+        summary['last_block_height'] = last_height
+        summary['touched_cluster_ids'] = sorted(touched)
+
+        logger.info(
+            f"증분 클러스터링 완료: 트랜잭션 {summary['transactions']}개, "
+            f"신규 클러스터 {summary['clusters_created']}개, 병합 {summary['clusters_merged']}개, "
+            f"이동 주소 {summary['addresses_moved']}개"
+        )
+        return summary
+
+    def apply_block_range(self, from_height: int, to_height: int) -> Dict:
+        """
+        Apply co-spending edges of transactions in [from_height, to_height]
+
+        Args:
+            from_height: First block height (inclusive)
+            to_height: Last block height (inclusive)
+
+        Returns:
+            Summary of the applied changes (not committed)
+        """
+        if self.heuristics is not None:
+            groups, transactions, report, current = self._heuristic_groups(from_height, to_height)
+            result = self.apply_groups(groups, current)
+            result['transactions'] = transactions
+            result['heuristics'] = report
+            return result
+
+        rows = self.db.query(TransactionInput.txid, Transaction.block_height, TransactionInput.address).join(
+            Transaction, Transaction.txid == TransactionInput.txid
+        ).filter(
+            Transaction.block_height >= from_height,
+            Transaction.block_height <= to_height,
+            TransactionInput.address.isnot(None)
+        ).all()
+
+        inputs_by_tx: Dict[str, Set[str]] = {}
+        heights: Dict[str, int] = {}
+        for txid, height, address in rows:
+            inputs_by_tx.setdefault(txid, set()).add(address)
+            heights[txid] = height
+
+        groups = [group for group in inputs_by_tx.values() if len(group) >= 2]
+        if self.workers > 1 and groups:
+            components = ClusteringService.cluster_by_co_spending_parallel([
+                {'block_height': heights[txid], 'inputs': [{'address': address} for address in group]}
+                for txid, group in inputs_by_tx.items() if len(group) >= 2
+            ], workers=self.workers)
+            groups = list(components.values())
+
+        result = self.apply_groups(groups)
+        result['transactions'] = len(inputs_by_tx)
+        return result
+
+    def apply_groups(self, groups: Iterable[Set[str]], current: Optional[Dict[str, Optional[str]]] = None) -> Dict:
+        """
+        Merge each group of co-spent addresses into one persisted cluster
+
+        Args:
+            groups: Sets of addresses spent together
+            current: Cluster ID of every group address, if already loaded
+
+        Returns:
+            Summary of the applied changes (not committed)
+        """
+        groups = list(groups)
+        result = {
+            'clusters_created': 0,
+            'clusters_merged': 0,
+            'addresses_moved': 0,
+            'touched_cluster_ids': set(),
+            'merged_cluster_ids': set(),
+        }
+        if not groups:
+            return result
+
+        if current is None:
+            current = self._load_cluster_ids(set().union(*groups))
+
+        # Existing clusters and unclustered addresses share one union-find,
+        # numbered densely so it fits in ArrayUnionFind's two arrays
+        node_ids: Dict[str, int] = {}
+
+        def node(address: str) -> int:
+            cluster_id = current.get(address)
+            key = f"c:{cluster_id}" if cluster_id else f"a:{address}"
+            return node_ids.setdefault(key, len(node_ids))
+
+        id_groups = [[node(address) for address in group] for group in groups]
+        uf = ArrayUnionFind(len(node_ids))
+        uf.union_groups(id_groups)
+
+        components: Dict[int, List[str]] = {}
+        for key, root in zip(node_ids, uf.roots()):
+            components.setdefault(root, []).append(key)
+
+        sizes = self._load_cluster_sizes({cid for cid in current.values() if cid})
+        clustered_delta = 0
+
+        plans = []
+        for members in components.values():
+            existing = sorted(n[2:] for n in members if n.startswith("c:"))
+            fresh = sorted(n[2:] for n in members if n.startswith("a:"))
+
+            if not fresh and len(existing) <= 1:
+                continue
+
+            if existing:
+                survivor = min(existing, key=lambda cid: (-sizes.get(cid, 0), cid))
+            else:
+                survivor = ClusteringService.stable_cluster_id(fresh)
+            plans.append((survivor, existing, fresh))
+
+        result['clusters_created'] = self._create_clusters(
+            [survivor for survivor, existing, _ in plans if not existing]
+        )
+
+        for survivor, existing, fresh in plans:
+            losers = [cid for cid in existing if cid != survivor]
+            moved = self._move_addresses(survivor, losers, fresh)
+            DistinctSketchService.merge_clusters(self.db, survivor, losers)
+            DistinctSketchService.add_cluster_addresses(self.db, fresh)
+
+            sizes[survivor] = sizes.get(survivor, 0) + moved
+            self.db.query(Cluster).filter(Cluster.id == survivor).update(
+                {Cluster.address_count: sizes[survivor], Cluster.version: Cluster.version + 1},
+                synchronize_session=False
+            )
+
+            # The survivor gains every moved address, the losers' counts disappear
+            clustered_delta += moved - sum(sizes.get(cid, 0) for cid in losers)
+
+            result['clusters_merged'] += len(losers)
+            result['addresses_moved'] += moved
+            result['touched_cluster_ids'].add(survivor)
+            result['merged_cluster_ids'].update(losers)
+
+        StatsRollupService.apply(self.db, {
+            'total_clusters': result['clusters_created'] - result['clusters_merged'],
+            'clustered_addresses': clustered_delta,
+        })
+        autocomplete_index.defer(self.db, removed_clusters=result['merged_cluster_ids'])
+        return result
+
+    def _heuristic_groups(
+        self, from_height: int, to_height: int
+    ) -> Tuple[List[Set[str]], int, Dict[str, Dict], Dict[str, Optional[str]]]:
+        """
+        Address pairs proposed by the enabled heuristics for a block range
+
+        Returns:
+            (pairs, number of transactions, heuristic name -> {'pairs', 'merges',
+            'seconds'}, current cluster ID of every paired address)
+        """
+        txids = [txid for (txid,) in self.db.query(Transaction.txid).filter(
+            Transaction.block_height >= from_height,
+            Transaction.block_height <= to_height
+        ).order_by(Transaction.block_height, Transaction.txid)]
+        contexts = [TxContext(tx) for tx in GraphLoader.load_transactions(self.db, txids)]
+
+        seen = self._seen_before(from_height, {addr for ctx in contexts for addr, _ in ctx.outputs})
+        report = {heuristic.name: {'pairs': 0, 'merges': 0, 'seconds': 0.0} for heuristic in self.heuristics}
+        pairs: List[Tuple[str, str, str]] = []  # (heuristic name, address, address)
+        for ctx in contexts:
+            for heuristic in self.heuristics:
+                start = time.perf_counter()
+                proposed = [pair for pair in heuristic.process(ctx, seen) if pair[0] != pair[1]]
+                report[heuristic.name]['seconds'] += time.perf_counter() - start
+                report[heuristic.name]['pairs'] += len(proposed)
+                pairs.extend((heuristic.name, a, b) for a, b in proposed)
+            seen.update(ctx.input_addresses)
+            seen.update(addr for addr, _ in ctx.outputs)
+
+        # A pair merges when it joins two clusters (or unclustered addresses) not joined yet
+        current = self._load_cluster_ids({address for _, a, b in pairs for address in (a, b)})
+
+        def node(address: str) -> str:
+            cluster_id = current.get(address)
+            return f"c:{cluster_id}" if cluster_id else f"a:{address}"
+
+        uf = UnionFind()
+        for name, a, b in pairs:
+            if uf.union(node(a), node(b)):
+                report[name]['merges'] += 1
+
+        for name, stats in report.items():
+            logger.info(
+                f"  휴리스틱 {name}: 블록 {from_height} ~ {to_height}, 간선 {stats['pairs']}개, "
+                f"병합 {stats['merges']}회, {stats['seconds']:.3f}초"
+            )
+        return [{a, b} for _, a, b in pairs], len(contexts), report, current
+
+    def _seen_before(self, height: int, addresses: Set[str]) -> Set[str]:
+        """Addresses that appear in a transaction below the block height"""
+        seen: Set[str] = set()
+        for chunk in chunked(addresses):
+            for table in (TransactionInput, TransactionOutput):
+                seen.update(address for (address,) in self.db.query(table.address).join(
+                    Transaction, Transaction.txid == table.txid
+                ).filter(
+                    table.address.in_(chunk),
+                    Transaction.block_height < height
+                ).distinct())
+        return seen
+
+    def _create_clusters(self, cluster_ids: List[str]) -> int:
+        """Insert the clusters that do not exist yet, returning how many were created"""
+        missing = set(cluster_ids)
+        for chunk in chunked(cluster_ids):
+            missing.difference_update(cid for (cid,) in self.db.query(Cluster.id).filter(Cluster.id.in_(chunk)))
+
+        self.db.add_all(Cluster(id=cluster_id, address_count=0) for cluster_id in sorted(missing))
+        self.db.flush()
+        return len(missing)
+
+    def _move_addresses(self, survivor: str, losers: List[str], fresh: List[str]) -> int:
+        """Point loser clusters' and unclustered addresses at survivor"""
+        moved = 0
+
+        for chunk in chunked(losers):
+            moved += self.db.query(Address).filter(Address.cluster_id.in_(chunk)).update(
+                {Address.cluster_id: survivor}, synchronize_session=False
+            )
+            # Loser edges are recomputed for the survivor by ClusterEdgeService.refresh_clusters
+            self.db.query(ClusterEdge).filter(or_(
+                ClusterEdge.source_cluster_id.in_(chunk),
+                ClusterEdge.target_cluster_id.in_(chunk)
+            )).delete(synchronize_session=False)
+            self.db.query(Cluster).filter(Cluster.id.in_(chunk)).delete(synchronize_session=False)
+
+        for chunk in chunked(fresh):
+            moved += self.db.query(Address).filter(
+                Address.address.in_(chunk),
+                or_(Address.cluster_id.is_(None), Address.cluster_id != survivor)
+            ).update({Address.cluster_id: survivor}, synchronize_session=False)
+
+        return moved
+
+    def _load_cluster_ids(self, addresses: Set[str]) -> Dict[str, Optional[str]]:
+        """Current cluster ID of each address"""
+        current: Dict[str, Optional[str]] = {}
+        for chunk in chunked(addresses):
+            rows = self.db.query(Address.address, Address.cluster_id).filter(Address.address.in_(chunk)).all()
+            current.update(rows)
+        return current
+
+    def _load_cluster_sizes(self, cluster_ids: Set[str]) -> Dict[str, int]:
+        """Address count of each cluster"""
+        sizes: Dict[str, int] = {}
+        for chunk in chunked(cluster_ids):
+            rows = self.db.query(Cluster.id, Cluster.address_count).filter(Cluster.id.in_(chunk)).all()
+            sizes.update((cid, count or 0) for cid, count in rows)
+        return sizes
+
+    def _get_checkpoint(self) -> JobCheckpoint:
+        checkpoint = self.db.get(JobCheckpoint, CHECKPOINT_NAME)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=CHECKPOINT_NAME, last_block_height=None)
+            self.db.add(checkpoint)
+            self.db.flush()
+        return checkpoint
+
+    @staticmethod
+    def _empty_summary(last_height: int) -> Dict:
+        return {
+            'transactions': 0,
+            'clusters_created': 0,
+            'clusters_merged': 0,
+            'addresses_moved': 0,
+            'last_block_height': last_height,
+            'touched_cluster_ids': [],
+            'heuristics': {},
+        }
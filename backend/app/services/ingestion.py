@@ -0,0 +1,266 @@
+"""Transaction ingestion service"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, update, bindparam, tuple_
+from sqlalchemy.orm import Session
+
+from ..models import Address, Transaction, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+from .adjacency import AddressAdjacencyService
+from .cluster_edges import ClusterEdgeService
+from .cluster_stats import ClusterStatsService
+from .stats_rollup import StatsRollupService
+from .time_rollup import TimeSeriesRollupService
+from .sketches import DistinctSketchService
+from .autocomplete import autocomplete_index
+from .search import search_cache
+
+
+def normalize_timestamp(value) -> Optional[str]:
+    """Block time (unix seconds) or ISO string -> ISO 8601 string"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.utcfromtimestamp(value).isoformat()
+    return str(value)
+
+
+class IngestionService:
+    """
+    Store parsed transactions and keep derived indexes up to date
+
+    Accepts transaction dictionaries in the shape produced by
+    ``BitcoinRPCService.parse_block_transactions`` (inputs/outputs nested).
+    Input addresses and amounts missing from the parsed data are resolved
+    from previously stored outputs, and spent outputs are marked.
+    """
+
+    @staticmethod
+    def ingest_transactions(db: Session, transactions: List[Dict]) -> Dict:
+        """
+        Store new transactions, update address totals and derived indexes
+
+        Transactions that are already stored are skipped. The caller commits.
+
+        Args:
+            db: Database session
+            transactions: Parsed transaction dictionaries
+
+        Returns:
+            Summary with stored txids and newly created addresses
+        """
+        by_txid = {tx['txid']: tx for tx in transactions}
+
+        for chunk in chunked(list(by_txid)):
+            for (txid,) in db.query(Transaction.txid).filter(Transaction.txid.in_(chunk)):
+                by_txid.pop(txid, None)
+
+        txs = list(by_txid.values())
+        if not txs:
+            logger.info("수집할 신규 트랜잭션 없음")
+            return {'txids': [], 'new_addresses': [], 'skipped': len(transactions)}
+
+        prevouts = IngestionService._resolve_prevouts(db, txs)
+
+        tx_rows: List[Dict] = []
+        input_rows: List[Dict] = []
+        output_rows: List[Dict] = []
+        spent_rows: List[Dict] = []
+        deltas: Dict[str, Dict] = {}
+
+        def touch(address: str, txid: str, timestamp: Optional[str]) -> Dict:
+            delta = deltas.setdefault(address, {
+                'received': 0.0, 'sent': 0.0, 'txids': set(), 'first_seen': timestamp, 'last_seen': timestamp
+            })
+            delta['txids'].add(txid)
+            if timestamp:
+                delta['first_seen'] = min(filter(None, (delta['first_seen'], timestamp)))
+                delta['last_seen'] = max(filter(None, (delta['last_seen'], timestamp)))
+            return delta
+
+        for tx in txs:
+            txid = tx['txid']
+            timestamp = normalize_timestamp(tx.get('timestamp'))
+            total_input = 0.0
+            inputs_resolved = True
+
+            for index, inp in enumerate(tx.get('inputs', [])):
+                prevout = prevouts.get((inp.get('prev_txid'), inp.get('prev_vout')))
+                address = inp.get('address') or (prevout[0] if prevout else None)
+                amount = inp.get('amount')
+                if amount is None:
+                    amount = prevout[1] if prevout else None
+                if amount is None:
+                    inputs_resolved = False
+                amount = float(amount or 0)
+                total_input += amount
+
+                input_rows.append({
+                    'txid': txid,
+                    'vout_index': inp.get('vout_index', index),
+                    'prev_txid': inp.get('prev_txid'),
+                    'prev_vout': inp.get('prev_vout'),
+                    'address': address,
+                    'amount': amount,
+                    'script_sig': inp.get('script_sig'),
+                    'sequence': inp.get('sequence'),
+                })
+                if inp.get('prev_txid') is not None:
+                    spent_rows.append({
+                        'prev_txid': inp['prev_txid'],
+                        'prev_vout': inp.get('prev_vout'),
+                        'spent_in': txid,
+                    })
+                if address:
+                    touch(address, txid, timestamp)['sent'] += amount
+
+            total_output = 0.0
+            for out in tx.get('outputs', []):
+                amount = float(out.get('amount') or 0)
+                total_output += amount
+                output_rows.append({
+                    'txid': txid,
+                    'vout': out.get('vout'),
+                    'address': out.get('address'),
+                    'amount': amount,
+                    'script_pubkey': out.get('script_pubkey'),
+                    'spent': 0,
+                    'spent_in_txid': None,
+                })
+                if out.get('address'):
+                    touch(out['address'], txid, timestamp)['received'] += amount
+
+            fee = tx.get('fee')
+            if fee is None:
+                fee = round(max(total_input - total_output, 0.0), 8) if tx.get('inputs') and inputs_resolved else 0.0
+
+            tx_rows.append({
+                'txid': txid,
+                'block_height': tx.get('block_height'),
+                'block_hash': tx.get('block_hash'),
+                'timestamp': timestamp,
+                'fee': float(fee),
+                'size': tx.get('size') or 0,
+                'input_count': len(tx.get('inputs', [])),
+                'output_count': len(tx.get('outputs', [])),
+                'total_input': round(total_input, 8),
+                'total_output': round(total_output, 8),
+            })
+
+        new_addresses = IngestionService._upsert_addresses(db, deltas)
+
+        db.execute(insert(Transaction), tx_rows)
+        if input_rows:
+            db.execute(insert(TransactionInput), input_rows)
+        if output_rows:
+            db.execute(insert(TransactionOutput), output_rows)
+
+        if spent_rows:
+            outputs = TransactionOutput.__table__
+            db.connection().execute(
+                outputs.update().where(
+                    outputs.c.txid == bindparam('prev_txid'),
+                    outputs.c.vout == bindparam('prev_vout')
+                ).values(spent=1, spent_in_txid=bindparam('spent_in')),
+                spent_rows
+            )
+
+        txids = [row['txid'] for row in tx_rows]
+        IngestionService.after_ingest(db, txids, new_addresses)
+
+        logger.info(f"트랜잭션 수집 완료: {len(txids)}개 저장, 신규 주소 {len(new_addresses)}개")
+        return {'txids': txids, 'new_addresses': new_addresses, 'skipped': len(transactions) - len(txids)}
+
+    @staticmethod
+    def after_ingest(db: Session, txids: Sequence[str], new_addresses: Sequence[str]):
+        """
+        Update derived indexes for newly stored transactions
+
+        Called by ``ingest_transactions`` and by bulk loaders (e.g. the seed
+        script) that insert rows directly.
+
+        Args:
+            db: Database session
+            txids: Newly stored transaction IDs
+            new_addresses: Addresses created by this ingestion
+        """
+        AddressAdjacencyService.apply_transactions(db, txids)
+        ClusterEdgeService.apply_transactions(db, txids)
+        ClusterStatsService.bump_versions(db, txids)
+        StatsRollupService.after_ingest(db, txids, new_addresses)
+        TimeSeriesRollupService.apply_transactions(db, txids, new_addresses)
+        DistinctSketchService.after_ingest(db, txids)
+        search_cache.clear_on_commit(db)
+        autocomplete_index.defer(db, addresses=new_addresses, txids=txids)
+
+    @staticmethod
+    def _resolve_prevouts(db: Session, txs: List[Dict]) -> Dict[Tuple[str, int], Tuple[Optional[str], float]]:
+        """(txid, vout) -> (address, amount) for outputs spent by txs"""
+        prevouts: Dict[Tuple[str, int], Tuple[Optional[str], float]] = {}
+
+        for tx in txs:
+            for out in tx.get('outputs', []):
+                prevouts[(tx['txid'], out.get('vout'))] = (out.get('address'), float(out.get('amount') or 0))
+
+        missing = {
+            (inp.get('prev_txid'), inp.get('prev_vout'))
+            for tx in txs
+            for inp in tx.get('inputs', [])
+            if inp.get('prev_txid') is not None
+            and (inp.get('address') is None or inp.get('amount') is None)
+        } - prevouts.keys()
+
+        for chunk in chunked(missing):
+            rows = db.query(
+                TransactionOutput.txid, TransactionOutput.vout, TransactionOutput.address, TransactionOutput.amount
+            ).filter(tuple_(TransactionOutput.txid, TransactionOutput.vout).in_(chunk))
+            for txid, vout, address, amount in rows:
+                prevouts[(txid, vout)] = (address, amount)
+
+        return prevouts
+
+    @staticmethod
+    def _upsert_addresses(db: Session, deltas: Dict[str, Dict]) -> List[str]:
+        """Apply received/sent/tx_count deltas, creating missing addresses"""
+        existing: Dict[str, Address] = {}
+        for chunk in chunked(list(deltas)):
+            for address in db.query(Address).filter(Address.address.in_(chunk)):
+                existing[address.address] = address
+
+        new_rows: List[Dict] = []
+        updates: List[Dict] = []
+
+        for address, delta in deltas.items():
+            current = existing.get(address)
+            if current is None:
+                new_rows.append({
+                    'address': address,
+                    'balance': round(delta['received'] - delta['sent'], 8),
+                    'total_received': round(delta['received'], 8),
+                    'total_sent': round(delta['sent'], 8),
+                    'tx_count': len(delta['txids']),
+                    'first_seen': delta['first_seen'],
+                    'last_seen': delta['last_seen'],
+                })
+                continue
+
+            received = (current.total_received or 0.0) + delta['received']
+            sent = (current.total_sent or 0.0) + delta['sent']
+            updates.append({
+                'address': address,
+                'balance': round(received - sent, 8),
+                'total_received': round(received, 8),
+                'total_sent': round(sent, 8),
+                'tx_count': (current.tx_count or 0) + len(delta['txids']),
+                'first_seen': min(filter(None, (current.first_seen, delta['first_seen'])), default=None),
+                'last_seen': max(filter(None, (current.last_seen, delta['last_seen'])), default=None),
+            })
+
+        if new_rows:
+            db.execute(insert(Address), new_rows)
+        if updates:
+            db.execute(update(Address), updates)
+
+        return [row['address'] for row in new_rows]
@@ -0,0 +1,234 @@
+"""Shortest-path queries between two addresses"""
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..utils.logger import logger
+from .graph_loader import GraphLoader
+
+
+# (neighbor, edge) discovered at a node's first BFS level
+Parents = Dict[str, List[Tuple[str, Dict]]]
+
+
+class PathFindingService:
+    """
+    Bidirectional breadth-first search over the address flow graph
+
+    An edge u -> v exists when a transaction spends from u and pays to v.
+    The search grows one frontier forward from the source (what it paid)
+    and one backward from the target (who paid it), always expanding the
+    smaller one. Each expansion is one ``GraphLoader.expand_frontier`` call
+    over the whole frontier, so a search costs one query per hop (per 500
+    frontier addresses) rather than one per address.
+
+    Every address remembers the (up to ``max_paths``) edges through which it
+    was first reached, i.e. the shortest-path DAG of each side. Paths are
+    enumerated from those DAGs wherever the two sides meet.
+
+    The latency budget is checked before every frontier query, and a hop
+    discovers at most as many new addresses as ``max_nodes`` still allows,
+    so neither the time nor the frontier of one hop can run far past its limit.
+    """
+
+    @staticmethod
+    def find_paths(
+        db: Session,
+        source: str,
+        target: str,
+        max_hops: int = 6,
+        max_paths: int = 5,
+        max_fanout: int = 50,
+        max_nodes: int = 5000,
+        min_amount: float = 0.0,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        timeout_ms: int = 3000
+    ) -> Dict:
+        """
+        Find the shortest flow paths from source to target
+
+        Args:
+            db: Database session
+            source: Paying address
+            target: Receiving address
+            max_hops: Maximum path length in address hops
+            max_paths: Number of paths to return (top-k)
+            max_fanout: Maximum edges per address per hop
+            max_nodes: Maximum number of addresses visited by both sides
+            min_amount: Minimum output amount in BTC for every hop
+            start_time: Earliest transaction timestamp (ISO 8601)
+            end_time: Latest transaction timestamp (ISO 8601)
+            timeout_ms: Latency budget; no frontier query is started after it is exceeded
+
+        Returns:
+            Result dictionary with paths (shortest first, then largest bottleneck amount)
+        """
+        started = time.monotonic()
+        deadline = started + timeout_ms / 1000.0
+        logger.info(f"경로 탐색 시작: {source} -> {target}, max_hops={max_hops}")
+
+        forward: Parents = {source: []}
+        backward: Parents = {target: []}
+        forward_frontier, backward_frontier = [source], [target]
+        forward_depth = backward_depth = 0
+        meets: Dict[str, int] = {source: 0} if source == target else {}  # address -> path length through it
+        paths: List[Dict] = []
+        reason = None
+
+        while True:
+            if meets:
+                paths = PathFindingService._collect_paths(forward, backward, source, target, meets, max_paths)
+                if len(paths) >= max_paths:
+                    break
+            if forward_depth + backward_depth >= max_hops:
+                reason = None if paths else "max_hops"
+                break
+            if not forward_frontier or not backward_frontier:
+                reason = None if paths else "exhausted"
+                break
+            if time.monotonic() > deadline:
+                reason = "timeout"
+                break
+            if len(forward) + len(backward) >= max_nodes:
+                reason = "max_nodes"
+                break
+
+            room = max_nodes - len(forward) - len(backward)
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                discovered = PathFindingService._expand(
+                    db, forward_frontier, forward, "out", max_paths, max_fanout, min_amount, start_time, end_time,
+                    room, deadline
+                )
+                forward_frontier = list(discovered)
+                forward_depth += 1
+                for meet in discovered.keys() & backward.keys():
+                    meets.setdefault(meet, forward_depth + backward_depth)
+            else:
+                discovered = PathFindingService._expand(
+                    db, backward_frontier, backward, "in", max_paths, max_fanout, min_amount, start_time, end_time,
+                    room, deadline
+                )
+                backward_frontier = list(discovered)
+                backward_depth += 1
+                for meet in discovered.keys() & forward.keys():
+                    meets.setdefault(meet, forward_depth + backward_depth)
+
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        logger.info(
+            f"경로 탐색 완료: {len(paths)}개 경로, 방문 주소 {len(forward) + len(backward)}개, {elapsed_ms}ms"
+        )
+
+        return {
+            'source': source,
+            'target': target,
+            'found': bool(paths),
+            'paths': paths,
+            'visited_addresses': len(forward) + len(backward),
+            'hops_searched': forward_depth + backward_depth,
+            'elapsed_ms': elapsed_ms,
+            'truncated': reason in ("timeout", "max_nodes"),
+            'stop_reason': reason,
+        }
+
+    @staticmethod
+    def _expand(
+        db: Session,
+        frontier: List[str],
+        parents: Parents,
+        direction: str,
+        max_parents: int,
+        max_fanout: int,
+        min_amount: float,
+        start_time: Optional[str],
+        end_time: Optional[str],
+        max_new: int,
+        deadline: float
+    ) -> Parents:
+        """Expand one BFS level; returns the newly discovered addresses (at most max_new)"""
+        rows = GraphLoader.expand_frontier(
+            db, frontier, direction, max_fanout, min_amount, start_time, end_time, deadline
+        )
+        discovered: Parents = {}
+
+        for row in rows:
+            if row['source'] == row['target']:
+                continue
+
+            # Forward: anchor pays neighbor; backward: neighbor pays anchor
+            neighbor = row['target'] if direction == "out" else row['source']
+            if neighbor in parents or (neighbor not in discovered and len(discovered) >= max_new):
+                continue
+
+            links = discovered.setdefault(neighbor, [])
+            if len(links) >= max_parents or any(edge['txid'] == row['txid'] and prev == row['anchor'] for prev, edge in links):
+                continue
+
+            links.append((row['anchor'], {
+                'source': row['source'],
+                'target': row['target'],
+                'txid': row['txid'],
+                'amount': row['amount'],
+                'timestamp': row['timestamp'],
+            }))
+
+        parents.update(discovered)
+        return discovered
+
+    @staticmethod
+    def _walk(parents: Parents, node: str, end: str) -> Iterator[List[Dict]]:
+        """Edge lists from node back to end through the BFS DAG (nearest edge first)"""
+        if node == end:
+            yield []
+            return
+        for prev, edge in parents.get(node, []):
+            for rest in PathFindingService._walk(parents, prev, end):
+                yield [edge] + rest
+
+    @staticmethod
+    def _collect_paths(
+        forward: Parents,
+        backward: Parents,
+        source: str,
+        target: str,
+        meets: Dict[str, int],
+        max_paths: int
+    ) -> List[Dict]:
+        """Join forward and backward half-paths at every meeting address"""
+        candidates: List[Dict] = []
+        seen: Set[Tuple[str, ...]] = set()
+        limit = max_paths * 5
+
+        # Shortest meeting points first, so longer paths cannot crowd them out of the limit
+        for meet in sorted(meets, key=lambda address: (meets[address], address)):
+            if len(candidates) >= limit:
+                break
+            for head in PathFindingService._walk(forward, meet, source):
+                for tail in PathFindingService._walk(backward, meet, target):
+                    edges = list(reversed(head)) + tail
+                    addresses = [source] + [edge['target'] for edge in edges]
+
+                    # Both halves are shortest paths, but they may still share an address
+                    if len(set(addresses)) != len(addresses):
+                        continue
+
+                    key = tuple(edge['txid'] for edge in edges) + tuple(addresses)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+
+                    candidates.append({
+                        'hops': len(edges),
+                        'addresses': addresses,
+                        'edges': edges,
+                        'min_amount': min((edge['amount'] for edge in edges), default=0.0),
+                    })
+                    if len(candidates) >= limit:
+                        break
+                if len(candidates) >= limit:
+                    break
+
+        candidates.sort(key=lambda path: (path['hops'], -path['min_amount']))
+        return candidates[:max_paths]
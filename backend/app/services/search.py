@@ -0,0 +1,337 @@
+"""Indexed unified search over addresses, transactions and clusters"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import and_, event, text
+from sqlalchemy.orm import Session
+
+from .. import database
+from ..config import settings
+from ..database import ReadSessionLocal
+from ..models import Address, Transaction, Cluster
+from ..schemas.common import SearchResult
+from ..utils.bitcoin import is_valid_address
+
+
+# Sub-queries of one search run concurrently on separate read connections
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="search")
+
+
+TXID_PATTERN = re.compile(r"^[0-9a-fA-F]{64}$")
+UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+BLOCK_HEIGHT_PATTERN = re.compile(r"^[0-9]{1,7}$")
+
+# session.info key set when the session's commit must clear the search cache
+CLEAR_PENDING_KEY = "search_cache_clear"
+
+
+def prefix_range(column, prefix: str):
+    """``prefix <= column < next(prefix)``: an index range scan instead of LIKE"""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+class SearchCache:
+    """
+    Size-bounded LRU cache of search results with a time-to-live
+
+    Entries are keyed by ``(query, limit)``. Results may be up to ``ttl``
+    seconds stale; ingestion clears the cache when its session commits
+    (``clear_on_commit``) so new data shows up at once. Every clear bumps
+    ``generation``, and results computed under an older generation are not
+    stored, so a search that overlaps the commit cannot cache stale rows.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, List[SearchResult]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, q: str, limit: int) -> Optional[List[SearchResult]]:
+        """Cached results, or None on a miss or an expired entry"""
+        key = (q, limit)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, q: str, limit: int, results: List[SearchResult], generation: Optional[int] = None):
+        """Store results (unless computed before a later clear), evicting the least recently used entries"""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[(q, limit)] = (time.monotonic(), results)
+            self._entries.move_to_end((q, limit))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def clear_on_commit(self, db: Session):
+        """Clear the cache once db commits (nothing happens if it rolls back)"""
+        db.info[CLEAR_PENDING_KEY] = True
+
+
+search_cache = SearchCache(settings.search_cache_size, settings.search_cache_ttl)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_after_commit(session: Session):
+    if session.info.pop(CLEAR_PENDING_KEY, False):
+        search_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_clear(session: Session):
+    session.info.pop(CLEAR_PENDING_KEY, None)
+
+
+class SearchService:
+    """
+    Unified search backed by indexes
+
+    Queries are classified first: a full txid, a checksum-valid address or a
+    cluster UUID is answered with a single primary-key lookup, and a block
+    height uses ``idx_transactions_block``. Only free text (and partial
+    identifiers) falls through to the prefix search below, and results are
+    kept in ``search_cache`` for repeated queries.
+
+    Addresses, txids and cluster IDs are matched by prefix with primary-key
+    range scans. Cluster labels are matched through the ``clusters_fts``
+    FTS5 table (word prefixes), falling back to a label prefix match when
+    FTS5 is unavailable. The three sub-queries run in parallel, each on its
+    own connection from the read-only pool.
+    """
+
+    @staticmethod
+    def search(q: str, limit: int = 20) -> List[SearchResult]:
+        """
+        Search by query type, serving repeated queries from the cache
+
+        Args:
+            q: Search query
+            limit: Maximum number of results
+
+        Returns:
+            The exact match for identifiers; otherwise address, transaction
+            and cluster results (in that order)
+        """
+        q = q.strip()
+        if not q:
+            return []
+
+        results = search_cache.get(q, limit)
+        if results is None:
+            generation = search_cache.generation
+            results = SearchService._search_uncached(q, limit)
+            search_cache.put(q, limit, results, generation)
+        return list(results)
+
+    @staticmethod
+    def classify(q: str) -> str:
+        """
+        Detect what kind of identifier a query is
+
+        Args:
+            q: Stripped search query
+
+        Returns:
+            "txid", "address", "block_height", "cluster_id" or "text"
+        """
+        if TXID_PATTERN.match(q):
+            return "txid"
+        if UUID_PATTERN.match(q):
+            return "cluster_id"
+        if BLOCK_HEIGHT_PATTERN.match(q):
+            return "block_height"
+        if is_valid_address(q):
+            return "address"
+        return "text"
+
+    @staticmethod
+    def _search_uncached(q: str, limit: int) -> List[SearchResult]:
+        kind = SearchService.classify(q)
+
+        if kind == "txid":
+            return SearchService._run(SearchService.lookup_transaction, q, limit)
+        if kind == "address":
+            return SearchService._run(SearchService.lookup_address, q, limit)
+        if kind == "cluster_id":
+            return SearchService._run(SearchService.lookup_cluster, q, limit)
+
+        results: List[SearchResult] = []
+        if kind == "block_height":
+            results = SearchService._run(SearchService.search_block, q, limit)
+            if len(results) >= limit:
+                return results
+
+        for result in SearchService._search_prefixes(q, limit - len(results)):
+            if not any(r.type == result.type and r.id == result.id for r in results):
+                results.append(result)
+
+        return results[:limit]
+
+    @staticmethod
+    def _search_prefixes(q: str, limit: int) -> List[SearchResult]:
+        per_type = max(limit // 3, 1)
+        futures = [
+            _executor.submit(SearchService._run, searcher, q, per_type)
+            for searcher in (
+                SearchService.search_addresses,
+                SearchService.search_transactions,
+                SearchService.search_clusters,
+            )
+        ]
+
+        results: List[SearchResult] = []
+        for future in futures:
+            results.extend(future.result())
+
+        return results[:limit]
+
+    @staticmethod
+    def _run(searcher: Callable[[Session, str, int], List[SearchResult]], q: str, limit: int) -> List[SearchResult]:
+        db = ReadSessionLocal()
+        try:
+            return searcher(db, q, limit)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _address_result(addr: Address) -> SearchResult:
+        return SearchResult(
+            type="address",
+            id=addr.address,
+            label=f"{addr.address[:20]}...",
+            preview=f"잔액: {addr.balance} BTC, 트랜잭션: {addr.tx_count}개"
+        )
+
+    @staticmethod
+    def _transaction_result(tx: Transaction) -> SearchResult:
+        return SearchResult(
+            type="transaction",
+            id=tx.txid,
+            label=f"{tx.txid[:20]}...",
+            preview=f"블록: {tx.block_height}, 금액: {tx.total_output} BTC"
+        )
+
+    @staticmethod
+    def _cluster_result(cluster: Cluster) -> SearchResult:
+        return SearchResult(
+            type="cluster",
+            id=cluster.id,
+            label=cluster.label or f"Cluster {cluster.id[:8]}...",
+            preview=f"주소: {cluster.address_count}개, 잔액: {cluster.total_balance} BTC"
+        )
+
+    @staticmethod
+    def lookup_transaction(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Exact txid match (primary key)"""
+        tx = db.get(Transaction, q.lower())
+        return [SearchService._transaction_result(tx)] if tx else []
+
+    @staticmethod
+    def lookup_address(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """
+        Exact address match (primary key)
+
+        A valid address that is not stored locally is still returned, since
+        the address endpoints can look it up through Electrum.
+        """
+        # Bech32 addresses are stored lowercase
+        address = q.lower() if q[:3].lower() in ("bc1", "tb1") else q
+        addr = db.get(Address, address)
+        if addr:
+            return [SearchService._address_result(addr)]
+
+        return [SearchResult(
+            type="address",
+            id=address,
+            label=f"{address[:20]}...",
+            preview="로컬 데이터 없음 (Electrum 조회)"
+        )]
+
+    @staticmethod
+    def lookup_cluster(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Exact cluster UUID match (primary key)"""
+        cluster = db.get(Cluster, q.lower())
+        return [SearchService._cluster_result(cluster)] if cluster else []
+
+    @staticmethod
+    def search_block(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Transactions in the block at height q"""
+        transactions = db.query(Transaction).filter(
+            Transaction.block_height == int(q)
+        ).order_by(Transaction.txid).limit(limit).all()
+
+        return [SearchService._transaction_result(tx) for tx in transactions]
+
+    @staticmethod
+    def search_addresses(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Addresses starting with q"""
+        addresses = db.query(Address).filter(
+            prefix_range(Address.address, q)
+        ).order_by(Address.address).limit(limit).all()
+
+        return [SearchService._address_result(addr) for addr in addresses]
+
+    @staticmethod
+    def search_transactions(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Transactions whose txid starts with q (txids are stored lowercase)"""
+        transactions = db.query(Transaction).filter(
+            prefix_range(Transaction.txid, q.lower())
+        ).order_by(Transaction.txid).limit(limit).all()
+
+        return [SearchService._transaction_result(tx) for tx in transactions]
+
+    @staticmethod
+    def search_clusters(db: Session, q: str, limit: int) -> List[SearchResult]:
+        """Clusters whose ID starts with q or whose label has words starting with the query words"""
+        ids = [cid for (cid,) in db.query(Cluster.id).filter(
+            prefix_range(Cluster.id, q.lower())
+        ).order_by(Cluster.id).limit(limit)]
+
+        if len(ids) < limit:
+            ids += [cid for cid in SearchService._match_labels(db, q, limit) if cid not in ids]
+        ids = ids[:limit]
+
+        clusters = {c.id: c for c in db.query(Cluster).filter(Cluster.id.in_(ids)).all()} if ids else {}
+
+        return [SearchService._cluster_result(clusters[cid]) for cid in ids if cid in clusters]
+
+    @staticmethod
+    def _match_labels(db: Session, q: str, limit: int) -> List[str]:
+        words = re.findall(r"\w+", q)
+        if not words:
+            return []
+
+        if not database.fts_available:
+            return [cid for (cid,) in db.query(Cluster.id).filter(
+                prefix_range(Cluster.label, q)
+            ).limit(limit)]
+
+        # Every word must match as a prefix: "bin ex" -> "bin"* "ex"*
+        match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+        rows = db.execute(
+            text("SELECT cluster_id FROM clusters_fts WHERE clusters_fts MATCH :match ORDER BY rank LIMIT :limit"),
+            {"match": match, "limit": limit}
+        )
+        return [cid for (cid,) in rows]
+
@@ -0,0 +1,290 @@
+"""HyperLogLog sketches for approximate distinct counts"""
+from collections import defaultdict
+from itertools import groupby
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from sqlalchemy import select, delete, func, or_, union
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, aliased
+
+from ..config import settings
+from ..models import Address, DistinctSketch, Transaction, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.hyperloglog import HyperLogLog
+from ..utils.logger import logger
+
+
+# Distinct addresses seen in inputs or outputs of a UTC day's transactions
+SCOPE_DAY = "active_addresses_day"
+# Distinct addresses on the other side of a cluster's transactions
+SCOPE_CLUSTER = "cluster_counterparties"
+
+# Rows fetched per batch while rebuilding
+REBUILD_BATCH_SIZE = 10000
+
+
+class DistinctSketchService:
+    """
+    Mergeable distinct-count sketches in ``distinct_sketches``
+
+    Each UTC day keeps a sketch of the addresses active in its
+    transactions, and each cluster a sketch of its counterparties: the
+    addresses paid by a transaction the cluster spends from, or spending
+    into a transaction that pays the cluster, excluding addresses already
+    in the cluster when the pair is recorded. Ingestion adds the pairs of
+    new transactions, clustering adds the history of addresses joining a
+    cluster and folds merged clusters into the survivor.
+
+    Union over any day range or cluster is a register-wise max, so the
+    endpoints answer in time independent of the data size, with a relative
+    standard error of ``HyperLogLog.relative_error``. Sketches only grow;
+    ``rebuild`` recomputes them from the base tables.
+
+    Sketches stored before HLL_*_PRECISION changed keep their precision:
+    those above the configured one are folded down when loaded, and unions
+    are taken at the lowest precision involved until ``rebuild`` runs.
+    """
+
+    @staticmethod
+    def _precision(scope: str) -> int:
+        return settings.hll_day_precision if scope == SCOPE_DAY else settings.hll_cluster_precision
+
+    @staticmethod
+    def _day_pairs(txids: Optional[Sequence[str]] = None):
+        """(day, address) for every address in the inputs or outputs of the transactions"""
+        day = func.substr(Transaction.timestamp, 1, 10)
+        selects = []
+        for table in (TransactionInput, TransactionOutput):
+            query = select(day.label('key'), table.address.label('address')).join(
+                Transaction, Transaction.txid == table.txid
+            ).where(table.address.isnot(None), Transaction.timestamp.isnot(None))
+            if txids is not None:
+                query = query.where(table.txid.in_(txids))
+            selects.append(query)
+        return union(*selects)
+
+    @staticmethod
+    def _counterparty_pairs(txids: Optional[Sequence[str]] = None, addresses: Optional[Sequence[str]] = None):
+        """
+        (cluster ID, counterparty address) pairs
+
+        Args:
+            txids: Only pairs from these transactions
+            addresses: Only pairs whose own side is one of these addresses
+        """
+        selects = []
+        for own_table, other_table in ((TransactionInput, TransactionOutput), (TransactionOutput, TransactionInput)):
+            own = aliased(Address)
+            other = aliased(Address)
+            query = select(own.cluster_id.label('key'), other_table.address.label('address')).select_from(own_table).join(
+                own, own.address == own_table.address
+            ).join(
+                other_table, other_table.txid == own_table.txid
+            ).outerjoin(
+                other, other.address == other_table.address
+            ).where(
+                own.cluster_id.isnot(None),
+                other_table.address.isnot(None),
+                or_(other.cluster_id.is_(None), other.cluster_id != own.cluster_id)
+            )
+            if txids is not None:
+                query = query.where(own_table.txid.in_(txids))
+            if addresses is not None:
+                query = query.where(own_table.address.in_(addresses))
+            selects.append(query)
+        return union(*selects)
+
+    @staticmethod
+    def _load(db: Session, scope: str, keys: Iterable[str]) -> Dict[str, HyperLogLog]:
+        sketches = {}
+        for chunk in chunked(keys):
+            rows = db.query(DistinctSketch.key, DistinctSketch.sketch).filter(
+                DistinctSketch.scope == scope, DistinctSketch.key.in_(chunk)
+            )
+            sketches.update((key, HyperLogLog.from_bytes(data)) for key, data in rows)
+
+        precision = DistinctSketchService._precision(scope)
+        for key, sketch in sketches.items():
+            if sketch.precision > precision:
+                sketches[key] = sketch.fold(precision)
+        return sketches
+
+    @staticmethod
+    def _merge(union_sketch: HyperLogLog, sketch: HyperLogLog) -> HyperLogLog:
+        """Fold sketch into union_sketch at the lower of their precisions"""
+        if sketch.precision < union_sketch.precision:
+            logger.warning(f"정밀도가 낮은 스케치 발견: {union_sketch.precision} -> {sketch.precision}로 합산")
+            union_sketch = union_sketch.fold(sketch.precision)
+        elif sketch.precision > union_sketch.precision:
+            sketch = sketch.fold(union_sketch.precision)
+        union_sketch.merge(sketch)
+        return union_sketch
+
+    @staticmethod
+    def _store(db: Session, scope: str, sketches: Dict[str, HyperLogLog]):
+        if not sketches:
+            return
+        stmt = insert(DistinctSketch).values([
+            {'scope': scope, 'key': key, 'sketch': sketch.to_bytes()} for key, sketch in sketches.items()
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['scope', 'key'],
+            set_={'sketch': stmt.excluded.sketch, 'updated_at': stmt.excluded.updated_at}
+        ))
+
+    @staticmethod
+    def _add_pairs(db: Session, scope: str, pairs) -> int:
+        """Add (key, address) rows to the stored sketches of their keys"""
+        values = defaultdict(list)
+        for key, address in db.execute(pairs):
+            values[key].append(address)
+        if not values:
+            return 0
+
+        sketches = DistinctSketchService._load(db, scope, values)
+        precision = DistinctSketchService._precision(scope)
+        for key, addresses in values.items():
+            sketches.setdefault(key, HyperLogLog(precision)).update(addresses)
+
+        for chunk in chunked(list(sketches)):
+            DistinctSketchService._store(db, scope, {key: sketches[key] for key in chunk})
+        return len(values)
+
+    @staticmethod
+    def after_ingest(db: Session, txids: Sequence[str]):
+        """
+        Add newly stored transactions to the day and cluster sketches
+
+        Args:
+            db: Database session
+            txids: Newly stored transaction IDs
+        """
+        days = clusters = 0
+        for chunk in chunked(txids):
+            days += DistinctSketchService._add_pairs(db, SCOPE_DAY, DistinctSketchService._day_pairs(chunk))
+            clusters += DistinctSketchService._add_pairs(
+                db, SCOPE_CLUSTER, DistinctSketchService._counterparty_pairs(txids=chunk)
+            )
+        logger.info(f"고유 개수 스케치 갱신: 일 {days}개, 클러스터 {clusters}개")
+
+    @staticmethod
+    def add_cluster_addresses(db: Session, addresses: Sequence[str]):
+        """
+        Add the counterparties of addresses that just joined a cluster
+
+        Args:
+            db: Database session
+            addresses: Addresses whose cluster_id was just set
+        """
+        for chunk in chunked(addresses):
+            DistinctSketchService._add_pairs(
+                db, SCOPE_CLUSTER, DistinctSketchService._counterparty_pairs(addresses=chunk)
+            )
+
+    @staticmethod
+    def merge_clusters(db: Session, survivor: str, losers: Sequence[str]):
+        """
+        Fold the sketches of merged clusters into the survivor's
+
+        Args:
+            db: Database session
+            survivor: Cluster that absorbed the others
+            losers: Clusters that were merged away
+        """
+        if not losers:
+            return
+
+        sketches = DistinctSketchService._load(db, SCOPE_CLUSTER, [survivor, *losers])
+
+        for chunk in chunked(losers):
+            db.execute(delete(DistinctSketch).where(
+                DistinctSketch.scope == SCOPE_CLUSTER, DistinctSketch.key.in_(chunk)
+            ))
+        if sketches:
+            merged = HyperLogLog(settings.hll_cluster_precision)
+            for sketch in sketches.values():
+                merged = DistinctSketchService._merge(merged, sketch)
+            DistinctSketchService._store(db, SCOPE_CLUSTER, {survivor: merged})
+
+    @staticmethod
+    def active_addresses(db: Session, start: str, end: str) -> Tuple[int, int, float]:
+        """
+        Approximate number of distinct addresses active between two days
+
+        Args:
+            db: Database session
+            start: First day (YYYY-MM-DD, inclusive)
+            end: Last day (YYYY-MM-DD, inclusive)
+
+        Returns:
+            (estimate, days with activity, relative standard error)
+        """
+        rows = db.query(DistinctSketch.sketch).filter(
+            DistinctSketch.scope == SCOPE_DAY, DistinctSketch.key >= start, DistinctSketch.key <= end
+        )
+        union_sketch = HyperLogLog(settings.hll_day_precision)
+        days = 0
+        for (data,) in rows:
+            union_sketch = DistinctSketchService._merge(union_sketch, HyperLogLog.from_bytes(data))
+            days += 1
+        return union_sketch.count(), days, union_sketch.relative_error
+
+    @staticmethod
+    def cluster_counterparties(db: Session, cluster_id: str) -> Tuple[int, float]:
+        """
+        Approximate number of distinct counterparties of a cluster
+
+        Args:
+            db: Database session
+            cluster_id: Cluster UUID
+
+        Returns:
+            (estimate, relative standard error)
+        """
+        data = db.query(DistinctSketch.sketch).filter(
+            DistinctSketch.scope == SCOPE_CLUSTER, DistinctSketch.key == cluster_id
+        ).scalar()
+        sketch = HyperLogLog.from_bytes(data) if data else HyperLogLog(settings.hll_cluster_precision)
+        return sketch.count(), sketch.relative_error
+
+    @staticmethod
+    def rebuild(db: Session) -> Dict[str, int]:
+        """
+        Recompute every sketch from the base tables
+
+        Pairs are streamed in key order so only one sketch is held in memory.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Scope -> number of sketches
+        """
+        db.execute(delete(DistinctSketch))
+
+        counts = {}
+        for scope, pairs in (
+            (SCOPE_DAY, DistinctSketchService._day_pairs()),
+            (SCOPE_CLUSTER, DistinctSketchService._counterparty_pairs()),
+        ):
+            pairs = pairs.subquery()
+            result = db.execute(
+                select(pairs.c.key, pairs.c.address).order_by(pairs.c.key).execution_options(
+                    yield_per=REBUILD_BATCH_SIZE
+                )
+            )
+            precision = DistinctSketchService._precision(scope)
+            sketches = {}
+            counts[scope] = 0
+            for key, rows in groupby(result, key=lambda row: row[0]):
+                sketch = HyperLogLog(precision)
+                sketch.update(address for _, address in rows)
+                sketches[key] = sketch
+                counts[scope] += 1
+                if len(sketches) >= 500:
+                    DistinctSketchService._store(db, scope, sketches)
+                    sketches = {}
+            DistinctSketchService._store(db, scope, sketches)
+
+        logger.info(f"고유 개수 스케치 재구축 완료: {counts}")
+        return counts
@@ -0,0 +1,150 @@
+"""Incrementally maintained summary statistics"""
+from typing import Dict, Optional, Sequence
+
+from sqlalchemy import func, update, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..database import JobSessionLocal
+from ..models import Address, Cluster, Transaction, TransactionInput, TransactionOutput, SummaryStat
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+from .cluster_distribution import ClusterDistributionService
+
+
+SUMMARY_STATS = ("total_addresses", "total_transactions", "total_clusters", "clustered_addresses", "total_balance")
+
+
+class StatsRollupService:
+    """
+    Global counters in ``summary_stats`` so the dashboard summary is a
+    single small read instead of full-table aggregates
+
+    Ingestion and clustering apply deltas to the stored counters in the same
+    transaction as their own changes. ``reconcile`` recomputes every counter
+    from the base tables and overwrites drift; it runs when the counters are
+    missing (new database), after seeding, periodically from the app and on
+    demand via ``scripts/reconcile_stats.py``.
+    """
+
+    @staticmethod
+    def apply(db: Session, deltas: Dict[str, float]):
+        """
+        Add deltas to the stored counters
+
+        Counters that have not been reconciled yet are left missing, so a
+        partial delta is never mistaken for a total.
+
+        Args:
+            db: Database session
+            deltas: Counter name -> amount to add
+        """
+        rows = [{'stat_name': name, 'delta': delta} for name, delta in deltas.items() if delta]
+        if not rows:
+            return
+
+        db.connection().execute(
+            update(SummaryStat.__table__)
+            .where(SummaryStat.__table__.c.name == bindparam('stat_name'))
+            .values(value=SummaryStat.__table__.c.value + bindparam('delta')),
+            rows
+        )
+
+    @staticmethod
+    def after_ingest(db: Session, txids: Sequence[str], new_addresses: Sequence[str]):
+        """
+        Apply the counter changes of newly stored transactions
+
+        Address balances change by what they received minus what they spent,
+        so the balance delta is summed from the new outputs and inputs.
+
+        Args:
+            db: Database session
+            txids: Newly stored transaction IDs
+            new_addresses: Addresses created by this ingestion
+        """
+        balance = 0.0
+        for chunk in chunked(txids):
+            received = db.query(func.coalesce(func.sum(TransactionOutput.amount), 0.0)).filter(
+                TransactionOutput.txid.in_(chunk), TransactionOutput.address.isnot(None)
+            ).scalar()
+            sent = db.query(func.coalesce(func.sum(TransactionInput.amount), 0.0)).filter(
+                TransactionInput.txid.in_(chunk), TransactionInput.address.isnot(None)
+            ).scalar()
+            balance += received - sent
+
+        StatsRollupService.apply(db, {
+            'total_transactions': len(txids),
+            'total_addresses': len(new_addresses),
+            'total_balance': balance,
+        })
+
+    @staticmethod
+    def read(db: Session) -> Optional[Dict[str, float]]:
+        """
+        Stored counters
+
+        Args:
+            db: Database session
+
+        Returns:
+            Counter name -> value, or None if any counter is missing
+        """
+        stats = {name: value for name, value in db.query(SummaryStat.name, SummaryStat.value)}
+        if any(name not in stats for name in SUMMARY_STATS):
+            return None
+        return stats
+
+    @staticmethod
+    def reconcile(db: Session) -> Dict[str, float]:
+        """
+        Recompute every counter from the base tables and store it
+
+        Also rebuilds the cluster size histogram. The caller commits.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Counter name -> value
+        """
+        actual = {
+            'total_addresses': db.query(func.count(Address.address)).scalar(),
+            'total_transactions': db.query(func.count(Transaction.txid)).scalar(),
+            'total_clusters': db.query(func.count(Cluster.id)).scalar(),
+            'clustered_addresses': db.query(func.coalesce(func.sum(Cluster.address_count), 0)).scalar(),
+            'total_balance': db.query(func.coalesce(func.sum(Address.balance), 0.0)).scalar(),
+        }
+
+        stored = {name: value for name, value in db.query(SummaryStat.name, SummaryStat.value)}
+        drift = {
+            name: round(value - stored[name], 8)
+            for name, value in actual.items()
+            if name in stored and abs(value - stored[name]) > 1e-6
+        }
+        if drift:
+            logger.warning(f"요약 통계 보정: {drift}")
+
+        stmt = sqlite_insert(SummaryStat).values([{'name': name, 'value': value} for name, value in actual.items()])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['name'],
+            set_={'value': stmt.excluded.value, 'updated_at': stmt.excluded.updated_at}
+        ))
+
+        ClusterDistributionService.rebuild(db)
+
+        logger.info(f"요약 통계 재계산 완료: {actual}")
+        return actual
+
+    @staticmethod
+    def reconcile_job():
+        """Reconcile on a dedicated job connection (periodic job entry point)"""
+        db = JobSessionLocal()
+        try:
+            StatsRollupService.reconcile(db)
+            db.commit()
+        except Exception as e:
+            logger.error(f"요약 통계 재계산 실패: {e}", exc_info=True)
+            db.rollback()
+        finally:
+            db.close()
@@ -0,0 +1,360 @@
+"""Taint (fund-flow) propagation over spent-output links"""
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, insert, tuple_
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import JobSessionLocal
+from ..models import TaintTrace, TaintResult, TransactionInput, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+
+
+SATOSHI_PER_BTC = 100_000_000
+
+POLICIES = ("haircut", "fifo")
+DIRECTIONS = ("forward", "backward")
+
+# (txid, vout) -> tainted satoshis
+Frontier = Dict[Tuple[str, int], int]
+
+
+def to_satoshi(amount: Optional[float]) -> int:
+    return int(round((amount or 0.0) * SATOSHI_PER_BTC))
+
+
+def allocate_taint(policy: str, sources: List[Tuple[int, int]], sinks: List[int]) -> List[int]:
+    """
+    Distribute tainted satoshis of a transaction's sources over its sinks
+
+    Forward traces pass inputs as sources and outputs as sinks, backward
+    traces the other way round.
+
+    - haircut: the tainted total is split over the sinks in proportion to
+      their amounts.
+    - fifo: sources and sinks are laid out in order on one satoshi line; the
+      tainted part of each source occupies its beginning and every sink gets
+      the tainted satoshis that fall into its range. Taint that lands past
+      the last sink (the fee, going forward) is dropped.
+
+    Args:
+        policy: "haircut" or "fifo"
+        sources: (amount, tainted) satoshis per source, in transaction order
+        sinks: Amount in satoshis per sink, in transaction order
+
+    Returns:
+        Tainted satoshis per sink
+    """
+    if policy == "haircut":
+        tainted = sum(taint for _, taint in sources)
+        total = sum(sinks)
+        if not tainted or not total:
+            return [0] * len(sinks)
+        return [min(amount, tainted * amount // total) for amount in sinks]
+
+    ranges: List[Tuple[int, int]] = []
+    position = 0
+    for amount, taint in sources:
+        if taint:
+            ranges.append((position, position + min(taint, amount)))
+        position += amount
+
+    result: List[int] = []
+    first = 0
+    position = 0
+    for amount in sinks:
+        low, high = position, position + amount
+        while first < len(ranges) and ranges[first][1] <= low:
+            first += 1
+
+        taint = 0
+        index = first
+        while index < len(ranges) and ranges[index][0] < high:
+            taint += min(high, ranges[index][1]) - max(low, ranges[index][0])
+            index += 1
+
+        result.append(taint)
+        position = high
+
+    return result
+
+
+class TaintService:
+    """
+    Forward/backward taint tracing from a single transaction output
+
+    Forward traces follow ``TransactionOutput.spent_in_txid`` to the spending
+    transaction and split the taint over its outputs. Backward traces follow
+    ``TransactionInput.prev_txid/prev_vout`` to the outputs that funded a
+    transaction. Each hop loads the inputs and outputs of every transaction
+    on the frontier with two set-based queries, keeps the ``max_frontier``
+    most tainted outputs, and appends them to ``taint_results`` before moving
+    on, so memory is bounded by the frontier rather than by the trace depth.
+
+    Traces are persisted and reused: requesting the same parameters again
+    returns the stored trace. A pending or running trace that has made no
+    progress for ``settings.taint_trace_stale_after`` seconds (its job was
+    lost to a restart or crash) is marked failed and replaced by a new one.
+    """
+
+    @staticmethod
+    def find_or_create_trace(
+        db: Session,
+        txid: str,
+        vout: int,
+        direction: str = "forward",
+        policy: str = "haircut",
+        max_hops: int = 5,
+        min_taint: float = 0.0,
+        max_frontier: int = 1000
+    ) -> Tuple[TaintTrace, bool]:
+        """
+        Return a stored trace with the same parameters or create a pending one
+
+        Failed traces are not reused, and stale pending/running traces are
+        marked failed first.
+
+        Args:
+            db: Database session
+            txid: Transaction ID of the starting output
+            vout: Output index of the starting output
+            direction: "forward" or "backward"
+            policy: "haircut" or "fifo"
+            max_hops: Number of hops to trace
+            min_taint: Outputs with less taint (BTC) are not recorded or followed
+            max_frontier: Maximum outputs followed per hop
+
+        Returns:
+            (trace, created)
+        """
+        existing = db.query(TaintTrace).filter(
+            TaintTrace.txid == txid,
+            TaintTrace.vout == vout,
+            TaintTrace.direction == direction,
+            TaintTrace.policy == policy,
+            TaintTrace.max_hops == max_hops,
+            TaintTrace.min_taint == min_taint,
+            TaintTrace.max_frontier == max_frontier,
+            TaintTrace.status != "failed"
+        ).first()
+        if existing and TaintService._is_stale(existing):
+            logger.warning(f"중단된 테인트 추적을 실패 처리: {existing.id} ({existing.status}, 마지막 갱신 {existing.updated_at})")
+            existing.status = "failed"
+            existing.error = f"No progress for {settings.taint_trace_stale_after:g} seconds (job lost)"
+            db.commit()
+            existing = None
+        if existing:
+            logger.info(f"기존 테인트 추적 재사용: {existing.id}")
+            return existing, False
+
+        trace = TaintTrace(
+            id=str(uuid.uuid4()),
+            txid=txid,
+            vout=vout,
+            direction=direction,
+            policy=policy,
+            max_hops=max_hops,
+            min_taint=min_taint,
+            max_frontier=max_frontier,
+            status="pending"
+        )
+        db.add(trace)
+        db.commit()
+        logger.info(f"테인트 추적 생성: {trace.id} ({txid}:{vout}, {direction}/{policy}, {max_hops} hops)")
+        return trace, True
+
+    @staticmethod
+    def _is_stale(trace: TaintTrace) -> bool:
+        """Pending or running without an update within the stale timeout"""
+        if trace.status not in ("pending", "running"):
+            return False
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.taint_trace_stale_after)
+        return (trace.updated_at or trace.created_at or "") < cutoff.isoformat()
+
+    @staticmethod
+    def run_trace_job(trace_id: str):
+        """Run a trace on a dedicated job connection (background task and inline entry point)"""
+        db = JobSessionLocal()
+        try:
+            TaintService.run_trace(db, trace_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def run_trace(db: Session, trace_id: str) -> TaintTrace:
+        """
+        Execute a pending trace, committing after every hop
+
+        Args:
+            db: Database session
+            trace_id: TaintTrace ID
+
+        Returns:
+            The finished trace (status "completed" or "failed")
+        """
+        trace = db.get(TaintTrace, trace_id)
+        if trace is None or trace.status != "pending":
+            return trace
+
+        trace.status = "running"
+        db.commit()
+
+        try:
+            TaintService._propagate(db, trace)
+            trace.status = "completed"
+            db.commit()
+            logger.info(
+                f"테인트 추적 완료: {trace.id}, {trace.hops_completed} hops, 결과 {trace.result_count}개"
+            )
+        except Exception as e:
+            logger.error(f"테인트 추적 실패: {trace.id} - {e}", exc_info=True)
+            db.rollback()
+            trace.status = "failed"
+            trace.error = str(e)
+            db.commit()
+
+        return trace
+
+    @staticmethod
+    def _propagate(db: Session, trace: TaintTrace):
+        start = db.execute(
+            select(
+                TransactionOutput.address, TransactionOutput.amount, TransactionOutput.spent_in_txid
+            ).where(TransactionOutput.txid == trace.txid, TransactionOutput.vout == trace.vout)
+        ).first()
+        if start is None:
+            raise ValueError(f"Output not found: {trace.txid}:{trace.vout}")
+
+        address, amount, spent_in_txid = start
+        forward = trace.direction == "forward"
+        propagates = spent_in_txid is not None if forward else True
+
+        TaintService._write_results(db, trace, 0, [(trace.txid, trace.vout, address, amount, to_satoshi(amount), propagates)])
+        frontier: Frontier = {(trace.txid, trace.vout): to_satoshi(amount)} if propagates else {}
+        min_taint = to_satoshi(trace.min_taint)
+
+        for hop in range(1, trace.max_hops + 1):
+            if not frontier:
+                break
+
+            if forward:
+                reached = TaintService._forward_hop(db, frontier, trace.policy)
+            else:
+                reached = TaintService._backward_hop(db, frontier, trace.policy)
+
+            reached = [row for row in reached if row[4] > 0 and row[4] >= min_taint]
+            reached.sort(key=lambda row: row[4], reverse=True)
+
+            # Bounded frontier: only the most tainted outputs are followed further
+            followed = 0
+            frontier = {}
+            for index, (txid, vout, _, _, taint, propagates) in enumerate(reached):
+                if not propagates:
+                    continue
+                if followed < trace.max_frontier:
+                    frontier[(txid, vout)] = frontier.get((txid, vout), 0) + taint
+                    followed += 1
+                else:
+                    trace.truncated_amount = round((trace.truncated_amount or 0.0) + taint / SATOSHI_PER_BTC, 8)
+                    reached[index] = (txid, vout, reached[index][2], reached[index][3], taint, False)
+
+            TaintService._write_results(db, trace, hop, reached)
+            trace.hops_completed = hop
+            db.commit()
+
+            logger.info(f"테인트 추적 hop {hop}: 출력 {len(reached)}개, 다음 프론티어 {len(frontier)}개")
+
+    @staticmethod
+    def _forward_hop(db: Session, frontier: Frontier, policy: str) -> List[Tuple]:
+        """Outputs of the transactions spending the frontier outputs"""
+        spending_txids = set()
+        for chunk in chunked(list(frontier)):
+            rows = db.execute(
+                select(TransactionOutput.spent_in_txid).where(
+                    tuple_(TransactionOutput.txid, TransactionOutput.vout).in_(chunk),
+                    TransactionOutput.spent_in_txid.isnot(None)
+                )
+            )
+            spending_txids.update(txid for (txid,) in rows)
+
+        reached: List[Tuple] = []
+        for txid, (inputs, outputs) in TaintService._load_transactions(db, spending_txids).items():
+            sources = [
+                (to_satoshi(amount), frontier.get((prev_txid, prev_vout), 0))
+                for prev_txid, prev_vout, _, amount in inputs
+            ]
+            taints = allocate_taint(policy, sources, [to_satoshi(amount) for _, _, amount, _ in outputs])
+
+            for (vout, address, amount, spent_in), taint in zip(outputs, taints):
+                reached.append((txid, vout, address, amount, taint, spent_in is not None))
+
+        return reached
+
+    @staticmethod
+    def _backward_hop(db: Session, frontier: Frontier, policy: str) -> List[Tuple]:
+        """Previous outputs that funded the frontier outputs"""
+        reached: List[Tuple] = []
+
+        for txid, (inputs, outputs) in TaintService._load_transactions(db, {txid for txid, _ in frontier}).items():
+            sources = [(to_satoshi(amount), frontier.get((txid, vout), 0)) for vout, _, amount, _ in outputs]
+            taints = allocate_taint(policy, sources, [to_satoshi(amount) for _, _, _, amount in inputs])
+
+            # Input rows carry the spent output's address and amount; coinbase inputs end the trace
+            for (prev_txid, prev_vout, address, amount), taint in zip(inputs, taints):
+                if prev_txid is None:
+                    continue
+                reached.append((prev_txid, prev_vout, address, amount, taint, True))
+
+        return reached
+
+    @staticmethod
+    def _load_transactions(db: Session, txids: Sequence[str]) -> Dict[str, Tuple[List[Tuple], List[Tuple]]]:
+        """txid -> (inputs, outputs) in transaction order, two queries per chunk"""
+        transactions: Dict[str, Tuple[List[Tuple], List[Tuple]]] = {}
+
+        for chunk in chunked(list(txids)):
+            for txid in chunk:
+                transactions[txid] = ([], [])
+
+            inputs = db.execute(
+                select(
+                    TransactionInput.txid, TransactionInput.prev_txid, TransactionInput.prev_vout,
+                    TransactionInput.address, TransactionInput.amount
+                ).where(TransactionInput.txid.in_(chunk)).order_by(
+                    TransactionInput.txid, TransactionInput.vout_index, TransactionInput.id
+                )
+            )
+            for txid, prev_txid, prev_vout, address, amount in inputs:
+                transactions[txid][0].append((prev_txid, prev_vout, address, amount))
+
+            outputs = db.execute(
+                select(
+                    TransactionOutput.txid, TransactionOutput.vout, TransactionOutput.address,
+                    TransactionOutput.amount, TransactionOutput.spent_in_txid
+                ).where(TransactionOutput.txid.in_(chunk)).order_by(TransactionOutput.txid, TransactionOutput.vout)
+            )
+            for txid, vout, address, amount, spent_in_txid in outputs:
+                transactions[txid][1].append((vout, address, amount, spent_in_txid))
+
+        # Transactions that are referenced but not stored end the trace
+        return {txid: tx for txid, tx in transactions.items() if tx[0] or tx[1]}
+
+    @staticmethod
+    def _write_results(db: Session, trace: TaintTrace, hop: int, rows: List[Tuple]):
+        if not rows:
+            return
+
+        db.execute(insert(TaintResult), [{
+            'trace_id': trace.id,
+            'hop': hop,
+            'txid': txid,
+            'vout': vout,
+            'address': address,
+            'amount': amount,
+            'taint': round(taint / SATOSHI_PER_BTC, 8),
+            'propagated': 1 if propagates else 0,
+        } for txid, vout, address, amount, taint, propagates in rows])
+        trace.result_count = (trace.result_count or 0) + len(rows)
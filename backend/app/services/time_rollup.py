@@ -0,0 +1,158 @@
+"""Per-block and per-day transaction rollups"""
+from typing import Optional, Sequence, Union
+
+from sqlalchemy import select, delete, func, case
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from ..models import Address, BlockStat, DailyStat, Transaction, TransactionOutput
+from ..utils.helpers import chunked
+from ..utils.logger import logger
+
+
+# Columns summed when a bucket receives more transactions
+ADDITIVE_COLUMNS = ('tx_count', 'input_count', 'output_count', 'volume', 'fee_total')
+
+
+class TimeSeriesRollupService:
+    """
+    Maintain ``block_stats`` and ``daily_stats``
+
+    Each ingestion batch is grouped by block height and by UTC day in SQL and
+    upserted into the rollups: counts, volume and fee totals are added, fee
+    min/max are merged. Addresses created by the batch are counted in the
+    block and day of their first output. Charts read only these tables.
+    """
+
+    @staticmethod
+    def _bucket_select(bucket, txids: Optional[Sequence[str]] = None):
+        """Transaction aggregates grouped by bucket (block height or day)"""
+        query = select(
+            bucket.label('bucket'),
+            func.count().label('tx_count'),
+            func.sum(Transaction.input_count).label('input_count'),
+            func.sum(Transaction.output_count).label('output_count'),
+            func.round(func.sum(Transaction.total_output), 8).label('volume'),
+            func.round(func.sum(Transaction.fee), 8).label('fee_total'),
+            func.min(case((Transaction.fee > 0, Transaction.fee))).label('fee_min'),
+            func.max(Transaction.fee).label('fee_max'),
+        ).where(bucket.isnot(None))
+
+        if txids is not None:
+            query = query.where(Transaction.txid.in_(txids))
+
+        return query.group_by(bucket)
+
+    @staticmethod
+    def _first_seen_select(addresses: Optional[Sequence[str]] = None):
+        """(address, first block height, first timestamp) from the outputs paying each address"""
+        query = select(
+            TransactionOutput.address.label('address'),
+            func.min(Transaction.block_height).label('block_height'),
+            func.min(Transaction.timestamp).label('timestamp'),
+        ).join(Transaction, Transaction.txid == TransactionOutput.txid).where(TransactionOutput.address.isnot(None))
+
+        if addresses is not None:
+            query = query.where(TransactionOutput.address.in_(addresses))
+
+        return query.group_by(TransactionOutput.address).subquery()
+
+    @staticmethod
+    def _upsert(db: Session, model, key: str, rows):
+        columns = [key, *ADDITIVE_COLUMNS, 'fee_min', 'fee_max']
+        stmt = insert(model).from_select(columns, rows)
+        table = model.__table__.c
+        set_ = {column: table[column] + stmt.excluded[column] for column in ADDITIVE_COLUMNS}
+        set_['fee_min'] = func.min(
+            func.coalesce(table.fee_min, stmt.excluded.fee_min), func.coalesce(stmt.excluded.fee_min, table.fee_min)
+        )
+        set_['fee_max'] = func.max(
+            func.coalesce(table.fee_max, stmt.excluded.fee_max), func.coalesce(stmt.excluded.fee_max, table.fee_max)
+        )
+        db.execute(stmt.on_conflict_do_update(index_elements=[key], set_=set_))
+
+    @staticmethod
+    def _add_new_addresses(db: Session, addresses: Union[Sequence[str], Select]):
+        first_seen = TimeSeriesRollupService._first_seen_select(addresses)
+        day = func.substr(first_seen.c.timestamp, 1, 10)
+
+        for model, key, bucket in (
+            (BlockStat, 'block_height', first_seen.c.block_height),
+            (DailyStat, 'day', day),
+        ):
+            stmt = insert(model).from_select(
+                [key, 'new_addresses'],
+                select(bucket, func.count()).where(bucket.isnot(None)).group_by(bucket)
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[key],
+                set_={'new_addresses': model.__table__.c.new_addresses + stmt.excluded.new_addresses}
+            ))
+
+    @staticmethod
+    def _set_block_timestamps(db: Session, heights):
+        first = select(func.min(Transaction.timestamp)).where(
+            Transaction.block_height == BlockStat.block_height
+        ).scalar_subquery()
+        query = BlockStat.__table__.update().values(timestamp=first)
+        if heights is not None:
+            query = query.where(BlockStat.block_height.in_(heights))
+        db.execute(query)
+
+    @staticmethod
+    def apply_transactions(db: Session, txids: Sequence[str], new_addresses: Sequence[str]):
+        """
+        Add newly ingested transactions to the rollups
+
+        Each transaction must be applied exactly once.
+
+        Args:
+            db: Database session
+            txids: IDs of the newly stored transactions
+            new_addresses: Addresses created by the same ingestion
+        """
+        day = func.substr(Transaction.timestamp, 1, 10)
+
+        for chunk in chunked(txids):
+            TimeSeriesRollupService._upsert(
+                db, BlockStat, 'block_height', TimeSeriesRollupService._bucket_select(Transaction.block_height, chunk)
+            )
+            TimeSeriesRollupService._upsert(
+                db, DailyStat, 'day', TimeSeriesRollupService._bucket_select(day, chunk)
+            )
+
+            heights = select(Transaction.block_height).where(Transaction.txid.in_(chunk)).distinct()
+            TimeSeriesRollupService._set_block_timestamps(db, heights)
+
+        for chunk in chunked(new_addresses):
+            TimeSeriesRollupService._add_new_addresses(db, chunk)
+
+        logger.info(f"시계열 집계 갱신: 트랜잭션 {len(txids)}개, 신규 주소 {len(new_addresses)}개")
+
+    @staticmethod
+    def rebuild(db: Session):
+        """
+        Recompute both rollups from scratch
+
+        Args:
+            db: Database session
+        """
+        db.execute(delete(BlockStat))
+        db.execute(delete(DailyStat))
+
+        TimeSeriesRollupService._upsert(
+            db, BlockStat, 'block_height', TimeSeriesRollupService._bucket_select(Transaction.block_height)
+        )
+        TimeSeriesRollupService._upsert(
+            db, DailyStat, 'day', TimeSeriesRollupService._bucket_select(func.substr(Transaction.timestamp, 1, 10))
+        )
+        TimeSeriesRollupService._set_block_timestamps(db, None)
+
+        # Only addresses that are stored count as "new" (outputs may pay unknown scripts)
+        TimeSeriesRollupService._add_new_addresses(db, select(Address.address))
+
+        logger.info(
+            f"시계열 집계 재구축 완료: 블록 {db.query(func.count(BlockStat.block_height)).scalar()}개, "
+            f"일 {db.query(func.count(DailyStat.day)).scalar()}개"
+        )
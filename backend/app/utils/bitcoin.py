@@ -73,6 +73,108 @@ def bech32_decode(address: str) -> Optional[bytes]:
     return bytes(converted)
 
 
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+BECH32_CONST = 1
+BECH32M_CONST = 0x2bc830a3
+
+# Base58Check 버전 바이트 (mainnet/testnet P2PKH, P2SH)
+BASE58_VERSIONS = {0x00, 0x05, 0x6f, 0xc4}
+
+
+def _bech32_polymod(values) -> int:
+    generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    checksum = 1
+    for value in values:
+        top = checksum >> 25
+        checksum = (checksum & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            checksum ^= generator[i] if ((top >> i) & 1) else 0
+    return checksum
+
+
+def is_valid_bech32_address(address: str) -> bool:
+    """
+    Bech32/Bech32m 체크섬 검증 (BIP173, BIP350)
+
+    Args:
+        address: bc1/tb1 주소
+
+    Returns:
+        체크섬과 witness 버전/길이가 올바르면 True
+    """
+    if address.lower() != address and address.upper() != address:
+        return False
+    address = address.lower()
+
+    pos = address.rfind('1')
+    if pos < 1 or pos + 7 > len(address) or len(address) > 90:
+        return False
+
+    hrp = address[:pos]
+    if hrp not in ('bc', 'tb'):
+        return False
+    if any(char not in BECH32_CHARSET for char in address[pos + 1:]):
+        return False
+
+    data = [BECH32_CHARSET.index(char) for char in address[pos + 1:]]
+    expanded = [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+    constant = _bech32_polymod(expanded + data)
+
+    witness_version = data[0]
+    if witness_version > 16:
+        return False
+    if constant != (BECH32_CONST if witness_version == 0 else BECH32M_CONST):
+        return False
+
+    program_bits = len(data[1:-6]) * 5
+    program_length = program_bits // 8
+    if program_bits % 8 >= 5:
+        return False
+    if witness_version == 0:
+        return program_length in (20, 32)
+    return 2 <= program_length <= 40
+
+
+def is_valid_base58check_address(address: str) -> bool:
+    """
+    Base58Check 체크섬 검증 (P2PKH, P2SH)
+
+    Args:
+        address: 1/3/m/n/2로 시작하는 주소
+
+    Returns:
+        체크섬과 버전 바이트가 올바르면 True
+    """
+    if not 26 <= len(address) <= 35:
+        return False
+
+    try:
+        decoded = base58_decode(address)
+    except ValueError:
+        return False
+
+    if len(decoded) != 25 or decoded[0] not in BASE58_VERSIONS:
+        return False
+
+    checksum = hashlib.sha256(hashlib.sha256(decoded[:-4]).digest()).digest()[:4]
+    return checksum == decoded[-4:]
+
+
+def is_valid_address(address: str) -> bool:
+    """
+    체크섬까지 검증된 Bitcoin 주소인지 확인
+
+    Args:
+        address: Bitcoin 주소
+
+    Returns:
+        유효한 Base58Check 또는 Bech32/Bech32m 주소이면 True
+    """
+    if address[:3].lower() in ('bc1', 'tb1'):
+        return is_valid_bech32_address(address)
+    return is_valid_base58check_address(address)
+
+
 def address_to_script_pubkey(address: str) -> Optional[bytes]:
     """
     Bitcoin 주소를 scriptPubKey로 변환
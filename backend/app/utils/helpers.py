@@ -1,6 +1,12 @@
 """Helper functions"""
+import base64
+import json
+import math
 import re
-from typing import Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+
+T = TypeVar('T')
 
 
 def is_valid_bitcoin_address(address: str) -> bool:
@@ -56,3 +62,49 @@ def calculate_percentage(part: float, total: float) -> float:
     if total == 0:
         return 0.0
     return round((part / total) * 100, 2)
+
+
+def chunked(items: Iterable[T], size: int = 500) -> Iterator[List[T]]:
+    """Split a sequence into lists of at most size items (SQLite IN-clause limits)"""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list:
+    """
+    Decode a cursor from encode_cursor
+
+    Args:
+        cursor: Opaque cursor string
+        types: Expected type of each value (float accepts any finite number)
+
+    Returns:
+        Decoded values, one per type
+
+    Raises:
+        ValueError: If the cursor is malformed or a value has the wrong type
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    for value, expected in zip(values, types):
+        if expected is float:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+        else:
+            valid = isinstance(value, expected)
+        if not valid:
+            raise ValueError(f"Invalid cursor: {cursor}")
+    return values
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Union-Find 벤치마크 스크립트
+
+dict 기반 UnionFind 와 배열 기반 ArrayUnionFind 를 같은 무작위 co-spending
+간선 집합으로 비교합니다. 각 실행은 별도 프로세스에서 수행되어 최대 메모리
+(RSS) 가 서로 섞이지 않습니다.
+
+사용법:
+    python scripts/benchmark_union_find.py
+    python scripts/benchmark_union_find.py --sizes 10000000 100000000 --dict-limit 10000000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from array import array
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.clustering import UnionFind, ArrayUnionFind
+
+
+def generate_pairs(num_addresses: int, num_pairs: int, seed: int):
+    """Generate random (left, right) ID pairs"""
+    rng = random.Random(seed)
+    randrange = rng.randrange
+    left = array('I', (randrange(num_addresses) for _ in range(num_pairs)))
+    right = array('I', (randrange(num_addresses) for _ in range(num_pairs)))
+    return left, right
+
+
+def run_dict(num_addresses: int, left, right) -> int:
+    """Current implementation: dict keyed by address strings"""
+    uf = UnionFind()
+    for a, b in zip(left, right):
+        uf.union(f"addr{a}", f"addr{b}")
+    return len(uf.get_clusters())
+
+
+def run_array(num_addresses: int, left, right) -> int:
+    """Array-backed implementation with bulk union_pairs"""
+    uf = ArrayUnionFind(num_addresses)
+    uf.union_pairs(left, right)
+    return uf.set_count
+
+
+def _worker(impl: str, num_addresses: int, num_pairs: int, seed: int, queue):
+    left, right = generate_pairs(num_addresses, num_pairs, seed)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    result = run_dict(num_addresses, left, right) if impl == "dict" else run_array(num_addresses, left, right)
+    elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak_rss - baseline_rss) / 1024, result))
+
+
+def benchmark(impl: str, num_addresses: int, num_pairs: int, seed: int):
+    """Run one benchmark in an isolated process"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_worker, args=(impl, num_addresses, num_pairs, seed, queue))
+    process.start()
+    process.join()
+
+    if process.exitcode != 0:
+        return None
+    return queue.get()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Union-Find 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000_000, 100_000_000], help="주소 수")
+    parser.add_argument("--pair-ratio", type=float, default=1.0, help="주소 수 대비 간선 수 비율")
+    parser.add_argument("--dict-limit", type=int, default=10_000_000, help="dict 구현을 실행할 최대 주소 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"{'구현':<8} {'주소 수':>14} {'간선 수':>14} {'시간(s)':>10} {'메모리(MB)':>12}")
+    print("=" * 72)
+
+    for num_addresses in args.sizes:
+        num_pairs = int(num_addresses * args.pair_ratio)
+
+        for impl in ("dict", "array"):
+            if impl == "dict" and num_addresses > args.dict_limit:
+                print(f"{impl:<8} {num_addresses:>14,} {num_pairs:>14,} {'skipped':>10} {'-':>12}")
+                continue
+
+            result = benchmark(impl, num_addresses, num_pairs, args.seed)
+            if result is None:
+                print(f"{impl:<8} {num_addresses:>14,} {num_pairs:>14,} {'failed':>10} {'-':>12}")
+                continue
+
+            elapsed, memory_mb, _ = result
+            print(f"{impl:<8} {num_addresses:>14,} {num_pairs:>14,} {elapsed:>10.2f} {memory_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Block ingestion job (Bitcoin Core RPC -> 데이터베이스)"""
+import argparse
+import sys
+import os
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.database import SessionLocal, init_db
+from app.models import JobCheckpoint
+from app.services.bitcoin_rpc import get_bitcoin_rpc
+from app.services.ingestion import IngestionService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "block_ingestion"
+
+
+def ingest_blocks(start_height=None, end_height=None):
+    """Main ingestion function"""
+    logger.info("=== 블록 수집 시작 ===")
+    init_db()
+
+    rpc = get_bitcoin_rpc(
+        host=settings.bitcoin_rpc_host,
+        port=settings.bitcoin_rpc_port,
+        user=settings.bitcoin_rpc_user,
+        password=settings.bitcoin_rpc_password,
+        use_ssl=settings.bitcoin_rpc_use_ssl
+    )
+    if not rpc.connect():
+        logger.error("Bitcoin Core RPC 연결 실패")
+        return
+
+    db = SessionLocal()
+
+    try:
+        checkpoint = db.get(JobCheckpoint, CHECKPOINT_NAME)
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(name=CHECKPOINT_NAME, last_block_height=None)
+            db.add(checkpoint)
+
+        if start_height is None:
+            start_height = (checkpoint.last_block_height + 1) if checkpoint.last_block_height is not None else 0
+        if end_height is None:
+            end_height = rpc.get_block_count()
+
+        for height in range(start_height, end_height + 1):
+            block_hash = rpc.get_block_hash(height)
+            block = rpc.get_block(block_hash, verbosity=2) if block_hash else None
+            if not block:
+                logger.error(f"블록 조회 실패: {height}")
+                break
+
+            transactions = rpc.parse_block_transactions(block)
+            summary = IngestionService.ingest_transactions(db, transactions)
+
+            checkpoint.last_block_height = height
+            db.commit()
+            logger.info(f"블록 {height} 수집: 트랜잭션 {len(summary['txids'])}개, 신규 주소 {len(summary['new_addresses'])}개")
+
+        logger.info("=== 블록 수집 완료 ===")
+
+    except Exception as e:
+        logger.error(f"블록 수집 중 오류 발생: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="블록 수집 작업")
+    parser.add_argument("--start-height", type=int, default=None, help="시작 블록 높이 (기본: 체크포인트 다음)")
+    parser.add_argument("--end-height", type=int, default=None, help="마지막 블록 높이 (기본: 최신 블록)")
+    args = parser.parse_args()
+
+    ingest_blocks(start_height=args.start_height, end_height=args.end_height)
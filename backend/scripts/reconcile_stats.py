@@ -0,0 +1,42 @@
+"""Analytics rollup reconciliation job (기본 테이블에서 요약 통계, 시계열 집계, 고유 개수 스케치 재계산)"""
+import sys
+import os
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import SessionLocal, init_db
+from app.services.stats_rollup import StatsRollupService
+from app.services.time_rollup import TimeSeriesRollupService
+from app.services.sketches import DistinctSketchService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def reconcile_stats():
+    """Main reconciliation function"""
+    logger.info("=== 요약 통계 재계산 시작 ===")
+    init_db()
+
+    db = SessionLocal()
+
+    try:
+        stats = StatsRollupService.reconcile(db)
+        TimeSeriesRollupService.rebuild(db)
+        DistinctSketchService.rebuild(db)
+        db.commit()
+        logger.info(f"=== 요약 통계 재계산 완료: {stats} ===")
+        return stats
+
+    except Exception as e:
+        logger.error(f"요약 통계 재계산 중 오류 발생: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reconcile_stats()
@@ -0,0 +1,43 @@
+"""Cluster statistics refresh job (SQL 집계로 클러스터 통계 갱신)"""
+import argparse
+import sys
+import os
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import SessionLocal, init_db
+from app.services.cluster_stats import ClusterStatsService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def refresh_cluster_stats(cluster_ids=None):
+    """Main refresh function"""
+    logger.info("=== 클러스터 통계 갱신 시작 ===")
+    init_db()
+
+    db = SessionLocal()
+
+    try:
+        updated = ClusterStatsService.refresh(db, cluster_ids)
+        db.commit()
+        logger.info(f"=== 클러스터 통계 갱신 완료: {updated}개 클러스터 ===")
+        return updated
+
+    except Exception as e:
+        logger.error(f"통계 갱신 중 오류 발생: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="클러스터 통계 갱신")
+    parser.add_argument("cluster_ids", nargs="*", help="갱신할 클러스터 ID (생략 시 전체)")
+    args = parser.parse_args()
+
+    refresh_cluster_stats(args.cluster_ids or None)
@@ -0,0 +1,67 @@
+"""Incremental clustering job (새 블록의 co-spending 간선만 반영)"""
+import argparse
+import sys
+import os
+import logging
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.database import SessionLocal, init_db
+from app.services.incremental_clustering import IncrementalClusteringService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def run_clustering(up_to_height=None, batch_blocks=100, heuristics=None, workers=1):
+    """Main clustering job"""
+    logger.info("=== 증분 클러스터링 작업 시작 ===")
+    init_db()
+
+    db = SessionLocal()
+
+    try:
+        service = IncrementalClusteringService(
+            db, batch_blocks=batch_blocks, heuristics=heuristics, workers=workers
+        )
+        summary = service.run(up_to_height=up_to_height)
+
+        logger.info("=== 증분 클러스터링 작업 완료 ===")
+        logger.info(f"  마지막 블록: {summary['last_block_height']}")
+        logger.info(f"  트랜잭션: {summary['transactions']}개")
+        logger.info(f"  신규 클러스터: {summary['clusters_created']}개")
+        logger.info(f"  병합된 클러스터: {summary['clusters_merged']}개")
+        logger.info(f"  이동한 주소: {summary['addresses_moved']}개")
+        for name, stats in summary['heuristics'].items():
+            logger.info(
+                f"  휴리스틱 {name}: 간선 {stats['pairs']}개, 병합 {stats['merges']}회, {stats['seconds']:.3f}초"
+            )
+        return summary
+
+    except Exception as e:
+        logger.error(f"클러스터링 중 오류 발생: {e}", exc_info=True)
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="증분 클러스터링 작업")
+    parser.add_argument("--up-to-height", type=int, default=None, help="처리할 마지막 블록 높이")
+    parser.add_argument("--batch-blocks", type=int, default=100, help="한 번에 처리할 블록 수")
+    parser.add_argument(
+        "--heuristics",
+        default=None,
+        help="쉼표로 구분한 휴리스틱 목록 (예: coinjoin,co_spending,address_reuse). 생략하면 co-spending만 적용"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="배치의 co-spending 간선을 병렬로 묶을 프로세스 수 (1이면 단일 프로세스)"
+    )
+    args = parser.parse_args()
+
+    heuristics = [name.strip() for name in args.heuristics.split(",") if name.strip()] if args.heuristics else None
+    run_clustering(
+        up_to_height=args.up_to_height, batch_blocks=args.batch_blocks, heuristics=heuristics, workers=args.workers
+    )
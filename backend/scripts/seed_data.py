@@ -7,7 +7,12 @@ import logging
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from app.database import SessionLocal, init_db
-from app.models import Address, Transaction, TransactionInput, TransactionOutput, Cluster, ClusterEdge
+from app.models import Address, AddressEdge, Transaction, TransactionInput, TransactionOutput, Cluster, ClusterEdge, JobCheckpoint, TaintTrace, TaintResult, SummaryStat, BlockStat, DailyStat, DistinctSketch
+from app.services.ingestion import IngestionService
+from app.services.stats_rollup import StatsRollupService
+from app.services.graph_cache import graph_cache
+from app.services.search import search_cache
+from app.services.autocomplete import autocomplete_index
 from generate_mock_data import MockDataGenerator
 
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +25,14 @@ def clear_database(db):
 
     try:
         # Delete in correct order (respecting foreign keys)
+        db.query(SummaryStat).delete()
+        db.query(BlockStat).delete()
+        db.query(DailyStat).delete()
+        db.query(DistinctSketch).delete()
+        db.query(TaintResult).delete()
+        db.query(TaintTrace).delete()
+        db.query(JobCheckpoint).delete()
+        db.query(AddressEdge).delete()
         db.query(ClusterEdge).delete()
         db.query(TransactionInput).delete()
         db.query(TransactionOutput).delete()
@@ -27,6 +40,9 @@ def clear_database(db):
         db.query(Address).delete()
         db.query(Cluster).delete()
         db.commit()
+        graph_cache.clear()
+        search_cache.clear()
+        autocomplete_index.clear()
         logger.info("기존 데이터 삭제 완료")
     except Exception as e:
         logger.error(f"데이터 삭제 실패: {e}")
@@ -89,16 +105,20 @@ def seed_transactions(db, transactions_data, inputs_data, outputs_data):
     logger.info("트랜잭션 출력 저장 완료")
 
 
-def seed_cluster_edges(db, edges_data):
-    """Seed cluster edges"""
-    logger.info(f"클러스터 관계 {len(edges_data)}개 저장 중...")
+def seed_derived_indexes(db, transactions_data, addresses_data):
+    """Build derived indexes (address adjacency, cluster edges, ...) for the seeded rows"""
+    logger.info("파생 인덱스 생성 중...")
 
-    for edge_data in edges_data:
-        edge = ClusterEdge(**edge_data)
-        db.add(edge)
+    IngestionService.after_ingest(
+        db,
+        [tx['txid'] for tx in transactions_data],
+        [addr['address'] for addr in addresses_data]
+    )
+    # Seeded rows bypass ingestion, so the summary counters are recomputed
+    StatsRollupService.reconcile(db)
 
     db.commit()
-    logger.info("클러스터 관계 저장 완료")
+    logger.info("파생 인덱스 생성 완료")
 
 
 def seed_database(clear_existing=True):
@@ -129,7 +149,7 @@ def seed_database(clear_existing=True):
         seed_clusters(db, data['clusters'])
         seed_addresses(db, data['addresses'])
         seed_transactions(db, data['transactions'], data['transaction_inputs'], data['transaction_outputs'])
-        seed_cluster_edges(db, data['cluster_edges'])
+        seed_derived_indexes(db, data['transactions'], data['addresses'])
 
         logger.info("=== 데이터베이스 시딩 완료 ===")
         logger.info(f"총 {len(data['addresses'])}개 주소, {len(data['transactions'])}개 트랜잭션, {len(data['clusters'])}개 클러스터")
@@ -0,0 +1,76 @@
+"""Shared pytest fixtures (임시 디렉토리의 SQLite 데이터베이스 사용)"""
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# DATABASE_URL은 ./bitcoin_analysis.db 상대 경로이므로 app import 전에 임시 디렉토리로 이동
+os.chdir(tempfile.mkdtemp(prefix="cracker-tests-"))
+os.environ.setdefault("STATS_RECONCILE_INTERVAL", "0")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, SessionLocal, engine, init_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.autocomplete import autocomplete_index  # noqa: E402
+from app.services.graph_cache import graph_cache  # noqa: E402
+from app.services.search import search_cache  # noqa: E402
+
+
+class QueryCounter:
+    """Count SQL statements executed on the main engine"""
+
+    def __init__(self):
+        self.statements = []
+        self.parameters = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self._record)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    init_db()
+    yield
+
+
+@pytest.fixture
+def db():
+    """Session on an emptied database"""
+    session = SessionLocal()
+    for table in reversed(Base.metadata.sorted_tables):
+        session.execute(table.delete())
+    session.commit()
+    graph_cache.clear()
+    search_cache.clear()
+    autocomplete_index.clear()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def count_queries():
+    return QueryCounter
@@ -0,0 +1,63 @@
+"""Autocomplete index: bounded prefix buckets, commit-time updates and label reloads"""
+import pytest
+
+from app.models import Address, Cluster, Transaction
+from app.services import autocomplete
+from app.services.autocomplete import AutocompleteIndex, autocomplete_index
+
+ADDRESSES = [f"bc1q{i:03x}{suffix}" for i in range(40) for suffix in ("aa", "ab", "b")]
+TXIDS = [f"{i:02x}" * 32 for i in range(60)]
+
+
+@pytest.fixture
+def data(db):
+    db.add_all(Address(address=address) for address in ADDRESSES)
+    db.add_all(Transaction(txid=txid) for txid in TXIDS)
+    db.commit()
+
+
+def expected(keys, q, limit):
+    return sorted(key for key in keys if key.startswith(q))[:limit]
+
+
+def test_bounded_buckets_match_prefix_scan(data, monkeypatch):
+    monkeypatch.setattr(autocomplete, "BUCKET_CAP", 4)
+    index = AutocompleteIndex(max_entries=10)
+
+    for q in ["b", "bc1q", "bc1q00", "bc1q01", "bc1q01a", "bc1q027b", "bc1qzz", "bc1q00", "bc1q"]:
+        found = [s["id"] for s in index.suggest(q, 5) if s["type"] == "address"]
+        assert found == expected(ADDRESSES, q, 5), q
+        assert index._addresses._size <= 10 + autocomplete.BUCKET_CAP
+
+    for q in ["0", "0a", "0a0", "3b3b3", "ff"]:
+        found = [s["id"] for s in index.suggest(q, 3) if s["type"] == "transaction"]
+        assert found == expected(TXIDS, q, 3), q
+
+
+def test_updates_apply_on_commit_only(data, db):
+    autocomplete_index.suggest("bc1qnew", 5)  # load the bucket
+
+    db.add(Address(address="bc1qnew0"))
+    db.flush()
+    autocomplete_index.defer(db, addresses=["bc1qnew0"])
+    db.rollback()
+    assert autocomplete_index.suggest("bc1qnew", 5) == []
+
+    db.add(Address(address="bc1qnew1"))
+    db.flush()
+    autocomplete_index.defer(db, addresses=["bc1qnew1"])
+    db.commit()
+    assert [s["id"] for s in autocomplete_index.suggest("bc1qnew", 5)] == ["bc1qnew1"]
+
+
+def test_new_and_renamed_labels_show_up_after_ttl(db):
+    index = AutocompleteIndex(label_ttl=0)
+    db.add(Cluster(id="c1", label="Binance Hot Wallet"))
+    db.commit()
+    assert [s["id"] for s in index.suggest("hot", 5)] == ["c1"]
+
+    db.get(Cluster, "c1").label = "Kraken Cold Storage"
+    db.add(Cluster(id="c2", label="Hot Desk"))
+    db.commit()
+    assert [s["id"] for s in index.suggest("hot", 5)] == ["c2"]
+    assert [s["label"] for s in index.suggest("cold", 5)] == ["Kraken Cold Storage"]
@@ -0,0 +1,51 @@
+"""init_db upgrades a database whose cluster_edges predate the unique (source, target) index"""
+from sqlalchemy import inspect, text
+
+from app.database import engine, init_db
+from app.models import ClusterEdge
+from app.services.cluster_edges import ClusterEdgeService
+
+from .test_cluster_edges_refresh import edges, make_flows
+
+
+def drop_pair_index(db):
+    db.execute(text("DROP INDEX idx_cluster_edges_pair"))
+    db.commit()
+
+
+def pair_index_exists() -> bool:
+    return "idx_cluster_edges_pair" in {index["name"] for index in inspect(engine).get_indexes("cluster_edges")}
+
+
+def test_duplicate_edges_are_rebuilt_before_unique_index(db):
+    make_flows(db)
+    ClusterEdgeService.rebuild(db)
+    db.commit()
+    expected = edges(db)
+
+    drop_pair_index(db)
+    # Older mock data stored the same cluster pair more than once
+    db.add_all([
+        ClusterEdge(source_cluster_id="A", target_cluster_id="B", tx_count=3, total_amount=9.0),
+        ClusterEdge(source_cluster_id="B", target_cluster_id="A", tx_count=1, total_amount=2.0),
+        ClusterEdge(source_cluster_id="B", target_cluster_id="A", tx_count=4, total_amount=5.0),
+    ])
+    db.commit()
+
+    init_db()
+
+    assert pair_index_exists()
+    db.expire_all()
+    assert edges(db) == expected
+
+
+def test_edges_without_duplicates_are_kept(db):
+    make_flows(db)
+    drop_pair_index(db)
+    db.add(ClusterEdge(source_cluster_id="A", target_cluster_id="B", tx_count=3, total_amount=9.0))
+    db.commit()
+
+    init_db()
+
+    assert pair_index_exists()
+    assert [(e.source_cluster_id, e.target_cluster_id, e.tx_count) for e in db.query(ClusterEdge)] == [("A", "B", 3)]
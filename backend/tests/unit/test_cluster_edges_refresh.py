@@ -0,0 +1,59 @@
+"""ClusterEdgeService.refresh_clusters must match a full rebuild without scanning all transactions"""
+from app.models import Address, Cluster, ClusterEdge, Transaction, TransactionInput, TransactionOutput
+from app.services.cluster_edges import ClusterEdgeService
+
+FLOWS = [
+    # txid, input addresses, (output address, amount)
+    ("tx-ab", ["a1", "a2"], [("b1", 1.0), ("a1", 0.5)]),
+    ("tx-bc", ["b1"], [("c1", 0.7), ("c2", 0.2)]),
+    ("tx-ac", ["a2"], [("c1", 0.3)]),
+    ("tx-ca", ["c2"], [("a2", 0.1), ("x1", 0.05)]),
+    ("tx-bb", ["b1"], [("b1", 0.9)]),
+]
+
+
+def make_flows(db):
+    for cluster_id in ("A", "B", "C"):
+        db.add(Cluster(id=cluster_id))
+    db.flush()
+    members = {"a1": "A", "a2": "A", "b1": "B", "c1": "C", "c2": "C", "x1": None}
+    db.add_all(Address(address=address, cluster_id=cluster_id) for address, cluster_id in members.items())
+    for i, (txid, inputs, outputs) in enumerate(FLOWS):
+        db.add(Transaction(txid=txid, block_height=i, timestamp=f"2024-01-0{i + 1}T00:00:00"))
+        db.add_all(TransactionInput(txid=txid, vout_index=n, address=address, amount=1.0) for n, address in enumerate(inputs))
+        db.add_all(TransactionOutput(txid=txid, vout=n, address=address, amount=amount) for n, (address, amount) in enumerate(outputs))
+    db.commit()
+
+
+def edges(db):
+    return sorted(
+        (e.source_cluster_id, e.target_cluster_id, e.tx_count, round(e.total_amount, 8), e.first_tx_timestamp, e.last_tx_timestamp)
+        for e in db.query(ClusterEdge)
+    )
+
+
+def test_refresh_matches_rebuild(db):
+    make_flows(db)
+    ClusterEdgeService.rebuild(db)
+    expected = edges(db)
+    assert ("A", "C", 1, 0.3, "2024-01-03T00:00:00", "2024-01-03T00:00:00") in expected
+
+    for cluster_ids in (["A"], ["B", "C"], ["A", "B", "C"]):
+        ClusterEdgeService.refresh_clusters(db, cluster_ids)
+        assert edges(db) == expected
+
+
+def test_refresh_uses_address_and_txid_indexes(db, count_queries):
+    make_flows(db)
+
+    with count_queries() as counter:
+        ClusterEdgeService.refresh_clusters(db, ["A"])
+
+    connection = db.connection()
+    for statement, parameters in zip(counter.statements, counter.parameters):
+        if not statement.lstrip().upper().startswith(("SELECT", "INSERT")):
+            continue
+        plan = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)]
+        assert not any(
+            step.startswith("SCAN transaction_inputs") or step.startswith("SCAN transaction_outputs") for step in plan
+        ), plan
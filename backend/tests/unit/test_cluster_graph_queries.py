@@ -0,0 +1,39 @@
+"""Query-count regression tests for the cluster graph endpoint"""
+from app.models import Address, Cluster, Transaction, TransactionInput, TransactionOutput
+
+
+def make_cluster(db, cluster_id: str, size: int):
+    """Cluster of size addresses, each spending once to the next address and an outside address"""
+    addresses = [f"{cluster_id}-addr{i:03d}" for i in range(size)]
+    db.add(Cluster(id=cluster_id, address_count=size))
+    db.flush()
+    outside = [f"{cluster_id}-outside{i:03d}" for i in range(size)]
+    db.add_all(Address(address=address, cluster_id=cluster_id, balance=1.0) for address in addresses)
+    db.add_all(Address(address=address) for address in outside)
+
+    for i, address in enumerate(addresses):
+        txid = f"{cluster_id}-tx{i:03d}"
+        db.add(Transaction(txid=txid, block_height=i, timestamp="2024-01-01T00:00:00", input_count=1, output_count=2))
+        db.add(TransactionInput(txid=txid, vout_index=0, address=address, amount=1.0))
+        db.add(TransactionOutput(txid=txid, vout=0, address=addresses[(i + 1) % size], amount=0.6))
+        db.add(TransactionOutput(txid=txid, vout=1, address=outside[i], amount=0.4))
+    db.commit()
+
+
+def graph_query_count(client, count_queries, cluster_id: str, size: int) -> int:
+    with count_queries() as counter:
+        response = client.get(f"/api/v1/clusters/{cluster_id}/graph", params={"mode": "full"})
+    assert response.status_code == 200
+    assert len(response.json()["nodes"]) >= size
+    return counter.count
+
+
+def test_cluster_graph_query_count_does_not_grow_with_cluster_size(db, client, count_queries):
+    make_cluster(db, "small", 3)
+    make_cluster(db, "large", 80)
+
+    small = graph_query_count(client, count_queries, "small", 3)
+    large = graph_query_count(client, count_queries, "large", 80)
+
+    assert large == small
+    assert large <= 10
@@ -0,0 +1,42 @@
+"""Malformed pagination cursors are rejected with 400"""
+import pytest
+
+from app.models import Address, Cluster
+from app.utils.helpers import encode_cursor
+
+BAD_CURSORS = [
+    "not-base64!",
+    encode_cursor([1.0]),
+    encode_cursor([1.0, "a", "b"]),
+    encode_cursor(["1.0", "a"]),
+    encode_cursor([1.0, 5]),
+    encode_cursor([True, "a"]),
+    encode_cursor([None, "a"]),
+    encode_cursor([[1], "a"]),
+    encode_cursor([{"x": 1}, "a"]),
+    encode_cursor([float("inf"), "a"]),
+]
+
+
+@pytest.fixture
+def cluster(db):
+    db.add(Cluster(id="c1", address_count=2, total_balance=3.0))
+    db.add_all([Address(address="a1", cluster_id="c1", balance=1.0), Address(address="a2", cluster_id="c1", balance=2.0)])
+    db.commit()
+
+
+@pytest.mark.parametrize("path", ["/api/v1/clusters", "/api/v1/clusters/c1/addresses"])
+@pytest.mark.parametrize("cursor", BAD_CURSORS)
+def test_malformed_cursor_is_400(client, cluster, path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path, cursor, expected", [
+    ("/api/v1/clusters/c1/addresses", encode_cursor([2.0, "a2"]), ["a1"]),
+    ("/api/v1/clusters/c1/addresses", encode_cursor([2, "a2"]), ["a1"]),
+])
+def test_valid_cursor_pages(client, cluster, path, cursor, expected):
+    response = client.get(path, params={"cursor": cursor, "limit": 1})
+    assert response.status_code == 200
+    assert [item["address"] for item in response.json()["data"]] == expected
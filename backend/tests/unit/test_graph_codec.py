@@ -0,0 +1,165 @@
+"""Compact JSON and CGR1 binary graph encodings round-trip (layout used by frontend graphCodec.js)"""
+import json
+import math
+import struct
+from array import array
+
+import pytest
+
+from app.schemas.common import GraphData, GraphEdge, GraphNode
+from app.services.graph_codec import BINARY_MAGIC, GraphCodec
+
+LONG_ID = "bc1q" + "x" * 60
+
+GRAPH = GraphData(
+    nodes=[
+        GraphNode(id=LONG_ID, type="address", label=LONG_ID[:10] + "...", balance=1.5, cluster_id="c1"),
+        GraphNode(id="addr-b", type="address", label="Exchange", balance=None, cluster_id=None),
+        GraphNode(id="group-1", type="group", label="Group", size=12),
+    ],
+    edges=[
+        GraphEdge(source=LONG_ID, target="addr-b", amount=0.25, timestamp="2024-01-02T00:00:00", count=3,
+                  first_timestamp="2024-01-01T00:00:00", last_timestamp="2024-01-02T00:00:00"),
+        # Endpoints that are not in the node list become bare nodes
+        GraphEdge(source="addr-b", target="outside", amount=2.0, timestamp=None, count=None),
+        GraphEdge(source="outside-2", target=LONG_ID, amount=0.0, timestamp="2024-01-03T00:00:00"),
+    ],
+)
+
+
+def expected_graph():
+    """GraphData as the frontend sees it after decoding"""
+    nodes = [node.model_dump() for node in GRAPH.nodes]
+    for node_id in ("outside", "outside-2"):
+        nodes.append({"id": node_id, "type": None, "label": node_id[:10] + "...", "balance": None,
+                      "cluster_id": None, "size": None})
+    edges = [edge.model_dump() for edge in GRAPH.edges]
+    return nodes, edges
+
+
+def lookup(strings, value):
+    return None if value is None or value < 0 else strings[value]
+
+
+def number(value):
+    return None if value is None or value == -1 or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def from_columns(strings, node_columns, edge_columns, node_count, edge_count):
+    """Python port of fromColumns in frontend/src/api/graphCodec.js"""
+    nodes = []
+    for i in range(node_count):
+        node = {name: lookup(strings, node_columns.get(name, [None] * node_count)[i])
+                for name in ("id", "type", "label", "cluster_id")}
+        if node["label"] is None:
+            node["label"] = node["id"][:10] + "..."
+        node["balance"] = number(node_columns.get("balance", [None] * node_count)[i])
+        node["size"] = number(node_columns.get("size", [None] * node_count)[i])
+        nodes.append(node)
+
+    edges = []
+    for i in range(edge_count):
+        edge = {
+            "source": nodes[edge_columns["source"][i]]["id"],
+            "target": nodes[edge_columns["target"][i]]["id"],
+            "amount": number(edge_columns.get("amount", [None] * edge_count)[i]) or 0.0,
+            "count": number(edge_columns.get("count", [None] * edge_count)[i]),
+        }
+        for name in ("timestamp", "first_timestamp", "last_timestamp"):
+            edge[name] = lookup(strings, edge_columns.get(name, [None] * edge_count)[i])
+        edges.append(edge)
+    return nodes, edges
+
+
+def decode_binary(data: bytes):
+    assert data[:4] == BINARY_MAGIC
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    header = json.loads(data[8:8 + header_length])
+    base = 8 + header_length
+
+    def columns(layout):
+        decoded = {}
+        for name, column in layout.items():
+            typecode = "d" if column["dtype"] == "f64" else "i"
+            values = array(typecode)
+            values.frombytes(data[base + column["offset"]:base + column["offset"] + column["length"] * values.itemsize])
+            decoded[name] = list(values)
+        return decoded
+
+    return header, from_columns(
+        header["strings"], columns(header["columns"]["nodes"]), columns(header["columns"]["edges"]),
+        header["node_count"], header["edge_count"]
+    )
+
+
+def test_json_round_trip():
+    payload = json.loads(GraphCodec.encode_json(GRAPH))
+
+    assert payload["format"] == "compact"
+    # The first node's label is the default one and is sent as null
+    assert payload["nodes"]["label"][0] == -1
+    assert len(set(payload["strings"])) == len(payload["strings"])
+
+    nodes, edges = from_columns(
+        payload["strings"], payload["nodes"], payload["edges"],
+        len(payload["nodes"]["id"]), len(payload["edges"]["source"])
+    )
+    assert (nodes, edges) == expected_graph()
+
+
+def test_json_omits_columns_that_are_all_null():
+    graph = GraphData(nodes=[GraphNode(id="a", type="address", label="a"[:10] + "...")],
+                      edges=[GraphEdge(source="a", target="b", amount=1.0)])
+    payload = json.loads(GraphCodec.encode_json(graph))
+
+    assert set(payload["nodes"]) == {"id", "type"}
+    assert set(payload["edges"]) == {"source", "target", "amount"}
+    assert [payload["strings"][i] for i in payload["nodes"]["id"]] == ["a", "b"]
+
+
+def test_json_of_empty_graph_keeps_node_ids():
+    payload = json.loads(GraphCodec.encode_json(GraphData(nodes=[], edges=[])))
+    assert payload["nodes"] == {"id": []}
+    assert payload["edges"] == {}
+
+
+def test_binary_round_trip_and_layout():
+    data = GraphCodec.encode_binary(GRAPH)
+    header, decoded = decode_binary(data)
+
+    assert decoded == expected_graph()
+    assert header["node_count"] == 5
+    assert header["edge_count"] == 3
+
+    # Column data starts 8-byte aligned, and every column is aligned and padded to 8 bytes
+    (header_length,) = struct.unpack_from("<I", data, 4)
+    base = 8 + header_length
+    assert base % 8 == 0
+    offset = 0
+    for section in ("nodes", "edges"):
+        for name, column in header["columns"][section].items():
+            assert column["offset"] == offset, name
+            assert column["offset"] % 8 == 0
+            size = 8 if column["dtype"] == "f64" else 4
+            offset += column["length"] * size + (-(column["length"] * size) % 8)
+    assert len(data) == base + offset
+
+
+@pytest.mark.parametrize("field, sentinel", [("balance", "nan"), ("size", -1)])
+def test_binary_null_sentinels(field, sentinel):
+    data = GraphCodec.encode_binary(GRAPH)
+    header, _ = decode_binary(data)
+    column = header["columns"]["nodes"][field]
+    typecode = "d" if column["dtype"] == "f64" else "i"
+    values = array(typecode)
+    base = 8 + struct.unpack_from("<I", data, 4)[0]
+    values.frombytes(data[base + column["offset"]:base + column["offset"] + column["length"] * values.itemsize])
+
+    # addr-b has no balance / no size; the bare endpoint nodes have neither
+    missing = values[1] if field == "balance" else values[0]
+    if sentinel == "nan":
+        assert math.isnan(missing)
+        assert math.isnan(values[3]) and math.isnan(values[4])
+    else:
+        assert missing == -1
+        assert values[3] == values[4] == -1
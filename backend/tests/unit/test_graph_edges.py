@@ -0,0 +1,49 @@
+"""Cluster graph edges count each transaction once per address pair"""
+from app.services.graph import GraphService
+
+ADDRESSES = [{'address': address, 'balance': 0} for address in ("a", "b", "c")]
+
+
+def tx(txid, inputs, outputs, timestamp="2024-01-01T00:00:00"):
+    return {
+        'txid': txid,
+        'timestamp': timestamp,
+        'inputs': [{'address': address, 'amount': 1.0} for address in inputs],
+        'outputs': [{'address': address, 'amount': amount} for address, amount in outputs],
+    }
+
+
+def edges_by_pair(graph):
+    return {(edge.source, edge.target): edge for edge in graph.edges}
+
+
+def test_repeated_inputs_and_outputs_count_once():
+    transactions = [
+        # "a" spends two inputs and pays "b" twice in one transaction
+        tx("t1", ["a", "a", "c"], [("b", 0.5), ("b", 0.25), ("x", 9.0)]),
+        tx("t2", ["a"], [("b", 1.0)], timestamp="2024-02-01T00:00:00"),
+    ]
+
+    edges = edges_by_pair(GraphService.generate_cluster_graph("k", ADDRESSES, transactions))
+
+    assert edges[("a", "b")].count == 2
+    assert edges[("a", "b")].amount == 1.75
+    assert edges[("a", "b")].first_timestamp == "2024-01-01T00:00:00"
+    assert edges[("a", "b")].last_timestamp == "2024-02-01T00:00:00"
+    assert edges[("c", "b")].count == 1
+    assert edges[("c", "b")].amount == 0.75
+    assert ("a", "x") not in edges
+
+    raw = GraphService.generate_cluster_graph("k", ADDRESSES, transactions, aggregate=False).edges
+    assert sorted((edge.source, edge.target, edge.amount) for edge in raw) == [
+        ("a", "b", 0.75), ("a", "b", 1.0), ("c", "b", 0.75)
+    ]
+
+
+def test_aggregate_edges_dedupes_on_txid():
+    edge = {'txid': "t1", 'source': "a", 'target': "b", 'amount': 2.0, 'timestamp': None}
+
+    (merged,) = GraphService.aggregate_edges([edge, dict(edge), dict(edge, txid="t2")])
+
+    assert merged.count == 2
+    assert merged.amount == 4.0
@@ -0,0 +1,37 @@
+"""expand_frontier binds large frontiers in chunks and keeps the per-address fanout"""
+from app.models import Address, Transaction, TransactionInput, TransactionOutput
+from app.services.graph_loader import GraphLoader
+
+SQLITE_OLD_MAX_VARIABLES = 999
+
+
+def make_payments(db, count: int):
+    """addr{i} pays addr{i + 1} twice, in txs of different amounts"""
+    db.add_all(Address(address=f"addr{i}") for i in range(count + 1))
+    for i in range(count):
+        for n, amount in enumerate((1.0, 2.0)):
+            txid = f"pay{i}-{n}"
+            db.add(Transaction(txid=txid, block_height=i, timestamp="2024-01-01T00:00:00"))
+            db.flush()
+            db.add(TransactionInput(txid=txid, vout_index=0, address=f"addr{i}", amount=amount))
+            db.add(TransactionOutput(txid=txid, vout=0, address=f"addr{i + 1}", amount=amount))
+    db.commit()
+
+
+def test_large_frontier_is_chunked(db, count_queries):
+    make_payments(db, 700)
+    frontier = [f"addr{i}" for i in range(1, 700)] + ["addr1"]
+
+    with count_queries() as counter:
+        rows = GraphLoader.expand_frontier(db, frontier, "both", max_fanout=2)
+
+    assert counter.count >= 3
+    assert all(len(parameters) < SQLITE_OLD_MAX_VARIABLES for parameters in counter.parameters)
+
+    by_anchor = {}
+    for row in rows:
+        by_anchor.setdefault(row['anchor'], []).append((row['source'], row['target'], row['amount']))
+    assert len(by_anchor) == 699
+    # The two largest edges of each anchor across both directions
+    assert sorted(by_anchor["addr5"]) == [("addr4", "addr5", 2.0), ("addr5", "addr6", 2.0)]
+    assert len(by_anchor["addr1"]) == 2
@@ -0,0 +1,59 @@
+"""HyperLogLog estimates, merges and precision folding"""
+import math
+
+import pytest
+
+from app.utils.hyperloglog import HyperLogLog
+
+
+def sketch(values, precision=12):
+    hll = HyperLogLog(precision)
+    hll.update(values)
+    return hll
+
+
+def test_small_counts_use_linear_counting():
+    hll = sketch((f"addr-{i}" for i in range(100)), precision=12)
+
+    # Far below 2.5m with most registers empty: linear counting is near exact
+    zeros = hll.registers.count(0)
+    assert zeros >= hll.m - 100
+    assert hll.count() == round(hll.m * math.log(hll.m / zeros))
+    assert abs(hll.count() - 100) <= 2
+    assert HyperLogLog(12).count() == 0
+
+
+@pytest.mark.parametrize("precision, n", [(10, 5000), (12, 50000), (14, 50000)])
+def test_estimate_within_error_bound(precision, n):
+    hll = sketch((f"addr-{i}" for i in range(n)), precision)
+    assert abs(hll.count() - n) <= 4 * hll.relative_error * n
+
+
+def test_merge_equals_sketch_of_union():
+    left = sketch(f"addr-{i}" for i in range(0, 3000))
+    right = sketch(f"addr-{i}" for i in range(2000, 6000))
+
+    left.merge(right)
+
+    assert left.registers == sketch(f"addr-{i}" for i in range(6000)).registers
+
+
+def test_merge_of_different_precision_raises():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
+
+
+@pytest.mark.parametrize("precision", [12, 9, 4])
+def test_fold_equals_sketch_built_at_lower_precision(precision):
+    values = [f"addr-{i}" for i in range(20000)]
+    assert sketch(values, 14).fold(precision).registers == sketch(values, precision).registers
+
+    with pytest.raises(ValueError):
+        sketch(values, precision).fold(precision + 1)
+
+
+def test_bytes_round_trip():
+    hll = sketch(f"addr-{i}" for i in range(1000))
+    restored = HyperLogLog.from_bytes(hll.to_bytes())
+    assert restored.precision == hll.precision
+    assert restored.registers == hll.registers
@@ -0,0 +1,66 @@
+"""Incremental co-spending clustering matches clustering all transactions at once"""
+import random
+
+import pytest
+
+from app.models import Address, Cluster, Transaction, TransactionInput
+from app.services.clustering import ClusteringService
+from app.services.incremental_clustering import IncrementalClusteringService
+
+
+def make_transactions(seed: int, count: int = 300, addresses: int = 400):
+    rng = random.Random(seed)
+    return [{
+        'txid': f"tx{i}",
+        'block_height': i // 10,
+        'inputs': [{'address': f"addr{rng.randrange(addresses)}"} for _ in range(rng.randint(1, 3))],
+    } for i in range(count)]
+
+
+def store(db, transactions):
+    db.add_all(Address(address=f"addr{i}") for i in range(400))
+    for tx in transactions:
+        db.add(Transaction(txid=tx['txid'], block_height=tx['block_height']))
+        for i, inp in enumerate(tx['inputs']):
+            db.add(TransactionInput(txid=tx['txid'], vout_index=i, prev_txid=f"prev-{tx['txid']}-{i}",
+                                    prev_vout=0, address=inp['address'], amount=1.0))
+    db.commit()
+
+
+def as_partition(groups):
+    return sorted(sorted(members) for members in groups if len(members) > 1)
+
+
+@pytest.mark.parametrize("batch_blocks, workers", [(1, 1), (7, 1), (100, 1), (7, 2)])
+def test_batches_match_full_co_spending(db, batch_blocks, workers):
+    transactions = make_transactions(seed=batch_blocks)
+    store(db, transactions)
+
+    summary = IncrementalClusteringService(db, batch_blocks=batch_blocks, workers=workers).run()
+
+    clusters = {}
+    for address, cluster_id in db.query(Address.address, Address.cluster_id).filter(Address.cluster_id.isnot(None)):
+        clusters.setdefault(cluster_id, set()).add(address)
+    expected = ClusteringService.cluster_by_co_spending(transactions)
+    assert as_partition(clusters.values()) == as_partition(expected.values())
+
+    counts = dict(db.query(Cluster.id, Cluster.address_count))
+    assert counts == {cluster_id: len(members) for cluster_id, members in clusters.items()}
+    assert summary['transactions'] == len(transactions)
+
+
+def cluster_lookups(db, count_queries, prefix: str, clusters: int) -> int:
+    db.add_all(Address(address=f"{prefix}{i}") for i in range(2 * clusters))
+    db.commit()
+    groups = [{f"{prefix}{2 * i}", f"{prefix}{2 * i + 1}"} for i in range(clusters)]
+
+    with count_queries() as counter:
+        result = IncrementalClusteringService(db).apply_groups(groups)
+    db.commit()
+
+    assert result['clusters_created'] == clusters
+    return sum(1 for statement in counter.statements if statement.lstrip().startswith("SELECT clusters.id"))
+
+
+def test_new_clusters_are_looked_up_in_one_query(db, count_queries):
+    assert cluster_lookups(db, count_queries, "few", 2) == cluster_lookups(db, count_queries, "many", 40) == 1
@@ -0,0 +1,66 @@
+"""Incremental clustering with heuristics matches the one-pass in-memory clustering"""
+import pytest
+
+from app.models import Address, Transaction, TransactionInput, TransactionOutput
+from app.services.clustering import ClusteringService
+from app.services.incremental_clustering import IncrementalClusteringService
+
+HEURISTICS = ["coinjoin", "co_spending", "address_reuse", "one_time_change", "round_amount"]
+
+# (txid, block, inputs, outputs as (address, btc))
+TRANSACTIONS = [
+    ("t01", 1, ["a1", "a2"], [("m1", 0.5), ("a3", 0.123)]),       # co-spend, two fresh round outputs
+    ("t02", 1, ["m1"], [("a1", 0.1), ("m2", 0.2)]),                # a1 already seen, m2 fresh change
+    ("t03", 2, ["b1"], [("b1", 0.3), ("x1", 1.0)]),                # address reuse, nothing new to merge
+    ("t04", 2, ["c1", "c2", "c3"], [("o1", 0.1), ("o2", 0.1), ("o3", 0.1)]),  # coinjoin
+    ("t05", 3, ["x1"], [("y1", 0.2), ("y2", 0.0123)]),             # round amount: y2 is the change
+    ("t06", 3, ["y2", "a3"], [("z1", 0.01)]),                      # co-spend joins a3 to x1 across batches
+]
+
+
+def store(db):
+    for txid, block, inputs, outputs in TRANSACTIONS:
+        db.add(Transaction(txid=txid, block_height=block, timestamp=f"2024-01-0{block}T00:00:00"))
+        for i, address in enumerate(inputs):
+            db.add(TransactionInput(txid=txid, vout_index=i, prev_txid=f"prev-{txid}-{i}", prev_vout=0,
+                                    address=address, amount=1.0))
+        for vout, (address, amount) in enumerate(outputs):
+            db.add(TransactionOutput(txid=txid, vout=vout, address=address, amount=amount))
+    addresses = {a for _, _, ins, outs in TRANSACTIONS for a in ins + [o for o, _ in outs]}
+    db.add_all(Address(address=address) for address in addresses)
+    db.commit()
+
+
+def as_partition(groups):
+    return sorted(sorted(members) for members in groups if len(members) > 1)
+
+
+@pytest.mark.parametrize("batch_blocks", [1, 3])
+def test_incremental_heuristics_match_full_pass(db, batch_blocks):
+    store(db)
+    transactions = [{
+        'txid': txid,
+        'inputs': [{'address': address} for address in inputs],
+        'outputs': [{'address': address, 'amount': amount} for address, amount in outputs],
+    } for txid, _, inputs, outputs in TRANSACTIONS]
+    expected, report = ClusteringService.cluster_with_heuristics(transactions, HEURISTICS)
+
+    summary = IncrementalClusteringService(db, batch_blocks=batch_blocks, heuristics=HEURISTICS).run()
+
+    clusters = {}
+    for address, cluster_id in db.query(Address.address, Address.cluster_id).filter(Address.cluster_id.isnot(None)):
+        clusters.setdefault(cluster_id, set()).add(address)
+    assert as_partition(clusters.values()) == as_partition(expected.values())
+    assert ["o1", "o2"] not in as_partition(clusters.values())
+
+    assert list(summary['heuristics']) == HEURISTICS
+    assert {name: stats['merges'] for name, stats in summary['heuristics'].items()} == {
+        name: stats['merges'] for name, stats in report.items()
+    }
+    assert summary['heuristics']['co_spending']['pairs'] == 2
+    assert all(stats['seconds'] >= 0 for stats in summary['heuristics'].values())
+
+
+def test_unknown_heuristic_is_rejected(db):
+    with pytest.raises(ValueError):
+        IncrementalClusteringService(db, heuristics=["nope"])
@@ -0,0 +1,55 @@
+"""Path finding stays within its node and time budgets"""
+import asyncio
+import time
+
+from app.api.v1.addresses import find_address_paths
+from app.models import Address, Transaction, TransactionInput, TransactionOutput
+from app.services.graph_loader import GraphLoader
+from app.services.path_finding import PathFindingService
+
+
+def pay(db, txid: str, source: str, target: str, amount: float = 1.0):
+    db.add(Transaction(txid=txid, block_height=0, timestamp="2024-01-01T00:00:00"))
+    db.flush()
+    db.add(TransactionInput(txid=txid, vout_index=0, address=source, amount=amount))
+    db.add(TransactionOutput(txid=txid, vout=0, address=target, amount=amount))
+
+
+def make_fan(db, width: int):
+    """hub pays fan0..fan{width-1}; a separate chain s -> m -> t"""
+    addresses = ["hub", "s", "m", "t"] + [f"fan{i}" for i in range(width)]
+    db.add_all(Address(address=address) for address in addresses)
+    for i in range(width):
+        pay(db, f"fan-tx{i}", "hub", f"fan{i}")
+    pay(db, "sm", "s", "m")
+    pay(db, "mt", "m", "t")
+    db.commit()
+
+
+def test_path_is_found(db):
+    make_fan(db, 3)
+    result = PathFindingService.find_paths(db, "s", "t")
+    assert result["found"]
+    assert result["paths"][0]["addresses"] == ["s", "m", "t"]
+
+
+def test_hop_discovers_at_most_max_nodes(db):
+    make_fan(db, 300)
+
+    result = PathFindingService.find_paths(db, "hub", "t", max_fanout=500, max_nodes=50)
+
+    assert result["visited_addresses"] == 50
+    assert result["stop_reason"] == "max_nodes"
+    assert result["truncated"]
+
+
+def test_expired_deadline_issues_no_frontier_query(db, count_queries):
+    make_fan(db, 3)
+    with count_queries() as counter:
+        rows = GraphLoader.expand_frontier(db, ["hub"], "out", deadline=time.monotonic() - 1)
+    assert rows == []
+    assert counter.count == 0
+
+
+def test_endpoint_runs_in_threadpool():
+    assert not asyncio.iscoroutinefunction(find_address_paths)
@@ -0,0 +1,37 @@
+"""Ingestion clears the search cache only once its session commits"""
+from app.models import Address
+from app.services.search import SearchService, search_cache
+
+
+def addresses(q):
+    return [result.id for result in SearchService.search(q)]
+
+
+def test_cache_is_cleared_on_commit_not_before(db):
+    assert addresses("cachetest") == []
+
+    db.add(Address(address="cachetest1"))
+    db.flush()
+    search_cache.clear_on_commit(db)
+    db.rollback()
+    assert search_cache.get("cachetest", 20) == []
+
+    db.add(Address(address="cachetest2"))
+    db.flush()
+    search_cache.clear_on_commit(db)
+    # Before commit the cached (pre-ingest) results are still served
+    assert addresses("cachetest") == []
+    db.commit()
+
+    assert search_cache.get("cachetest", 20) is None
+    assert addresses("cachetest") == ["cachetest2"]
+
+
+def test_results_from_before_a_clear_are_not_stored(db):
+    generation = search_cache.generation
+    search_cache.clear()
+    search_cache.put("stale", 20, [], generation)
+    assert search_cache.get("stale", 20) is None
+
+    search_cache.put("fresh", 20, [], search_cache.generation)
+    assert search_cache.get("fresh", 20) == []
@@ -0,0 +1,115 @@
+"""Distinct-count sketch maintenance must match a rebuild and survive precision changes"""
+from app.config import settings
+from app.models import Address, DistinctSketch, Transaction, TransactionInput, TransactionOutput
+from app.services.sketches import SCOPE_CLUSTER, SCOPE_DAY, DistinctSketchService
+from app.utils.hyperloglog import HyperLogLog
+
+from .test_cluster_edges_refresh import FLOWS, make_flows
+
+
+def sketches(db):
+    return {
+        (row.scope, row.key): HyperLogLog.from_bytes(row.sketch)
+        for row in db.query(DistinctSketch)
+    }
+
+
+def registers(db):
+    return {key: (sketch.precision, bytes(sketch.registers)) for key, sketch in sketches(db).items()}
+
+
+def add_transaction(db, txid, day, inputs, outputs):
+    db.add(Transaction(txid=txid, block_height=100, timestamp=f"{day}T00:00:00"))
+    db.flush()
+    db.add_all(TransactionInput(txid=txid, vout_index=n, address=address, amount=1.0) for n, address in enumerate(inputs))
+    db.add_all(TransactionOutput(txid=txid, vout=n, address=address, amount=0.5) for n, address in enumerate(outputs))
+    db.commit()
+
+
+def test_after_ingest_matches_rebuild(db):
+    make_flows(db)
+    txids = [txid for txid, _, _ in FLOWS]
+
+    DistinctSketchService.after_ingest(db, txids[:2])
+    DistinctSketchService.after_ingest(db, txids[2:])
+    db.commit()
+    ingested = registers(db)
+
+    counts = DistinctSketchService.rebuild(db)
+    db.commit()
+
+    assert counts == {SCOPE_DAY: len(FLOWS), SCOPE_CLUSTER: 3}
+    assert registers(db) == ingested
+
+    # a1, a2, b1, c1, c2, x1 (linear counting is exact at this size)
+    assert DistinctSketchService.active_addresses(db, "2024-01-01", "2024-01-31")[:2] == (6, len(FLOWS))
+    assert DistinctSketchService.active_addresses(db, "2024-01-02", "2024-01-02")[:2] == (3, 1)
+    # A pays b1 and c1, and receives from c2
+    assert DistinctSketchService.cluster_counterparties(db, "A")[0] == 3
+
+
+def test_merge_clusters_is_union_of_sketches(db):
+    make_flows(db)
+    DistinctSketchService.rebuild(db)
+    db.commit()
+    before = sketches(db)
+
+    DistinctSketchService.merge_clusters(db, "A", ["B", "C"])
+    db.commit()
+    after = sketches(db)
+
+    expected = HyperLogLog(settings.hll_cluster_precision)
+    for cluster_id in ("A", "B", "C"):
+        expected.merge(before[(SCOPE_CLUSTER, cluster_id)])
+    assert after[(SCOPE_CLUSTER, "A")].registers == expected.registers
+    assert (SCOPE_CLUSTER, "B") not in after and (SCOPE_CLUSTER, "C") not in after
+
+    # A loser without a sketch is folded into a survivor that has none yet
+    DistinctSketchService.merge_clusters(db, "D", ["A"])
+    db.commit()
+    assert sketches(db)[(SCOPE_CLUSTER, "D")].registers == expected.registers
+
+
+def test_active_addresses_after_precision_change(db, client, monkeypatch):
+    make_flows(db)
+    DistinctSketchService.rebuild(db)
+    db.commit()
+
+    # Days sketched before the change stay at the old precision
+    monkeypatch.setattr(settings, "hll_day_precision", 10)
+    db.add(Address(address="n1"))
+    add_transaction(db, "tx-new", "2024-01-06", ["a1"], ["n1"])
+    DistinctSketchService.after_ingest(db, ["tx-new"])
+    db.commit()
+    precisions = {key: sketch.precision for (scope, key), sketch in sketches(db).items() if scope == SCOPE_DAY}
+    assert precisions["2024-01-01"] == 14 and precisions["2024-01-06"] == 10
+
+    response = client.get("/api/v1/analytics/active-addresses", params={"start": "2024-01-01", "end": "2024-01-31"})
+    assert response.status_code == 200
+    assert response.json()["estimate"] == 7
+    assert response.json()["days"] == len(FLOWS) + 1
+    assert response.json()["relative_error"] == round(1.04 / 2 ** 5, 6)
+
+    # A higher configured precision unions at the lowest stored one
+    monkeypatch.setattr(settings, "hll_day_precision", 16)
+    assert DistinctSketchService.active_addresses(db, "2024-01-01", "2024-01-31")[:2] == (7, len(FLOWS) + 1)
+
+
+def test_cluster_sketches_after_precision_change(db, monkeypatch):
+    make_flows(db)
+    DistinctSketchService.rebuild(db)
+    db.commit()
+
+    monkeypatch.setattr(settings, "hll_cluster_precision", 8)
+    DistinctSketchService.add_cluster_addresses(db, ["a1", "a2"])
+    DistinctSketchService.merge_clusters(db, "A", ["B"])
+    db.commit()
+    assert sketches(db)[(SCOPE_CLUSTER, "A")].precision == 8
+
+    monkeypatch.setattr(settings, "hll_cluster_precision", 12)
+    DistinctSketchService.merge_clusters(db, "A", ["C"])
+    db.commit()
+    merged = sketches(db)[(SCOPE_CLUSTER, "A")]
+    assert merged.precision == 8
+    # Counterparties of A, B and C together cover every address
+    assert merged.count() == len({"a1", "a2", "b1", "c1", "c2", "x1"})
@@ -0,0 +1,66 @@
+"""The periodic stats reconcile must not share a connection with request sessions"""
+import threading
+
+from app.database import SessionLocal
+from app.models import Address, SummaryStat
+from app.services import stats_rollup
+from app.services.stats_rollup import StatsRollupService, SUMMARY_STATS
+
+
+def test_request_session_close_does_not_discard_reconcile_writes(db, monkeypatch):
+    db.add(Address(address="addr-1", balance=2.0))
+    db.commit()
+
+    reached, resume = threading.Event(), threading.Event()
+    rebuild = stats_rollup.ClusterDistributionService.rebuild
+
+    def paused_rebuild(session):
+        # summary_stats are written but not committed yet
+        reached.set()
+        resume.wait(5)
+        return rebuild(session)
+
+    monkeypatch.setattr(stats_rollup.ClusterDistributionService, "rebuild", paused_rebuild)
+
+    job = threading.Thread(target=StatsRollupService.reconcile_job)
+    job.start()
+    assert reached.wait(5)
+
+    # A request that finishes while the job is running
+    request = SessionLocal()
+    request.query(Address).count()
+    request.close()
+
+    resume.set()
+    job.join(10)
+    assert not job.is_alive()
+
+    db.expire_all()
+    stats = dict(db.query(SummaryStat.name, SummaryStat.value))
+    assert set(stats) == set(SUMMARY_STATS)
+    assert stats["total_addresses"] == 1
+    assert stats["total_balance"] == 2.0
+
+
+def test_reconcile_waits_for_pending_request_writes(db):
+    StatsRollupService.reconcile(db)
+    db.commit()
+
+    request = SessionLocal()
+    request.add(Address(address="addr-2", balance=1.5))
+    request.flush()
+
+    job = threading.Thread(target=StatsRollupService.reconcile_job)
+    job.start()
+    job.join(0.5)
+    # The job holds off until the request's transaction ends
+    assert job.is_alive()
+
+    request.commit()
+    request.close()
+    job.join(10)
+    assert not job.is_alive()
+
+    db.expire_all()
+    assert db.query(Address).filter(Address.address == "addr-2").count() == 1
+    assert db.get(SummaryStat, "total_addresses").value == 1
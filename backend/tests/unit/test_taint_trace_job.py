@@ -0,0 +1,106 @@
+"""Background taint traces must not share a connection with request sessions"""
+import threading
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal, job_engine
+from app.models import Address, TaintResult, TaintTrace, Transaction, TransactionInput, TransactionOutput
+from app.services.taint import TaintService
+
+
+def make_chain(db, length: int):
+    """tx0 -> tx1 -> ... each spending output 0 of the previous transaction"""
+    for i in range(length):
+        txid = f"chain-tx{i}"
+        db.add(Address(address=f"chain-addr{i}"))
+        db.add(Transaction(txid=txid, block_height=i, timestamp="2024-01-01T00:00:00"))
+        db.flush()
+        if i:
+            db.add(TransactionInput(
+                txid=txid, vout_index=0, prev_txid=f"chain-tx{i - 1}", prev_vout=0,
+                address=f"chain-addr{i - 1}", amount=1.0
+            ))
+        db.add(TransactionOutput(
+            txid=txid, vout=0, address=f"chain-addr{i}", amount=1.0,
+            spent=1 if i < length - 1 else 0, spent_in_txid=f"chain-tx{i + 1}" if i < length - 1 else None
+        ))
+    db.commit()
+
+
+def test_request_session_close_does_not_discard_trace_hops(db, monkeypatch):
+    make_chain(db, 6)
+    trace, _ = TaintService.find_or_create_trace(db, "chain-tx0", 0, max_hops=5)
+
+    reached, resume = threading.Event(), threading.Event()
+    write_results = TaintService._write_results
+
+    def paused_write_results(session, trace_row, hop, rows):
+        write_results(session, trace_row, hop, rows)
+        if hop == 2:
+            # hop 2 results are written but not committed yet
+            reached.set()
+            resume.wait(5)
+
+    monkeypatch.setattr(TaintService, "_write_results", staticmethod(paused_write_results))
+
+    job = threading.Thread(target=TaintService.run_trace_job, args=(trace.id,))
+    job.start()
+    assert reached.wait(5)
+
+    # A request that finishes while the trace is running
+    request = SessionLocal()
+    request.query(TaintTrace).count()
+    request.close()
+
+    resume.set()
+    job.join(10)
+    assert not job.is_alive()
+
+    db.expire_all()
+    finished = db.get(TaintTrace, trace.id)
+    hops = [hop for (hop,) in db.query(TaintResult.hop).filter(TaintResult.trace_id == trace.id).order_by(TaintResult.hop)]
+    assert finished.status == "completed"
+    assert hops == [0, 1, 2, 3, 4, 5]
+    assert finished.result_count == len(hops)
+
+
+def test_stale_trace_is_replaced_and_fresh_one_reused(db):
+    make_chain(db, 3)
+    trace, created = TaintService.find_or_create_trace(db, "chain-tx0", 0, max_hops=5)
+    assert created
+
+    # A running trace that is still making progress is reused
+    trace.status = "running"
+    db.commit()
+    again, created = TaintService.find_or_create_trace(db, "chain-tx0", 0, max_hops=5)
+    assert (again.id, created) == (trace.id, False)
+
+    # Its job died an hour ago: the trace is failed and a new one is queued
+    db.query(TaintTrace).filter(TaintTrace.id == trace.id).update(
+        {TaintTrace.updated_at: (datetime.utcnow() - timedelta(hours=1)).isoformat()}, synchronize_session=False
+    )
+    db.commit()
+    db.expire_all()
+    replacement, created = TaintService.find_or_create_trace(db, "chain-tx0", 0, max_hops=5)
+
+    assert created and replacement.id != trace.id
+    assert replacement.status == "pending"
+    assert db.get(TaintTrace, trace.id).status == "failed"
+
+
+def test_inline_trace_runs_on_job_connection(db, client, monkeypatch):
+    make_chain(db, 4)
+    binds = []
+    run_trace = TaintService.run_trace
+
+    def recording_run_trace(session, trace_id):
+        binds.append(session.get_bind())
+        return run_trace(session, trace_id)
+
+    monkeypatch.setattr(TaintService, "run_trace", staticmethod(recording_run_trace))
+
+    response = client.post("/api/v1/taint/traces", json={"txid": "chain-tx0", "vout": 0, "max_hops": 2})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["hops_completed"] == 2
+    assert binds == [job_engine]
@@ -2,6 +2,7 @@
  * Address API
  */
 import apiClient from './client';
+import { fetchCompactGraph } from './graphCodec';
 
 export const addressesApi = {
   /**
@@ -23,6 +24,12 @@ export const addressesApi = {
     return response.data;
   },
 
+  /**
+   * 주소의 전체 트랜잭션 내보내기 URL (로컬 DB, ndjson 또는 csv 스트림)
+   */
+  getAddressTransactionsExportUrl: (address, format = 'ndjson') =>
+    `${apiClient.defaults.baseURL}/addresses/${address}/transactions/export?format=${format}`,
+
   /**
    * 주소가 속한 클러스터 정보 조회
    */
@@ -30,4 +37,40 @@ export const addressesApi = {
     const response = await apiClient.get(`/addresses/${address}/cluster`);
     return response.data;
   },
+
+  /**
+   * 주소 기준 N-hop 자금 흐름 그래프
+   */
+  getAddressGraph: async (address, params = {}) => {
+    const { depth = 2, direction = 'both', compact = false, ...filters } = params;
+    if (compact) {
+      return fetchCompactGraph(`/addresses/${address}/graph`, { depth, direction, ...filters });
+    }
+    const response = await apiClient.get(`/addresses/${address}/graph`, {
+      params: { depth, direction, ...filters },
+    });
+    return response.data;
+  },
+
+  /**
+   * 주소의 인접 주소 목록 (인접 인덱스)
+   */
+  getAddressNeighbors: async (address, params = {}) => {
+    const { direction = 'out', limit = 50, min_amount = 0 } = params;
+    const response = await apiClient.get(`/addresses/${address}/neighbors`, {
+      params: { direction, limit, min_amount },
+    });
+    return response.data;
+  },
+
+  /**
+   * 두 주소 간 자금 흐름 경로 탐색
+   */
+  findAddressPaths: async (address, target, params = {}) => {
+    const { max_hops = 6, max_paths = 5, ...filters } = params;
+    const response = await apiClient.get(`/addresses/${address}/paths/${target}`, {
+      params: { max_hops, max_paths, ...filters },
+    });
+    return response.data;
+  },
 };
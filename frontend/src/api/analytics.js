@@ -13,10 +13,45 @@ export const analyticsApi = {
   },
 
   /**
-   * 클러스터 크기 분포
+   * 클러스터 크기 분포 (edges: 구간 하한 배열, scale: 'linear' | 'log')
    */
-  getClusterDistribution: async () => {
-    const response = await apiClient.get('/analytics/cluster-distribution');
+  getClusterDistribution: async (params = {}) => {
+    const { edges, scale = 'linear', base } = params;
+    const response = await apiClient.get('/analytics/cluster-distribution', {
+      params: { edges: edges?.join(','), scale, base },
+    });
+    return response.data;
+  },
+
+  /**
+   * 블록별 통계 (startHeight/endHeight 생략 시 최근 limit개 블록)
+   */
+  getBlockStats: async (params = {}) => {
+    const { startHeight, endHeight, limit = 100 } = params;
+    const response = await apiClient.get('/analytics/blocks', {
+      params: { start_height: startHeight, end_height: endHeight, limit },
+    });
+    return response.data;
+  },
+
+  /**
+   * 일별(UTC) 통계 (start/end: YYYY-MM-DD, 생략 시 최근 limit일)
+   */
+  getDailyStats: async (params = {}) => {
+    const { start, end, limit = 90 } = params;
+    const response = await apiClient.get('/analytics/daily', {
+      params: { start, end, limit },
+    });
+    return response.data;
+  },
+
+  /**
+   * 기간 내 활동한 고유 주소 수 (근사치, start/end: YYYY-MM-DD)
+   */
+  getActiveAddresses: async (start, end) => {
+    const response = await apiClient.get('/analytics/active-addresses', {
+      params: { start, end },
+    });
     return response.data;
   },
 };
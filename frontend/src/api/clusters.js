@@ -2,15 +2,16 @@
  * Cluster API
  */
 import apiClient from './client';
+import { fetchCompactGraph } from './graphCodec';
 
 export const clustersApi = {
   /**
-   * 모든 클러스터 목록 조회
+   * 모든 클러스터 목록 조회 (cursor를 주면 이전 응답의 next_cursor부터 이어서 조회)
    */
   getClusters: async (params = {}) => {
-    const { limit = 20, offset = 0, min_size } = params;
+    const { limit = 20, offset = 0, cursor, min_size } = params;
     const response = await apiClient.get('/clusters', {
-      params: { limit, offset, min_size },
+      params: { limit, offset, cursor, min_size },
     });
     return response.data;
   },
@@ -23,11 +24,64 @@ export const clustersApi = {
     return response.data;
   },
 
+  /**
+   * 클러스터 내 주소 목록 (잔액 순, cursor 또는 offset 페이지네이션)
+   */
+  getClusterAddresses: async (clusterId, params = {}) => {
+    const { limit = 50, offset = 0, cursor } = params;
+    const response = await apiClient.get(`/clusters/${clusterId}/addresses`, {
+      params: { limit, offset, cursor },
+    });
+    return response.data;
+  },
+
+  /**
+   * 클러스터 전체 주소 내보내기 URL (ndjson 또는 csv 스트림, 다운로드 링크용)
+   */
+  getClusterAddressesExportUrl: (clusterId, format = 'ndjson') =>
+    `${apiClient.defaults.baseURL}/clusters/${clusterId}/addresses/export?format=${format}`,
+
+  /**
+   * 클러스터와 거래한 고유 상대 주소 수 (근사치, relative_error 포함)
+   */
+  getClusterCounterpartyCount: async (clusterId) => {
+    const response = await apiClient.get(`/clusters/${clusterId}/counterparties/count`);
+    return response.data;
+  },
+
   /**
    * 클러스터 내 주소 간 관계 그래프 데이터
    */
-  getClusterGraph: async (clusterId) => {
-    const response = await apiClient.get(`/clusters/${clusterId}/graph`);
+  getClusterGraph: async (clusterId, params = {}) => {
+    const { mode = 'auto', group_by = 'value', raw = false, compact = false } = params;
+    if (compact) {
+      return fetchCompactGraph(`/clusters/${clusterId}/graph`, { mode, group_by, raw });
+    }
+    const response = await apiClient.get(`/clusters/${clusterId}/graph`, {
+      params: { mode, group_by, raw },
+    });
+    return response.data;
+  },
+
+  /**
+   * 요약 그래프의 그룹 노드 확장
+   */
+  expandClusterGraphGroup: async (clusterId, group, params = {}) => {
+    const { group_by = 'value', limit = 100 } = params;
+    const response = await apiClient.get(`/clusters/${clusterId}/graph/groups/${group}`, {
+      params: { group_by, limit },
+    });
+    return response.data;
+  },
+
+  /**
+   * 클러스터 간 자금 흐름 그래프 데이터
+   */
+  getClusterFlows: async (clusterId, params = {}) => {
+    const { direction = 'both', limit = 50, min_amount = 0 } = params;
+    const response = await apiClient.get(`/clusters/${clusterId}/flows`, {
+      params: { direction, limit, min_amount },
+    });
     return response.data;
   },
 };
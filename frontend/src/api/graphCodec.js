@@ -0,0 +1,99 @@
+/**
+ * Compact graph payload decoding
+ *
+ * 서버의 GraphCodec(backend/app/services/graph_codec.py)과 같은 형식을 사용한다.
+ * 문자열은 strings 테이블의 인덱스(-1 = null), 엣지는 노드 위치로 참조한다.
+ */
+import apiClient from './client';
+
+export const COMPACT_JSON_MEDIA_TYPE = 'application/x-graph-compact+json';
+export const COMPACT_BINARY_MEDIA_TYPE = 'application/x-graph-compact';
+
+const NODE_STRING_COLUMNS = ['id', 'type', 'label', 'cluster_id'];
+const EDGE_STRING_COLUMNS = ['timestamp', 'first_timestamp', 'last_timestamp'];
+
+const lookup = (strings, index) => (index === undefined || index < 0 ? null : strings[index]);
+const number = (value) => (value === undefined || value === null || Number.isNaN(value) || value === -1 ? null : value);
+
+/**
+ * 컬럼 형식 -> { nodes, edges } (GraphData와 같은 모양)
+ */
+const fromColumns = (strings, nodeColumns, edgeColumns, nodeCount, edgeCount) => {
+  const nodes = new Array(nodeCount);
+  for (let i = 0; i < nodeCount; i += 1) {
+    const node = {};
+    NODE_STRING_COLUMNS.forEach((name) => {
+      node[name] = lookup(strings, nodeColumns[name]?.[i]);
+    });
+    if (node.label === null && node.id) {
+      node.label = `${node.id.slice(0, 10)}...`;
+    }
+    node.balance = number(nodeColumns.balance?.[i]);
+    node.size = number(nodeColumns.size?.[i]);
+    nodes[i] = node;
+  }
+
+  const edges = new Array(edgeCount);
+  for (let i = 0; i < edgeCount; i += 1) {
+    const edge = {
+      source: nodes[edgeColumns.source[i]].id,
+      target: nodes[edgeColumns.target[i]].id,
+      amount: number(edgeColumns.amount?.[i]) ?? 0,
+      count: number(edgeColumns.count?.[i]),
+    };
+    EDGE_STRING_COLUMNS.forEach((name) => {
+      edge[name] = lookup(strings, edgeColumns[name]?.[i]);
+    });
+    edges[i] = edge;
+  }
+
+  return { nodes, edges };
+};
+
+/**
+ * Compact JSON 디코딩
+ */
+export const decodeCompactGraph = (payload) => {
+  const nodeCount = payload.nodes.id.length;
+  const edgeCount = payload.edges.source ? payload.edges.source.length : 0;
+  return fromColumns(payload.strings, payload.nodes, payload.edges, nodeCount, edgeCount);
+};
+
+/**
+ * 바이너리 디코딩 (CGR1 + 헤더 길이 + JSON 헤더 + 8바이트 정렬된 little-endian 컬럼)
+ */
+export const decodeBinaryGraph = (buffer) => {
+  const view = new DataView(buffer);
+  const headerLength = view.getUint32(4, true);
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+  const base = 8 + headerLength;
+
+  const readColumns = (layout) => {
+    const columns = {};
+    Object.entries(layout).forEach(([name, { dtype, offset, length }]) => {
+      const ArrayType = dtype === 'f64' ? Float64Array : Int32Array;
+      columns[name] = new ArrayType(buffer, base + offset, length);
+    });
+    return columns;
+  };
+
+  return fromColumns(
+    header.strings,
+    readColumns(header.columns.nodes),
+    readColumns(header.columns.edges),
+    header.node_count,
+    header.edge_count,
+  );
+};
+
+/**
+ * 그래프 엔드포인트를 바이너리 포맷으로 요청하고 디코딩
+ */
+export const fetchCompactGraph = async (url, params = {}) => {
+  const response = await apiClient.get(url, {
+    params,
+    headers: { Accept: COMPACT_BINARY_MEDIA_TYPE },
+    responseType: 'arraybuffer',
+  });
+  return decodeBinaryGraph(response.data);
+};
@@ -5,4 +5,5 @@ export { addressesApi } from './addresses';
 export { clustersApi } from './clusters';
 export { searchApi } from './search';
 export { analyticsApi } from './analytics';
+export { taintApi } from './taint';
 export { default as apiClient } from './client';
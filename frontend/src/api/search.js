@@ -13,4 +13,14 @@ export const searchApi = {
     });
     return response.data;
   },
+
+  /**
+   * 검색어 자동완성 (주소, txid, 클러스터 라벨 접두사)
+   */
+  autocomplete: async (query, limit = 10) => {
+    const response = await apiClient.get('/search/autocomplete', {
+      params: { q: query, limit },
+    });
+    return response.data;
+  },
 };
@@ -0,0 +1,44 @@
+/**
+ * Taint API
+ */
+import apiClient from './client';
+
+export const taintApi = {
+  /**
+   * 테인트 추적 시작 (깊은 추적은 pending 상태로 반환)
+   */
+  createTrace: async (params) => {
+    const response = await apiClient.post('/taint/traces', params);
+    return response.data;
+  },
+
+  /**
+   * 테인트 추적 상태 조회
+   */
+  getTrace: async (traceId) => {
+    const response = await apiClient.get(`/taint/traces/${traceId}`);
+    return response.data;
+  },
+
+  /**
+   * 오염된 출력 목록
+   */
+  getResults: async (traceId, params = {}) => {
+    const { hop, limit = 50, offset = 0 } = params;
+    const response = await apiClient.get(`/taint/traces/${traceId}/results`, {
+      params: { hop, limit, offset },
+    });
+    return response.data;
+  },
+
+  /**
+   * 주소별 오염 금액 합계
+   */
+  getAddresses: async (traceId, params = {}) => {
+    const { limit = 50 } = params;
+    const response = await apiClient.get(`/taint/traces/${traceId}/addresses`, {
+      params: { limit },
+    });
+    return response.data;
+  },
+};
@@ -23,6 +23,8 @@ export const ClusterDetailPage = () => {
 
   const [clusterData, setClusterData] = useState(null);
   const [addresses, setAddresses] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -40,6 +42,7 @@ export const ClusterDetailPage = () => {
       const data = await clustersApi.getCluster(clusterId);
       setClusterData(data);
       setAddresses(data.addresses || []);
+      setNextCursor(data.addresses_next_cursor || null);
     } catch (err) {
       console.error('클러스터 데이터 로드 실패:', err);
       setError(err);
@@ -48,6 +51,19 @@ export const ClusterDetailPage = () => {
     }
   };
 
+  const loadMoreAddresses = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await clustersApi.getClusterAddresses(clusterId, { cursor: nextCursor });
+      setAddresses((prev) => [...prev, ...page.data]);
+      setNextCursor(page.next_cursor || null);
+    } catch (err) {
+      console.error('클러스터 주소 추가 로드 실패:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleAddressClick = (address) => {
     navigate(`/address/${address}`);
   };
@@ -154,8 +170,8 @@ export const ClusterDetailPage = () => {
             {/* 주소 목록 */}
             <Card>
               <CardHeader>
-                <CardTitle>클러스터 주소 ({addresses.length})</CardTitle>
-                <CardDescription>이 클러스터에 속한 모든 주소</CardDescription>
+                <CardTitle>클러스터 주소 ({clusterData?.address_count ?? addresses.length})</CardTitle>
+                <CardDescription>이 클러스터에 속한 주소 (잔액 순)</CardDescription>
               </CardHeader>
               <CardContent>
                 {addresses.length === 0 ? (
@@ -184,6 +200,16 @@ export const ClusterDetailPage = () => {
                         </div>
                       </div>
                     ))}
+                    {nextCursor && (
+                      <Button
+                        variant="outline"
+                        className="w-full"
+                        onClick={loadMoreAddresses}
+                        disabled={loadingMore}
+                      >
+                        {loadingMore ? '불러오는 중...' : '더 보기'}
+                      </Button>
+                    )}
                   </div>
                 )}
               </CardContent>